@@ -0,0 +1,154 @@
+# page_element.py
+
+from typing import Any, Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from utilities.element_locator import ElementLocator
+from utilities.utils import logger
+
+# Selenium By values mapped onto the locator type names ElementLocator understands
+_BY_TO_LOCATOR_TYPE = {
+    By.XPATH: "xpath",
+    By.CSS_SELECTOR: "css",
+    By.ID: "id",
+    By.NAME: "name",
+    By.CLASS_NAME: "classname",
+    By.LINK_TEXT: "linktext",
+    By.PARTIAL_LINK_TEXT: "partiallinktext",
+    By.TAG_NAME: "tagname",
+}
+
+
+class Element:
+    """
+    Declarative locator for a page object attribute.
+
+    Example:
+        class LoginPage:
+            login_form = Element(By.XPATH, "//form[@method='POST']")
+            username = Element(By.CSS_SELECTOR, "input[type='email']", parent="login_form")
+
+    Nothing is located when the page object is built. The first attribute access on the element
+    finds it, and the result is reused until the page navigates. With parent set, the element is
+    searched for only inside the parent element, so XPath child locators must be relative ('.//').
+    """
+
+    __slots__ = ("locator_type", "locator", "parent", "name")
+
+    def __init__(self, by: str, locator: str, parent: Optional[str] = None):
+        """
+        Initialize the Element.
+
+        Args:
+            by (str): A selenium By value, or a locator type name such as 'xpath' or 'css'.
+            locator (str): The locator string.
+            parent (Optional[str]): Name of another Element on the page to search within.
+
+        Raises:
+            ValueError: If the locator type is not supported.
+        """
+        self.locator_type = _BY_TO_LOCATOR_TYPE.get(by, by)
+        if ElementLocator.get_by_type(self.locator_type) is None:
+            raise ValueError(f"Unsupported locator type for Element: {by}")
+        self.locator = locator
+        self.parent = parent
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        # Element has no __set__, so the proxy stored on the instance shadows the descriptor and
+        # later accesses skip straight to it
+        proxy = ElementProxy(page, self)
+        page.__dict__[self.name] = proxy
+        return proxy
+
+
+class ElementProxy:
+    """Lazily resolved stand-in for the WebElement an Element points at."""
+
+    __slots__ = ("_page", "_spec", "_element", "_generation")
+
+    def __init__(self, page, spec: Element):
+        self._page = page
+        self._spec = spec
+        self._element: Optional[WebElement] = None
+        self._generation: Optional[str] = None
+
+    def resolve(self) -> WebElement:
+        """
+        Return the WebElement, locating it if it isn't cached for the current page generation.
+
+        Raises:
+            NoSuchElementException: If the element cannot be found.
+
+        Returns:
+            WebElement: The located element.
+        """
+        locator = getattr(self._page, "locator", None)
+        cache = locator.cache if isinstance(locator, ElementLocator) else None
+        if cache is not None:
+            cache.sync()
+            if self._generation != cache.generation:
+                self._element = None
+        if self._element is not None:
+            return self._element
+
+        spec = self._spec
+        by_type = ElementLocator.get_by_type(spec.locator_type)
+        if spec.parent is not None:
+            scope = getattr(self._page, spec.parent).resolve()
+        else:
+            scope = self._page.driver
+        self._element = scope.find_element(by_type, spec.locator)
+        self._generation = cache.generation if cache is not None else None
+        logger.info(f"Element '{spec.name}' resolved with locator: {spec.locator}")
+        return self._element
+
+    def invalidate(self) -> None:
+        """Forget the cached WebElement so the next access locates it again."""
+        self._element = None
+
+    def is_present(self) -> bool:
+        """
+        Check whether the element can currently be found.
+
+        Returns:
+            bool: True if the element is present, False otherwise.
+        """
+        try:
+            self.resolve()
+            return True
+        except NoSuchElementException:
+            return False
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            attribute = getattr(self.resolve(), name)
+        except StaleElementReferenceException:
+            self._relocate()
+            attribute = getattr(self.resolve(), name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            try:
+                return attribute(*args, **kwargs)
+            except StaleElementReferenceException:
+                self._relocate()
+                return getattr(self.resolve(), name)(*args, **kwargs)
+
+        return call
+
+    def _relocate(self) -> None:
+        logger.info(f"Element '{self._spec.name}' went stale, locating again")
+        self.invalidate()
+        if self._spec.parent is not None:
+            getattr(self._page, self._spec.parent).invalidate()
+
+    def __repr__(self):
+        return f"<ElementProxy {self._spec.name} ({self._spec.locator_type}: {self._spec.locator})>"
@@ -1,13 +1,24 @@
+import argparse
 import os
 import pytest
+from functools import partial
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.support.ui import WebDriverWait
-from utilities.utils import logger, start_test_capture, end_test_capture, get_logs_for_test
-from utilities.config import DEFAULT_TIMEOUT, EXTENDED_TIMEOUT
+from pytest_html import extras
+from utilities.utils import logger, start_test_capture, end_test_capture, get_logs_for_test, merge_worker_logs, flush_logs, \
+    current_session
+from utilities.config import DEFAULT_TIMEOUT, EXTENDED_TIMEOUT, BASE_URL, WORKER_ID, COMMAND_INSTRUMENTATION, SHARED_DRIVER_SERVICE, BROWSER_PROFILE, \
+    PROFILE_TEMPLATE, PAGE_TIMINGS
+from utilities.browser_options import BrowserOptions
+from utilities.command_instrumentation import command_recorder, current_test, instrument_driver, page_action_hooks
+from utilities.page_performance import performance_collector
+from utilities.driver_pool import DriverPool
+from utilities.service_registry import service_registry
+from utilities.profile_template import profile_templates
+from utilities.screenshot_manager import ScreenshotManager
+from utilities.screenshot_store import screenshot_store
+from utilities.browser_context import BrowserContext
+from utilities.storage_state import StorageStateCache
 from page_objects.login_page import LoginPage
 
 
@@ -17,13 +28,14 @@ def pytest_addoption(parser):
         "--browser",
         action="store",
         default="chrome",
-        help="Specify the browser: chrome, firefox, edge or all",
+        help="Specify the browser: chrome, firefox, edge or all. 'all' launches the browsers in parallel "
+             "but runs their tests one after another; use pytest-xdist (-n) to run them concurrently",
     )
     parser.addoption(
         "--setup-type", 
         action="store",
         default="isolated",
-        help="Specify the session type: isolated or continuous"
+        help="Specify the session type: isolated, continuous or context (Chrome and Edge; Firefox falls back to isolated)"
         )
     parser.addoption(
         "--headless",
@@ -35,46 +47,98 @@ def pytest_addoption(parser):
         action="store_true",
         help="Run browser in private/incognito mode"
         )
+    parser.addoption(
+        "--driver-pool-size",
+        action="store",
+        type=int,
+        default=0,
+        help="Keep up to N warm drivers per browser and reuse them across isolated tests (0 disables pooling). "
+             "Only Chrome and Edge can be reset between tests; Firefox drivers are quit after each test"
+        )
+    parser.addoption(
+        "--prewarm",
+        action="store_true",
+        help="Launch the browser for the next isolated test in the background while the current one runs"
+        )
+    parser.addoption(
+        "--max-live-browsers",
+        action="store",
+        type=int,
+        default=2,
+        help="Maximum number of browsers alive before pre-warming holds off (--browser all still launches every "
+             "selected browser at once)"
+        )
+    parser.addoption(
+        "--browser-profile",
+        action="store",
+        default=BROWSER_PROFILE,
+        help="Browser launch profile from config.BROWSER_PROFILES, e.g. default, stable or fast"
+        )
+    parser.addoption(
+        "--profile-template",
+        action=argparse.BooleanOptionalAction,
+        default=PROFILE_TEMPLATE,
+        help="Launch each browser from a clone of a warmed profile built once and cached on disk "
+             "(--no-profile-template turns it off when PROFILE_TEMPLATE is set)"
+        )
 
-@pytest.fixture(params=["chrome", "firefox", "edge"])
+SUPPORTED_BROWSERS = ["chrome", "firefox", "edge"]
+
+
+def selected_browsers(config):
+    """Return the browsers requested with --browser, expanding 'all'."""
+    browser_option = config.getoption("--browser")
+    if browser_option == "all":
+        return list(SUPPORTED_BROWSERS)
+    return [browser_option]
+
+def pytest_generate_tests(metafunc):
+    # Fan each browser-driven test out into one item per browser. Class scope keeps a continuous
+    # session's tests grouped together on the same browser.
+    browsers = selected_browsers(metafunc.config)
+    if len(browsers) > 1 and "browser_name" in metafunc.fixturenames:
+        metafunc.parametrize("browser_name", browsers, scope="class")
+
+@pytest.fixture(params=SUPPORTED_BROWSERS)
 def all_browsers(request):
     return request.param
 
 
 @pytest.fixture(scope="class")
 def browser(request):
-    browser_option = request.config.getoption("--browser")
-    if browser_option == "all":
-        return ["chrome", "firefox", "edge"]
-    return [browser_option]
+    return selected_browsers(request.config)
 
-def perform_setup(browser_name, headless, private):
-    logger.info(f"Setting up {browser_name} browser")
-    if browser_name == "chrome":
-        options = ChromeOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.add_argument("--incognito")
-        driver = webdriver.Chrome(options=options)
-    elif browser_name == "firefox":
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.add_argument("--private")
-        driver = webdriver.Firefox(options=options)
-    elif browser_name == "edge":
-        options = EdgeOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.add_argument("--inprivate")
-        driver = webdriver.Edge(options=options)
+@pytest.fixture(scope="class")
+def browser_name(request):
+    return selected_browsers(request.config)[0]
+
+def launch_browser(browser_name, headless, private, profile=BROWSER_PROFILE, user_data_dir=None):
+    options, driver_class = BrowserOptions.build(browser_name, headless, private, profile, user_data_dir)
+    if SHARED_DRIVER_SERVICE:
+        driver = service_registry.create_driver(browser_name, driver_class, options)
     else:
-        raise ValueError(f"Unsupported browser request: {browser_name}")
+        driver = driver_class(options=options)
+    if COMMAND_INSTRUMENTATION:
+        instrument_driver(driver)
+    if PAGE_TIMINGS:
+        performance_collector.watch_navigation(driver)
+    return driver
+
+def perform_setup(browser_name, headless, private, profile=BROWSER_PROFILE, use_template=PROFILE_TEMPLATE):
+    logger.info(f"Setting up {browser_name} browser with the '{profile}' profile")
+    
+    # Private windows don't keep caches, so a warmed profile would buy nothing
+    clone = None
+    if use_template and not private:
+        clone = profile_templates.clone(
+            browser_name, lambda path: launch_browser(browser_name, headless, False, profile, path)
+        )
+    driver = launch_browser(browser_name, headless, private, profile, clone)
+    if clone is not None:
+        driver.profile_clone = clone # Deleted by perform_teardown once the browser has quit
+        profile_templates.check_version(browser_name, driver)
     
-    driver.maximize_window()
+    BrowserOptions.prepare(driver, headless, profile)
     wait = WebDriverWait(driver, DEFAULT_TIMEOUT)
     
     # Clear cookies and cache
@@ -82,61 +146,158 @@ def perform_setup(browser_name, headless, private):
     # driver.execute_script("localStorage.clear();")
     # driver.execute_script("sessionStorage.clear();")
     
-    start_test_capture(driver.session_id)
-    
     return driver, wait
 
 @pytest.fixture(scope="function")
-def setup(request):
+def setup(request, browser_name):
+    # browser_name is requested so --browser all parametrizes tests using this fixture too
     setup_type = request.config.getoption("--setup-type")
     
-    if setup_type == "isolated":
-        yield from setup_isolated(request)
-    elif setup_type == "continuous":
-        yield from setup_continuous(request)
-    else:
+    if setup_type not in ("isolated", "continuous", "context"):
         raise ValueError(f"Invalid setup type: {setup_type}")
+    return request.getfixturevalue(f"setup_{setup_type}")
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    pool = DriverPool(
+        partial(
+            perform_setup,
+            profile=request.config.getoption("--browser-profile"),
+            use_template=request.config.getoption("--profile-template"),
+        ),
+        size=request.config.getoption("--driver-pool-size"),
+        prewarm=request.config.getoption("--prewarm"),
+        max_live=request.config.getoption("--max-live-browsers"),
+    )
+    browsers = selected_browsers(request.config)
+    if len(browsers) > 1:
+        headless = request.config.getoption("--headless")
+        private = request.config.getoption("--private")
+        pool.launch_parallel([(name, headless, private) for name in browsers])
+    yield pool
+    pool.close()
+
+def use_driver_pool(config):
+    """Whether drivers should be handed out by the session driver pool rather than launched inline.
+
+    With several browsers the pool hands over the drivers launch_parallel started; without
+    --driver-pool-size they are still quit after each test, as inline drivers are.
+    """
+    return (
+        config.getoption("--driver-pool-size") > 0
+        or config.getoption("--prewarm")
+        or len(selected_browsers(config)) > 1
+    )
 
 @pytest.fixture(scope="function")
-def setup_isolated(request):
-    browser = request.config.getoption("--browser")
+def setup_isolated(request, browser_name):
     headless = request.config.getoption("--headless")
     private = request.config.getoption("--private")
     
-    drivers = []
-    for browser_name in (browser if isinstance(browser, list) else [browser]):
-        driver, wait = perform_setup(browser_name, headless, private)
-        drivers.append((driver, wait))
+    if use_driver_pool(request.config):
+        pool = request.getfixturevalue("driver_pool")
+        driver, wait = pool.acquire(browser_name, headless, private)
+        current_session.set(driver.session_id)
+        logger.info(f"Setting up isolated test on {browser_name} from the driver pool")
+        request.node.driver = driver
+        
+        yield driver, wait
+        
+        # Reset the driver and hand it back instead of quitting it
+        pool.release(driver, wait)
+        current_session.set(None)
+        return
+    
+    driver, wait = perform_setup(
+        browser_name, headless, private,
+        request.config.getoption("--browser-profile"), request.config.getoption("--profile-template")
+    )
     
+    # Log records from here on are filed under this browser session as well as the test
+    current_session.set(driver.session_id)
     logger.info("Setting up isolated test")
-    driver, wait = drivers[0] if len(drivers) == 1 else drivers
     request.node.driver = driver # Attach driver to the test node for teardown
     
     yield driver, wait
     
     # Perform teardown 
     perform_teardown(driver)
+    current_session.set(None)
     
 @pytest.fixture(scope="class")
-def setup_continuous(request):
-    browser = request.config.getoption("--browser")
+def setup_continuous(request, browser_name):
     headless = request.config.getoption("--headless")
     private = request.config.getoption("--private")
     
-    drivers = []
-    for browser_name in (browser if isinstance(browser, list) else [browser]):
-        driver, wait = perform_setup(browser_name, headless, private)
-        drivers.append((driver, wait))
+    if use_driver_pool(request.config):
+        pool = request.getfixturevalue("driver_pool")
+        driver, wait = pool.acquire(browser_name, headless, private)
+    else:
+        pool = None
+        driver, wait = perform_setup(
+            browser_name, headless, private,
+            request.config.getoption("--browser-profile"), request.config.getoption("--profile-template")
+        )
     
-    logger.info("Setting up continuous session for test")
+    current_session.set(driver.session_id)
+    logger.info(f"Setting up continuous session on {browser_name} for test")
     
-    driver, wait = drivers[0] if len(drivers) == 1 else drivers
     request.cls.driver = driver
     request.cls.wait = wait
     yield driver, wait
     
     # Perform teardown
-    perform_teardown(driver)
+    if pool is not None:
+        pool.release(driver, wait)
+    else:
+        perform_teardown(driver)
+    current_session.set(None)
+    
+
+@pytest.fixture(scope="function")
+def setup_context(request, browser_name):
+    # One browser per class (from setup_continuous), with a fresh isolated context per test
+    if not BrowserContext.supports(browser_name):
+        # A window in the same profile would share cookies and storage, so use a fresh session
+        logger.warning(f"{browser_name} cannot isolate tests inside one browser; using an isolated session per test")
+        yield request.getfixturevalue("setup_isolated")
+        return
+    
+    driver, wait = request.getfixturevalue("setup_continuous")
+    context = BrowserContext(driver)
+    context.open()
+    
+    logger.info("Setting up isolated browser context for test")
+    request.node.driver = driver
+    yield driver, wait
+    
+    context.close()
+    
+
+@pytest.fixture(scope="session")
+def storage_state_cache():
+    return StorageStateCache()
+
+@pytest.fixture(scope="function")
+def logged_in_as(setup, storage_state_cache):
+    """Log the test's browser in as a role, reusing that role's cached session when it is still valid.
+
+    Credentials come from the <ROLE>_USERNAME / <ROLE>_PASSWORD environment variables.
+    Usage: driver, wait = logged_in_as("admin")
+    """
+    driver, wait = setup
+    
+    def _logged_in_as(role):
+        user = os.getenv(f"{role.upper()}_USERNAME")
+        password = os.getenv(f"{role.upper()}_PASSWORD")
+        lp = LoginPage(driver)
+        if not storage_state_cache.restore_or_login(
+            driver, role, BASE_URL, lambda: lp.login(user, password), lp.is_logged_in
+        ):
+            pytest.fail(f"Could not log in as '{role}'")
+        return driver, wait
+    
+    return _logged_in_as
     
 
 # def perform_teardown(driver):
@@ -152,6 +313,7 @@ def perform_teardown(driver):
         logger.info(f"Attempting teardown with perform_teardown")
     # Close the browser
         driver.quit()
+        profile_templates.release(getattr(driver, "profile_clone", None))
         
     # Log out if logged in
     # try:
@@ -169,7 +331,32 @@ def perform_teardown(driver):
         logger.warning(f"Problem performing teardown steps: {str(e)}")
     
         
+class XdistReporting:
+    """Hooks that only exist under pytest-xdist: collect worker log files on the controller."""
+
+    def __init__(self):
+        self.worker_logs = {}
+
+    def pytest_testnodedown(self, node, error):
+        log_file = getattr(node, "workeroutput", {}).get("log_file")
+        if log_file:
+            self.worker_logs[node.workerinput["workerid"]] = log_file
+
+    def pytest_sessionfinish(self, session):
+        if self.worker_logs:
+            merged = merge_worker_logs(self.worker_logs)
+            logger.info(f"Merged {len(self.worker_logs)} worker log(s) into {merged}")
+
+
 def pytest_configure(config):
+    # Page-object actions report their timings and enforce their budgets on every process
+    if performance_collector.after_action not in page_action_hooks:
+        page_action_hooks.append(performance_collector.after_action)
+
+    if hasattr(config, "workerinput"):
+        # xdist workers don't write the HTML report; the controller assembles it from their results
+        return
+
     # Get the test suite name
     suite_name = "pytestpackage"
 
@@ -190,6 +377,31 @@ def pytest_configure(config):
     if config.option.htmlpath:
         config.option.htmlpath = report_path
 
+    if config.pluginmanager.hasplugin("xdist"):
+        config.pluginmanager.register(XdistReporting(), "xdist_reporting")
+
+
+def pytest_sessionfinish(session):
+    # Drivers are all quit by now, so the shared driver binaries can go too
+    service_registry.shutdown()
+    profile_templates.cleanup()
+    # Screenshots are written in the background; make sure they're on disk before the report is
+    ScreenshotManager.wait_for_pending()
+    flush_logs()
+
+    if command_recorder.tests:
+        # One file per process, so xdist workers never write over each other
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = f"_{WORKER_ID}" if WORKER_ID else ""
+        command_recorder.dump(
+            os.path.join(session.config.rootdir, "reports", f"webdriver_commands_{timestamp}{suffix}.json")
+        )
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        # Hand this worker's log file back to the controller for merging
+        workeroutput["log_file"] = logger.log_file
+
 
 def pytest_html_report_title(report):
     datestamp = datetime.now().strftime("%A - %m%Y")
@@ -201,23 +413,43 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     
-    if report.when == call:
+    if report.when == "call":
         # Captures logs for the test.
-        logs = get_logs_for_test(item.name)
+        logs = get_logs_for_test(item.nodeid)
         
-        # Adds logs to the report.
-        extra = getattr(report, 'extra', [])
-        extra.append(pytest.html.extras.text(logs, name="Log"))
-        report.extra = extra
+        # Adds logs to the report. Extras are plain dicts, so they travel from xdist workers to
+        # the controller with the rest of the report.
+        report_extras = getattr(report, 'extras', [])
+        report_extras.append(extras.text(logs, name="Log"))
+        if report.failed:
+            # Structured records (time, level, browser session) make failures easier to correlate
+            report_extras.append(extras.json(get_logs_for_test(item.nodeid, fmt="json"), name="Log records"))
+        commands = command_recorder.summary_for(item.nodeid)
+        if commands is not None:
+            report_extras.append(extras.json(commands, name="WebDriver commands"))
+        timings = performance_collector.records_for(item.nodeid)
+        if timings:
+            report_extras.append(extras.json(timings, name="Page performance"))
+        # Screenshots are embedded as thumbnails linking to the full-size images in the store
+        ScreenshotManager.wait_for_pending(timeout=DEFAULT_TIMEOUT)
+        reports_dir = os.path.join(item.config.rootdir, "reports")
+        for screenshot in screenshot_store.records_for(item.nodeid):
+            report_extras.append(extras.html(screenshot_store.thumbnail_html(screenshot, reports_dir)))
+        report.extras = report_extras
         
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_setup(item):
     # Clear the log capture for this test
-    start_test_capture(item.name)
+    start_test_capture(item.nodeid)
+    # Charge log records and WebDriver commands from here until teardown ends to this test
+    current_test.set(item.nodeid)
     yield
     
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_teardown(item):
-    end_test_capture(item.name)
+    end_test_capture(item.nodeid)
     yield
+    current_test.set(None)
+    # Make the log file complete up to the end of this test
+    flush_logs()
     
@@ -1,15 +1,20 @@
 import os
 import time
+from urllib.parse import urljoin
 from utilities.utils import logger
 from dotenv import load_dotenv
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from utilities.element_locator import ElementLocator
+from base.page_element import Element
+from selenium.common.exceptions import TimeoutException
+from utilities.element_locator import ElementLocator, LocatorRegistry
 from utilities.element_interactor import ElementInteractor
+from utilities.explicit_wait_type import ExplicitWaitType
+from utilities.dom_snapshot import DomSnapshot
 from utilities.screenshot_manager import ScreenshotManager
-from utilities.config import DEFAULT_TIMEOUT, SCREENSHOT_DIR
+from utilities.http_login import HttpLogin
+from utilities.command_instrumentation import instrument_page_object
+from utilities.page_performance import performance_budget
+from utilities.config import DEFAULT_TIMEOUT, BASE_URL, LOGIN_BUDGET_MS
 
 # Initialize ScreenshotManager
 
@@ -17,6 +22,7 @@ shot = ScreenshotManager()
 
 load_dotenv()
 
+@instrument_page_object
 class LoginPage:
     """
     Page Object for login page
@@ -31,11 +37,14 @@ class LoginPage:
             driver (webdriver): The Selenium WebDriver instance
         """
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, DEFAULT_TIMEOUT)
         self.locator = ElementLocator(driver)
-        self.interact = ElementInteractor(driver)
+        self.interact = ElementInteractor(driver, self.locator)
+        self.waits = ExplicitWaitType(driver)
 
         
+    # Paths
+    _login_path = "/login"
+    
     # Locators
     _login_link = "//div[contains(@class, 'navbar')]//a[@href='/login']"
     _username_input = "//form[contains(@method, 'POST')]//input[@type='email']"
@@ -43,8 +52,35 @@ class LoginPage:
     _login_button = "//form[contains(@method, 'POST')]//button[@id='login']"
     _dropdown_menu = "//button[@id='dropdownMenu1']"
     _incorrect_details = "//form[@method='POST']//span[@id='incorrectdetails']"
+    _error_banner = "//div[contains(@class, 'alert-danger')]"
+    
+    # Declarative elements, located on first use and scoped to the login form
+    login_form = Element(By.XPATH, "//form[contains(@method, 'POST')]")
+    username_field = Element(By.CSS_SELECTOR, "input[type='email']", parent="login_form")
+    password_field = Element(By.CSS_SELECTOR, "input[type='password']", parent="login_form")
+    
+    # Elements that can show up once the login form is submitted, checked together
+    _login_outcomes = {
+        "success": _dropdown_menu,
+        "incorrect_details": _incorrect_details,
+        "error_banner": _error_banner,
+    }
         
     
+    def compile_locators(self):
+        """
+        Compile this page's XPath locators to CSS, validated against the page currently loaded.
+
+        Returns:
+            LocatorRegistry: The compiled locators. Use get(name) for the fastest safe form and
+                benchmark() to compare per-locator resolution times.
+        """
+        registry = LocatorRegistry(self.driver)
+        for name in ("_login_link", "_username_input", "_password_input", "_login_button",
+                     "_dropdown_menu", "_incorrect_details", "_error_banner"):
+            registry.register(name, getattr(self, name))
+        return registry
+        
     def click_login_link(self):
         """Click the login link."""
         logger.info("Clicking login link from click_method.")
@@ -62,11 +98,11 @@ class LoginPage:
         
     def clear_username(self):
         logger.info("Clearing the username field")
-        self.locator.get_element(self._username_input).clear()
+        self.username_field.clear()
         
     def clear_password(self):
         logger.info("Clearing the password field")
-        self.locator.get_element(self._password_input).clear()
+        self.password_field.clear()
         
     def enter_password(self, password):
         """
@@ -83,10 +119,14 @@ class LoginPage:
         logger.info("Clicking the login button.")
         self.interact.element_click(self._login_button)
         
-    def verify_all_elements_present(self):
+    def verify_all_elements_present(self, snapshot=False):
         """
         Verify that all required elements are present of the page
         
+        Args:
+            snapshot (bool, optional): Once the form has rendered, check the remaining elements
+                against a single page_source snapshot instead of the live page. Defaults to False.
+        
         Returns: 
             bool: True is all elements are present, False otherwise
         """
@@ -94,43 +134,100 @@ class LoginPage:
         self.click_login_link()
         
         logger.info("Verifying all expected elements are present.")
+        locators = {
+            "login_button": self._login_button,
+            "username_input": self._username_input,
+            "password_input": self._password_input,
+        }
         try:
-            for locator in [self._login_button, self._username_input, self._password_input]:
-                self.wait.until(EC.presence_of_element_located((By.XPATH, locator)))
-                logger.info(f"{locator} was located succesfully.")
+            if snapshot:
+                # Wait for the form to render, then check everything else offline
+                self.waits.wait_for_elements({"login_button": self._login_button}, timeout=DEFAULT_TIMEOUT)
+                results = DomSnapshot.check(self.driver, locators)
+                missing = [name for name, result in results.items() if not result["present"]]
+                if missing:
+                    logger.error(f"Could not find all elements: {', '.join(missing)}")
+                    return False
+                return True
+            # All locators are checked together in one script call
+            self.waits.wait_for_elements(locators, timeout=DEFAULT_TIMEOUT)
             return True
-        except NoSuchElementException:
-            logger.error(f"Could not find {locator}")
+        except TimeoutException as e:
+            logger.error(f"Could not find all elements: {e.msg}")
             return False
         
+    def resolve_login_outcome(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Wait for the first of the possible login outcomes to appear.
+
+        Args:
+            timeout (int, optional): Maximum seconds to wait. Defaults to DEFAULT_TIMEOUT.
+
+        Returns:
+            str: 'success', 'incorrect_details' or 'error_banner', or None if nothing appeared.
+        """
+        try:
+            # The error markers sit hidden in the page, so only a visible outcome counts
+            outcome, _, latency = self.waits.wait_for_any(self._login_outcomes, timeout, "visible")
+            logger.info(f"Login outcome '{outcome}' resolved in {latency * 1000:.0f} ms")
+            return outcome
+        except TimeoutException:
+            logger.error(f"No login outcome appeared within {timeout} seconds")
+            return None
+        
     def verify_login_successful(self):
-        """_summary_
+        """
+        Verify the login succeeded, failing fast if an error appears instead.
 
         Raises:
-            TimeoutException: _description_
+            TimeoutException: If the account dropdown does not appear.
 
         Returns:
-            _type_: _description_
+            bool: True if the login succeeded.
         """
-        try:
-            self.wait.until(EC.presence_of_element_located((By.XPATH, self._dropdown_menu)))
+        outcome = self.resolve_login_outcome()
+        if outcome == "success":
             logger.info(f"Login successful, user account dropdown found")
             return True
-        except TimeoutException:
-            logger.error("Login failed or took too long to complete.")
-            raise TimeoutException("Login failed or took too long to complete.")
+        logger.error(f"Login failed or took too long to complete (outcome: {outcome}).")
+        raise TimeoutException("Login failed or took too long to complete.")
         
     def verify_login_failed(self):
-        try:
-            self.wait.until(EC.presence_of_element_located((By.XPATH, self._incorrect_details)))
+        """
+        Verify the login was rejected, failing fast if it succeeds instead.
+
+        Raises:
+            TimeoutException: If the login succeeded or no warning appeared.
+
+        Returns:
+            bool: True if the login was rejected.
+        """
+        outcome = self.resolve_login_outcome()
+        if outcome in ("incorrect_details", "error_banner"):
             shot.take_screenshot(self.driver, "Invalid_Login_Creds")
             logger.info(f"Login was not successful, warning was found")
             return True
+        shot.take_screenshot(self.driver, "Invalid_Login_unexpected_error")
+        logger.error(f"Login succeeded or warning was not found (outcome: {outcome}).")
+        raise TimeoutException("Login succeeded or warning was not found.")
+        
+    def is_logged_in(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Check whether a user is logged in, i.e. the account dropdown is shown.
+
+        Args:
+            timeout (int, optional): Seconds to wait for the dropdown. Defaults to DEFAULT_TIMEOUT.
+
+        Returns:
+            bool: True if the account dropdown appears, False otherwise.
+        """
+        try:
+            self.waits.wait_until({"dropdown_menu": self._dropdown_menu}, "present", timeout)
+            return True
         except TimeoutException:
-            shot.take_screenshot(self.driver, "Invalid_Login_unexpected_error")
-            logger.error("Login succeeded or warning was not found.")
-            raise TimeoutException("Login succeeded or warning was not found.")
+            return False
         
+    @performance_budget("action_ms", LOGIN_BUDGET_MS)
     def login(self, user="", password=""):
         """_summary_
 
@@ -140,11 +237,37 @@ class LoginPage:
         """
         logger.info(f"Attempting login for user: {user}")
         self.click_login_link()
-        logger.info(f"Attemping to enter user name")
-        self.enter_username(user)
-        logger.info(f"Attempting to enter password")
-        self.enter_password(password)
-        logger.info(f"attempting to click login_button")
-        self.click_login_button()
+        logger.info(f"Attempting to fill in the login form and submit")
+        try:
+            # The link navigates, so let the form render before filling it in one batch
+            self.waits.wait_for_elements({"username": self._username_input, "password": self._password_input})
+        except TimeoutException as e:
+            logger.error(f"Login form did not render: {e.msg}")
+        self.interact.fill_form(
+            {self._username_input: user, self._password_input: password},
+            submit=self._login_button,
+        )
         
+    def api_login(self, user="", password="", base_url=BASE_URL):
+        """
+        Log in over HTTP instead of through the form, then load base_url already authenticated.
         
+        Submits the same POST form that _username_input, _password_input and _login_button
+        fill in, and copies the resulting session cookies into the browser. Use login() for
+        tests that cover the login UI itself.
+
+        Args:
+            user (str, optional): The username for the test account. Defaults to "".
+            password (str, optional): The password for the associated username. Defaults to "".
+            base_url (str, optional): The page to open once logged in. Defaults to BASE_URL.
+
+        Returns:
+            bool: True if the login returned cookies to inject, False otherwise.
+        """
+        logger.info(f"Attempting HTTP login for user: {user}")
+        cookies = HttpLogin.login(urljoin(base_url, self._login_path), user, password)
+        if not cookies:
+            return False
+        HttpLogin.inject_cookies(self.driver, cookies, base_url)
+        self.driver.get(base_url)
+        return True
@@ -0,0 +1,84 @@
+import pytest
+from utilities.browser_context import BrowserContext
+
+
+class FakeSwitchTo:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeFirefoxDriver:
+    """A driver without CDP, as Firefox is."""
+
+    def __init__(self):
+        self.name = "firefox"
+        self.current_window_handle = "home"
+        self.switch_to = FakeSwitchTo(self)
+        self.cdp_calls = []
+
+
+class FakeChromeDriver(FakeFirefoxDriver):
+    """Answers the CDP target commands the way chromedriver does."""
+
+    def __init__(self):
+        super().__init__()
+        self.name = "chrome"
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_calls.append((command, params))
+        if command == "Target.createBrowserContext":
+            return {"browserContextId": "context-1"}
+        if command == "Target.createTarget":
+            return {"targetId": "target-1"}
+        return {}
+
+
+class TestBrowserContext:
+
+    def test_supports_chromium_only(self):
+        assert BrowserContext.supports("chrome")
+        assert BrowserContext.supports("edge")
+        assert not BrowserContext.supports("firefox")
+
+    def test_open_creates_cdp_context_and_switches_into_it(self):
+        driver = FakeChromeDriver()
+        context = BrowserContext(driver)
+
+        assert context.open() == "target-1"
+        assert driver.current_window_handle == "target-1"
+        assert driver.cdp_calls == [
+            ("Target.createBrowserContext", {}),
+            ("Target.createTarget", {"url": "about:blank", "browserContextId": "context-1"}),
+        ]
+
+    def test_open_reapplies_url_blocking_in_the_new_context(self):
+        driver = FakeChromeDriver()
+        driver.browser_profile = "fast"
+        BrowserContext(driver).open()
+
+        assert [command for command, _ in driver.cdp_calls[2:]] == ["Network.enable", "Network.setBlockedURLs"]
+        assert "*google-analytics.com*" in driver.cdp_calls[-1][1]["urls"]
+
+    def test_close_disposes_context_and_returns_home(self):
+        driver = FakeChromeDriver()
+        context = BrowserContext(driver)
+        context.open()
+        context.close()
+
+        assert driver.cdp_calls[-1] == ("Target.disposeBrowserContext", {"browserContextId": "context-1"})
+        assert driver.current_window_handle == "home"
+        assert context.context_id is None and context.handle is None
+
+    def test_firefox_cannot_open_context(self):
+        driver = FakeFirefoxDriver()
+        context = BrowserContext(driver)
+
+        with pytest.raises(ValueError):
+            context.open()
+        # Nothing was opened, so closing is a no-op
+        context.close()
+        assert driver.current_window_handle == "home"
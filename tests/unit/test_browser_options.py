@@ -0,0 +1,69 @@
+import pytest
+from utilities.browser_options import BrowserOptions
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.cdp_calls = []
+        self.maximized = False
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+
+    def maximize_window(self):
+        self.maximized = True
+
+
+class TestBrowserOptions:
+
+    def test_fast_chrome_profile(self):
+        options, _ = BrowserOptions.build("chrome", headless=True, profile="fast")
+
+        assert options.page_load_strategy == "eager"
+        assert "--headless" in options.arguments
+        assert "--window-size=1920,1080" in options.arguments
+        assert "--blink-settings=imagesEnabled=false" in options.arguments
+        assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+
+    def test_fast_firefox_profile_uses_prefs(self):
+        options, _ = BrowserOptions.build("firefox", private=True, profile="fast")
+
+        assert options.preferences["permissions.default.image"] == 2
+        assert options.preferences["browser.privatebrowsing.autostart"] is True
+        assert not any(argument.startswith("--disable") for argument in options.arguments)
+
+    def test_default_profile_adds_nothing(self):
+        options, _ = BrowserOptions.build("edge", private=True)
+
+        assert options.arguments == ["--inprivate"]
+        assert options.page_load_strategy == "normal"
+
+    def test_unknown_profile_or_browser_is_rejected(self):
+        with pytest.raises(ValueError):
+            BrowserOptions.build("chrome", profile="turbo")
+        with pytest.raises(ValueError):
+            BrowserOptions.build("safari")
+
+    def test_prepare_blocks_urls_and_skips_maximize_when_headless(self):
+        driver = FakeDriver()
+        BrowserOptions.prepare(driver, headless=True, profile="fast")
+
+        assert driver.cdp_calls[-1][0] == "Network.setBlockedURLs"
+        assert "*google-analytics.com*" in driver.cdp_calls[-1][1]["urls"]
+        assert not driver.maximized
+
+    def test_prepare_maximizes_headed_browsers(self):
+        driver = FakeDriver()
+        BrowserOptions.prepare(driver, headless=False, profile="fast")
+
+        assert driver.maximized
+
+    def test_apply_blocking_uses_the_profile_the_driver_was_prepared_with(self):
+        driver = FakeDriver()
+        BrowserOptions.prepare(driver, headless=True, profile="fast")
+        driver.cdp_calls.clear()
+
+        assert BrowserOptions.apply_blocking(driver)
+        assert [command for command, _ in driver.cdp_calls] == ["Network.enable", "Network.setBlockedURLs"]
+        assert not BrowserOptions.apply_blocking(driver, "default")
@@ -0,0 +1,102 @@
+import json
+import pytest
+from utilities.command_instrumentation import (
+    CommandRecorder,
+    current_test,
+    instrument_driver,
+    instrument_page_object,
+)
+
+
+class FakeExecutor:
+
+    def execute(self, command, params):
+        if command == "fail":
+            raise RuntimeError("boom")
+        return {"value": "x" * 10}
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def send(self, command, params=None):
+        return self.command_executor.execute(command, params or {})
+
+
+@instrument_page_object
+class FakePage:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def action(self):
+        self.driver.send("findElement", {"using": "xpath", "value": "//a"})
+        self.helper()
+
+    def helper(self):
+        self.driver.send("clickElement")
+
+
+@pytest.fixture
+def recorder():
+    return CommandRecorder()
+
+
+@pytest.fixture
+def driver(recorder):
+    token = current_test.set("tests/test_x.py::test_a")
+    yield instrument_driver(FakeDriver(), recorder)
+    current_test.reset(token)
+
+
+class TestCommandInstrumentation:
+
+    def test_records_name_count_and_payload_sizes(self, driver, recorder):
+        driver.send("findElement", {"using": "css selector", "value": "a"})
+        driver.send("findElement", {"using": "css selector", "value": "b"})
+
+        summary = recorder.summary_for("tests/test_x.py::test_a")
+        stats = summary["by_command"]["findElement"]
+        assert stats["count"] == 2
+        assert stats["response_bytes"] == 20
+        assert stats["request_bytes"] > 0
+        assert summary["total"]["count"] == 2
+
+    def test_request_size_covers_every_parameter(self, driver, recorder):
+        params = {"script": "x" * 5000, "args": [1, 2]}
+        driver.send("executeScript", params)
+
+        stats = recorder.summary_for("tests/test_x.py::test_a")["by_command"]["executeScript"]
+        assert stats["request_bytes"] == len(json.dumps(params))
+        assert stats["response_bytes"] == 10
+
+    def test_failed_commands_are_still_recorded(self, driver, recorder):
+        with pytest.raises(RuntimeError):
+            driver.send("fail")
+
+        assert recorder.summary_for("tests/test_x.py::test_a")["by_command"]["fail"]["count"] == 1
+
+    def test_commands_are_charged_to_the_outermost_page_method(self, driver, recorder):
+        FakePage(driver).action()
+        driver.send("getTitle")
+
+        by_method = recorder.summary_for("tests/test_x.py::test_a")["by_method"]
+        assert by_method["FakePage.action"]["count"] == 2
+        assert "FakePage.helper" not in by_method
+        assert by_method["<test body>"]["count"] == 1
+
+    def test_instrumenting_twice_does_not_double_count(self, driver, recorder):
+        instrument_driver(driver, recorder)
+        driver.send("getTitle")
+
+        assert recorder.summary_for("tests/test_x.py::test_a")["total"]["count"] == 1
+
+    def test_dump_writes_json(self, driver, recorder, tmp_path):
+        driver.send("getTitle")
+        path = recorder.dump(str(tmp_path / "reports" / "commands.json"))
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["tests/test_x.py::test_a"]["by_command"]["getTitle"]["count"] == 1
@@ -0,0 +1,35 @@
+from utilities.dom_snapshot import DomSnapshot
+
+PAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<html><body>
+<div class="navbar"><a href="/login">Sign In</a></div>
+<form method="POST">
+    <input type="email" name="email">
+    <input type="password" name="password">
+    <button id="login">Login</button>
+</form>
+</body></html>
+"""
+
+
+class TestDomSnapshot:
+
+    def test_query_evaluates_xpath_and_css(self):
+        results = DomSnapshot(PAGE).query({
+            "username": "//form[contains(@method, 'POST')]//input[@type='email']",
+            "inputs": ("css", "form input"),
+            "login": ("id", "login"),
+            "link": ("linktext", "Sign In"),
+            "dropdown": "//button[@id='dropdownMenu1']",
+        })
+
+        assert {name: result["count"] for name, result in results.items()} == {
+            "username": 1, "inputs": 2, "login": 1, "link": 1, "dropdown": 0,
+        }
+        assert not results["dropdown"]["present"]
+
+    def test_invalid_locator_is_reported(self):
+        results = DomSnapshot(PAGE).query({"broken": "//form[@"})
+
+        assert not results["broken"]["present"]
+        assert "error" in results["broken"]
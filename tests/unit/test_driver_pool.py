@@ -0,0 +1,220 @@
+import pytest
+from utilities.driver_pool import DriverPool
+
+
+class FakeFirefoxDriver:
+    """Minimal stand-in for a WebDriver without CDP that records the calls the pool makes."""
+
+    _counter = 0
+
+    def __init__(self):
+        FakeFirefoxDriver._counter += 1
+        self.session_id = f"session-{FakeFirefoxDriver._counter}"
+        self.name = "fake"
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = self
+        self.visited = []
+        self.quit_called = False
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def new_window(self, type_hint):
+        handle = f"tab-{len(self.window_handles)}-{len(self.visited)}"
+        self.window_handles.append(handle)
+        self.current_window_handle = handle
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def execute_script(self, script, *args):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeDriver(FakeFirefoxDriver):
+    """A Chromium driver: answers the CDP commands reset_driver uses, with a per-window history."""
+
+    def __init__(self):
+        super().__init__()
+        self.history = {"main": ["about:blank"]}
+        self.cdp_calls = []
+        self.cdp_targets = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_calls.append((command, params))
+        self.cdp_targets.append(self.current_window_handle)
+        if command == "Page.getNavigationHistory":
+            urls = self.history.get(self.current_window_handle, ["about:blank"])
+            return {"currentIndex": len(urls) - 1, "entries": [{"url": url} for url in urls]}
+        return {}
+
+    def cleared_origins(self):
+        return {params["origin"] for command, params in self.cdp_calls if command == "Storage.clearDataForOrigin"}
+
+
+@pytest.fixture
+def pool():
+    launched = []
+
+    def factory(browser_name, headless, private):
+        driver = FakeDriver()
+        launched.append(driver)
+        return driver, None
+
+    pool = DriverPool(factory, size=1)
+    pool.launched = launched
+    return pool
+
+
+class TestDriverPool:
+
+    def test_released_driver_is_reused(self, pool):
+        driver, wait = pool.acquire("chrome", True, False)
+        pool.release(driver, wait)
+        reused, _ = pool.acquire("chrome", True, False)
+
+        assert reused is driver
+        assert len(pool.launched) == 1
+        assert ("Network.clearBrowserCookies", {}) in driver.cdp_calls
+
+    def test_reset_clears_every_visited_origin_and_window(self):
+        driver = FakeDriver()
+        driver.history["main"] = ["about:blank", "https://app.example.test/login", "https://sso.example.test/auth"]
+        driver.window_handles.append("popup")
+        driver.history["popup"] = ["https://docs.example.test/help"]
+
+        assert DriverPool.reset_driver(driver)
+        assert driver.cleared_origins() == {
+            "https://app.example.test", "https://sso.example.test", "https://docs.example.test"
+        }
+        # A fresh tab replaces the old ones, so their sessionStorage goes with them
+        assert driver.window_handles == [driver.current_window_handle]
+        assert driver.current_window_handle not in ("main", "popup")
+
+    def test_reset_reapplies_url_blocking_to_the_fresh_tab(self):
+        driver = FakeDriver()
+        driver.browser_profile = "fast"
+
+        assert DriverPool.reset_driver(driver)
+        index = [command for command, _ in driver.cdp_calls].index("Network.setBlockedURLs")
+        assert "*google-analytics.com*" in driver.cdp_calls[index][1]["urls"]
+        assert driver.cdp_targets[index] == driver.current_window_handle != "main"
+
+    def test_driver_without_cdp_is_discarded_instead_of_reused(self):
+        pool = DriverPool(lambda *key: (FakeFirefoxDriver(), None), size=1)
+        driver, wait = pool.acquire("firefox", True, False)
+        pool.release(driver, wait)
+
+        assert driver.quit_called
+        assert pool.idle_count() == 0
+
+    def test_drivers_are_keyed_by_options(self, pool):
+        driver, wait = pool.acquire("chrome", True, False)
+        pool.release(driver, wait)
+        other, _ = pool.acquire("chrome", False, False)
+
+        assert other is not driver
+        assert pool.idle_count(("chrome", True, False)) == 1
+
+    def test_overflow_drivers_are_quit(self, pool):
+        first, _ = pool.acquire("chrome", True, False)
+        second, _ = pool.acquire("chrome", True, False)
+        pool.release(first, None)
+        pool.release(second, None)
+
+        assert not first.quit_called
+        assert second.quit_called
+
+    def test_discarded_driver_releases_its_profile_clone(self, pool, tmp_path):
+        first, _ = pool.acquire("chrome", True, False)
+        second, _ = pool.acquire("chrome", True, False)
+        clone = tmp_path / "clone"
+        clone.mkdir()
+        second.profile_clone = str(clone)
+        pool.release(first, None)
+        pool.release(second, None)
+
+        assert second.quit_called
+        assert not clone.exists()
+
+    def test_close_quits_idle_drivers(self, pool):
+        driver, wait = pool.acquire("firefox", True, False)
+        pool.release(driver, wait)
+        pool.close()
+
+        assert driver.quit_called
+        assert pool.idle_count() == 0
+
+    def test_prewarm_launches_next_driver_in_background(self):
+        pool = DriverPool(lambda *key: (FakeDriver(), None), size=0, prewarm=True, max_live=2)
+        first, _ = pool.acquire("chrome", True, False)
+        second, _ = pool.acquire("chrome", True, False)
+
+        assert second is not first
+        assert pool.live_count == 2
+        pool.release(first, None)
+        pool.release(second, None)
+        pool.close()
+
+        assert first.quit_called and second.quit_called
+        assert pool.live_count == 0
+
+    def test_prewarm_respects_live_browser_cap(self):
+        pool = DriverPool(lambda *key: (FakeDriver(), None), size=0, prewarm=True, max_live=1)
+        pool.acquire("chrome", True, False)
+
+        assert pool.live_count == 1
+        pool.close()
+
+    def test_launch_parallel_launches_every_browser_past_max_live(self):
+        launched = []
+        pool = DriverPool(lambda *key: (launched.append(key) or FakeDriver(), None), size=0, max_live=2)
+        keys = [("chrome", True, False), ("firefox", True, False), ("edge", True, False)]
+        pool.launch_parallel(keys)
+        pool.close()
+
+        assert sorted(launched) == sorted(keys)
+
+    def test_launch_parallel_drivers_are_quit_without_pooling(self):
+        pool = DriverPool(lambda *key: (FakeDriver(), None), size=0)
+        keys = [("chrome", True, False), ("edge", True, False)]
+        pool.launch_parallel(keys)
+        first = [pool.acquire(*key) for key in keys]
+        for driver, wait in first:
+            pool.release(driver, wait)
+
+        assert all(driver.quit_called for driver, _ in first)
+        assert pool.idle_count() == 0
+        pool.close()
+
+    def test_launch_parallel_drivers_are_reused_with_pooling(self):
+        pool = DriverPool(lambda *key: (FakeDriver(), None), size=1)
+        keys = [("chrome", True, False), ("edge", True, False)]
+        pool.launch_parallel(keys)
+        first = [pool.acquire(*key) for key in keys]
+        for driver, wait in first:
+            pool.release(driver, wait)
+        second = [pool.acquire(*key)[0] for key in keys]
+
+        assert second == [driver for driver, _ in first]
+        pool.close()
+
+    def test_launch_parallel_hands_over_one_driver_per_browser(self):
+        pool = DriverPool(lambda *key: (FakeDriver(), None), size=0)
+        keys = [("chrome", True, False), ("firefox", True, False), ("edge", True, False)]
+        pool.launch_parallel(keys)
+        drivers = [pool.acquire(*key)[0] for key in keys]
+
+        assert len({driver.session_id for driver in drivers}) == 3
+        assert pool.live_count == 3
+        pool.close()
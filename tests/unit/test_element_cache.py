@@ -0,0 +1,74 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from utilities.element_locator import ElementLocator
+
+
+class FakeElement:
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.generation = driver.generation
+
+    def clear(self):
+        if self.generation != self.driver.generation:
+            raise StaleElementReferenceException("stale")
+
+
+class FakeDriver:
+    """Counts find_element calls and serves a page generation token like a real page would."""
+
+    def __init__(self):
+        self.generation = "gen-1"
+        self.find_calls = 0
+
+    def execute_script(self, script, *args):
+        return self.generation
+
+    def find_element(self, by_type, locator):
+        self.find_calls += 1
+        return FakeElement(self)
+
+    def navigate(self):
+        self.generation = f"gen-{int(self.generation.split('-')[1]) + 1}"
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+class TestElementCache:
+
+    def test_repeated_lookups_hit_the_cache(self, driver):
+        locator = ElementLocator(driver, cache=True)
+        first = locator.find("//input")
+        second = locator.find("//input")
+
+        assert first is second
+        assert driver.find_calls == 1
+        assert locator.cache.stats()["hits"] == 1
+
+    def test_navigation_invalidates_cache(self, driver):
+        locator = ElementLocator(driver, cache=True)
+        first = locator.find("//input")
+        driver.navigate()
+        locator.page_changed()
+
+        assert locator.find("//input") is not first
+        assert driver.find_calls == 2
+
+    def test_stale_handle_is_located_again(self, driver):
+        locator = ElementLocator(driver, cache=True)
+        locator.find("//input")
+        driver.navigate()
+        locator.use_element("//input", "xpath", lambda element: element.clear())
+
+        assert driver.find_calls == 2
+        assert locator.cache.stats()["stale_drops"] == 1
+
+    def test_cache_is_off_by_default(self, driver):
+        locator = ElementLocator(driver, cache=False)
+        locator.find("//input")
+        locator.find("//input")
+
+        assert driver.find_calls == 2
@@ -0,0 +1,104 @@
+import pytest
+from utilities import element_interactor
+from utilities.element_interactor import ElementInteractor
+
+
+class FakeElement:
+    """An input that keeps what was typed into it."""
+
+    def __init__(self, fail=False):
+        self.value = ""
+        self.fail = fail
+        self.clicked = False
+
+    def clear(self):
+        self.value = ""
+
+    def send_keys(self, text):
+        if self.fail:
+            raise RuntimeError("element not interactable")
+        self.value += text
+
+    def click(self):
+        self.clicked = True
+
+
+class FakeActionChains:
+    """Types into the queued elements in order; can be told to fail after some of them."""
+
+    fail_after = None
+
+    def __init__(self, driver):
+        self.steps = []
+
+    def click(self, element):
+        return self
+
+    def send_keys(self, text):
+        self.steps.append(text)
+        return self
+
+    def perform(self):
+        elements = FakeActionChains.elements
+        for index, (element, text) in enumerate(zip(elements, self.steps)):
+            if FakeActionChains.fail_after is not None and index >= FakeActionChains.fail_after:
+                raise RuntimeError("move target out of bounds")
+            element.send_keys(text)
+
+
+class FakeLocator:
+    """Answers query_elements from a dict of locator to element (missing locators aren't found)."""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.changed = False
+
+    def query_elements(self, driver, lookup, with_elements=False):
+        return {
+            name: {"element": self.elements[locator]} if locator in self.elements else {"error": "element not found"}
+            for name, locator in lookup.items()
+        }
+
+    def page_changed(self):
+        self.changed = True
+
+
+@pytest.fixture
+def form(monkeypatch):
+    elements = {"//user": FakeElement(), "//pass": FakeElement(), "//submit": FakeElement()}
+    monkeypatch.setattr(element_interactor, "ActionChains", FakeActionChains)
+    monkeypatch.setattr(FakeActionChains, "elements", [elements["//user"], elements["//pass"]], raising=False)
+    monkeypatch.setattr(FakeActionChains, "fail_after", None)
+    locator = FakeLocator(elements)
+    return ElementInteractor(object(), locator), elements
+
+
+class TestFillForm:
+
+    def test_batched_fill_and_submit(self, form):
+        interactor, elements = form
+        results = interactor.fill_form({"//user": "user", "//pass": "secret"}, submit="//submit")
+
+        assert results == {"//user": None, "//pass": None}
+        assert (elements["//user"].value, elements["//pass"].value) == ("user", "secret")
+        assert elements["//submit"].clicked
+        assert interactor.locator.changed
+
+    def test_fallback_does_not_duplicate_text_typed_before_failure(self, form):
+        interactor, elements = form
+        FakeActionChains.fail_after = 1
+        results = interactor.fill_form({"//user": "user", "//pass": "secret"})
+
+        assert results == {"//user": None, "//pass": None}
+        assert (elements["//user"].value, elements["//pass"].value) == ("user", "secret")
+
+    def test_failures_are_reported_per_field(self, form):
+        interactor, elements = form
+        FakeActionChains.fail_after = 1
+        elements["//pass"].fail = True
+        results = interactor.fill_form({"//user": "user", "//pass": "secret", "//missing": "x"})
+
+        assert results["//user"] is None
+        assert results["//pass"] == "element not interactable"
+        assert results["//missing"] == "element not found"
+        assert elements["//user"].value == "user"
@@ -0,0 +1,87 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from utilities.element_locator import BULK_QUERY_JS, ElementLocator
+
+
+class FakeDriver:
+    """Answers BULK_QUERY_JS from a fixed page: name mapped to (present, visible)."""
+
+    def __init__(self, page):
+        self.page = page
+        self.calls = []
+
+    def execute_script(self, script, specs, with_elements):
+        self.calls.append((script, specs, with_elements))
+        results = {}
+        for name in specs:
+            present, visible = self.page.get(name, (False, False))
+            results[name] = {"present": present, "visible": visible, "count": int(present)}
+            if with_elements:
+                results[name]["element"] = f"{name}-el" if present else None
+        return results
+
+
+class TestQueryElements:
+
+    def test_all_locators_resolved_in_one_call(self):
+        driver = FakeDriver({"button": (True, True), "email": (True, False)})
+
+        results = ElementLocator.query_elements(
+            driver, {"button": "//button", "email": ("id", "email"), "missing": ("css", ".nope")}
+        )
+
+        assert len(driver.calls) == 1
+        script, specs, with_elements = driver.calls[0]
+        assert script == BULK_QUERY_JS
+        assert specs == {
+            "button": {"by": "xpath", "value": "//button"},
+            "email": {"by": "xpath", "value": '//*[@id="email"]'},
+            "missing": {"by": "css", "value": ".nope"},
+        }
+        assert not with_elements
+        assert [results[name]["present"] for name in ("button", "email", "missing")] == [True, True, False]
+
+    def test_elements_returned_on_request(self):
+        driver = FakeDriver({"button": (True, True)})
+
+        results = ElementLocator.query_elements(driver, {"button": "//button"}, with_elements=True)
+        assert results["button"]["element"] == "button-el"
+
+    def test_unsupported_locator_type(self):
+        with pytest.raises(ValueError):
+            ElementLocator.query_elements(FakeDriver({}), {"button": ("tag", "button")})
+
+
+class TestWaitForElements:
+
+    def test_present_is_satisfied_by_hidden_elements(self):
+        driver = FakeDriver({"email": (True, False)})
+
+        results = ElementLocator.wait_for_elements(driver, {"email": ("id", "email")}, "present", timeout=1)
+        assert results["email"]["present"]
+
+    def test_visible_waits_for_visibility(self):
+        driver = FakeDriver({"email": (True, False)})
+
+        with pytest.raises(TimeoutException, match="email"):
+            ElementLocator.wait_for_elements(driver, {"email": ("id", "email")}, "visible", timeout=0.2)
+        assert len(driver.calls) > 1
+
+    def test_all_mode_needs_every_locator(self):
+        driver = FakeDriver({"button": (True, True)})
+
+        with pytest.raises(TimeoutException, match="missing"):
+            ElementLocator.wait_for_elements(driver, {"button": "//button", "missing": "//missing"}, timeout=0.2)
+
+    def test_any_mode_needs_one_locator(self):
+        driver = FakeDriver({"button": (True, True)})
+
+        results = ElementLocator.wait_for_elements(
+            driver, {"button": "//button", "missing": "//missing"}, mode="any", timeout=1, with_elements=True
+        )
+        assert results["button"]["element"] == "button-el"
+        assert len(driver.calls) == 1
+
+    def test_unsupported_condition(self):
+        with pytest.raises(ValueError):
+            ElementLocator.wait_for_elements(FakeDriver({}), {"button": "//button"}, "clickable")
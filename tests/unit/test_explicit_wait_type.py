@@ -0,0 +1,163 @@
+import time
+import pytest
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    TimeoutException,
+    WebDriverException,
+)
+from utilities.explicit_wait_type import ExplicitWaitType
+
+
+def _result(present, visible=None, element=None):
+    return {"present": present, "visible": present if visible is None else visible,
+            "count": int(present), "element": element}
+
+
+class FakeDriver:
+    """
+    Plays back scripted observer outcomes (or exceptions) from execute_async_script, and answers
+    polling queries from execute_script with the current page state.
+    """
+
+    def __init__(self, outcomes=(), page=None):
+        self.outcomes = list(outcomes)
+        self.page = page or {}
+        self.async_calls = 0
+        self.polls = 0
+
+    def execute_async_script(self, script, specs, condition, mode, slice_ms):
+        self.async_calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def execute_script(self, script, specs, with_elements):
+        self.polls += 1
+        return {name: dict(self.page.get(name, _result(False))) for name in specs}
+
+
+class TestObserverWait:
+
+    def test_returns_results_once_satisfied(self):
+        results = {"button": _result(True, element="el")}
+        driver = FakeDriver([{"satisfied": True, "results": results}])
+
+        assert ExplicitWaitType(driver, "observer").wait_until({"button": "//button"}) == results
+        assert driver.polls == 0
+
+    def test_reattaches_after_navigation(self):
+        results = {"button": _result(True)}
+        driver = FakeDriver([
+            JavascriptException("javascript error: document unloaded while waiting for result"),
+            {"satisfied": True, "results": results},
+        ])
+
+        assert ExplicitWaitType(driver, "observer").wait_until({"button": "//button"}, timeout=5) == results
+        assert driver.async_calls == 2
+
+    def test_other_script_errors_are_raised_immediately(self):
+        driver = FakeDriver([JavascriptException("javascript error: resolveLocators is not defined")])
+        start = time.monotonic()
+
+        with pytest.raises(JavascriptException):
+            ExplicitWaitType(driver, "observer").wait_until({"button": "//button"}, timeout=5)
+        assert time.monotonic() - start < 1
+        assert driver.async_calls == 1
+
+    def test_invalid_locator_is_raised_instead_of_timing_out(self):
+        results = {"button": {"present": False, "visible": False, "count": 0, "error": "SyntaxError: bad xpath"}}
+        driver = FakeDriver([{"satisfied": False, "results": results}])
+
+        with pytest.raises(InvalidSelectorException, match="bad xpath"):
+            ExplicitWaitType(driver, "observer").wait_until({"button": "//button["}, timeout=5)
+
+    def test_falls_back_to_polling_without_async_scripts(self):
+        driver = FakeDriver([WebDriverException("async scripts not supported")],
+                            page={"button": _result(True, element="el")})
+
+        results = ExplicitWaitType(driver, "observer").wait_until({"button": "//button"}, timeout=5)
+        assert results["button"]["element"] == "el"
+        assert driver.polls == 1
+
+
+class TestPollingWait:
+
+    def test_times_out_when_never_satisfied(self):
+        driver = FakeDriver()
+
+        with pytest.raises(TimeoutException, match="button"):
+            ExplicitWaitType(driver, "polling").wait_until({"button": "//button"}, timeout=0.2)
+        assert driver.polls > 1
+
+    def test_invalid_locator_is_raised_without_waiting(self):
+        driver = FakeDriver(page={"button": {"present": False, "visible": False, "count": 0, "error": "bad"}})
+
+        with pytest.raises(InvalidSelectorException):
+            ExplicitWaitType(driver, "polling").wait_until({"button": "//button["}, timeout=5)
+        assert driver.polls == 1
+
+
+class ChangingPageDriver(FakeDriver):
+    """
+    Polling-only driver whose page gains elements as polls go by: appears maps name to poll number.
+    Names in hidden are in the DOM from the start but never shown.
+    """
+
+    def __init__(self, appears, hidden=()):
+        super().__init__()
+        self.appears = appears
+        self.hidden = hidden
+
+    def execute_script(self, script, specs, with_elements):
+        self.polls += 1
+        results = {}
+        for name in specs:
+            if name in self.hidden:
+                results[name] = _result(True, visible=False, element=f"{name}-el")
+            else:
+                results[name] = _result(self.polls >= self.appears.get(name, float("inf")), element=f"{name}-el")
+        return results
+
+
+class TestWaitForAny:
+
+    def test_first_outcome_to_appear_wins(self):
+        driver = ChangingPageDriver({"error": 3, "success": 5})
+
+        name, element, latency = ExplicitWaitType(driver, "polling").wait_for_any(
+            {"success": "//success", "error": "//error"}, timeout=5
+        )
+        assert (name, element) == ("error", "error-el")
+        assert driver.polls == 3
+        assert latency >= 0
+
+    def test_declaration_order_breaks_ties(self):
+        driver = ChangingPageDriver({"error": 1, "success": 1})
+
+        name, _, _ = ExplicitWaitType(driver, "polling").wait_for_any({"success": "//success", "error": "//error"})
+        assert name == "success"
+
+    def test_times_out_when_no_outcome_appears(self):
+        driver = ChangingPageDriver({})
+
+        with pytest.raises(TimeoutException):
+            ExplicitWaitType(driver, "polling").wait_for_any({"success": "//success", "error": "//error"}, timeout=0.2)
+
+    def test_hidden_outcome_does_not_win(self):
+        driver = ChangingPageDriver({"success": 3}, hidden=("error",))
+
+        name, element, _ = ExplicitWaitType(driver, "polling").wait_for_any(
+            {"success": "//success", "error": "//error"}, timeout=5
+        )
+        assert (name, element) == ("success", "success-el")
+        assert driver.polls == 3
+
+    def test_present_condition_counts_hidden_outcomes(self):
+        driver = ChangingPageDriver({"success": 3}, hidden=("error",))
+
+        name, _, _ = ExplicitWaitType(driver, "polling").wait_for_any(
+            {"success": "//success", "error": "//error"}, timeout=5, condition="present"
+        )
+        assert name == "error"
@@ -0,0 +1,126 @@
+import logging
+import threading
+import pytest
+from utilities.utils import HTMLReportLogger, current_session, current_test
+
+
+class ExplodingArg:
+    """Fails if it is ever formatted."""
+
+    def __str__(self):
+        raise AssertionError("formatted before rendering")
+
+
+@pytest.fixture
+def in_test():
+    tokens = []
+
+    def enter(test_name, session=None):
+        tokens.append((current_test.set(test_name), current_session.set(session)))
+
+    yield enter
+    for test_token, session_token in reversed(tokens):
+        current_session.reset(session_token)
+        current_test.reset(test_token)
+
+
+class TestHTMLReportLogger:
+
+    def test_capture_stops_when_test_ends(self, in_test):
+        capture = HTMLReportLogger()
+        in_test("test_a")
+        capture.start_test_capture("test_a")
+        capture.log(logging.INFO, "inside %s", ("test_a",))
+        capture.end_test_capture("test_a")
+        capture.log(logging.INFO, "after the test")
+
+        assert capture.get_logs_for_test("test_a") == "INFO: inside test_a"
+
+    def test_records_are_not_formatted_until_rendered(self, in_test):
+        capture = HTMLReportLogger()
+        capture.log(logging.INFO, "%s", (ExplodingArg(),))
+
+        in_test("test_a")
+        capture.start_test_capture("test_a")
+        capture.log(logging.INFO, "%s", (ExplodingArg(),))
+        records, _ = capture.get_records("test_a")
+        _, (_, level, template, args) = records[0]
+        assert (level, template) == (logging.INFO, "%s")
+        assert isinstance(args[0], ExplodingArg)
+
+    def test_records_follow_the_context_not_a_global_slot(self, in_test):
+        capture = HTMLReportLogger()
+        capture.start_test_capture("test_a")
+        capture.start_test_capture("test_b")
+
+        def run(test_name):
+            current_test.set(test_name)
+            capture.log(logging.INFO, f"from {test_name}")
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("test_a", "test_b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # A helper thread started without the test's context isn't charged to any test
+        helper = threading.Thread(target=capture.log, args=(logging.INFO, "from a helper"))
+        helper.start()
+        helper.join()
+
+        assert capture.get_logs_for_test("test_a") == "INFO: from test_a"
+        assert capture.get_logs_for_test("test_b") == "INFO: from test_b"
+
+    def test_sessions_are_tagged_when_a_test_uses_several(self, in_test):
+        capture = HTMLReportLogger()
+        capture.start_test_capture("test_a")
+        in_test("test_a", "session-one")
+        capture.log(logging.INFO, "first browser")
+        in_test("test_a", "session-two")
+        capture.log(logging.INFO, "second browser")
+        capture.end_test_capture("test_a")
+
+        assert capture.get_logs_for_test("test_a").splitlines() == [
+            "[session-] INFO: first browser",
+            "[session-] INFO: second browser",
+        ]
+        records = capture.get_logs_for_test("test_a", fmt="json")
+        assert [record["session"] for record in records] == ["session-one", "session-two"]
+        assert records[0]["level"] == "INFO"
+
+    def test_line_cap_drops_oldest_records(self, in_test):
+        capture = HTMLReportLogger(max_lines=3)
+        in_test("test_a")
+        capture.start_test_capture("test_a")
+        for index in range(5):
+            capture.log(logging.INFO, "line %d", (index,))
+
+        assert capture.get_logs_for_test("test_a").splitlines() == [
+            "... 2 earlier line(s) dropped ...",
+            "INFO: line 2",
+            "INFO: line 3",
+            "INFO: line 4",
+        ]
+
+    def test_size_cap_drops_oldest_records(self, in_test):
+        capture = HTMLReportLogger(max_bytes=20)
+        in_test("test_a")
+        capture.start_test_capture("test_a")
+        for index in range(5):
+            capture.log(logging.INFO, f"line {index}")
+
+        lines = capture.get_logs_for_test("test_a").splitlines()
+        assert lines[0].startswith("... ")
+        assert lines[-1] == "INFO: line 4"
+
+    def test_finished_tests_are_spilled_out_of_memory(self, in_test):
+        capture = HTMLReportLogger()
+        for name in ("test_a", "test_b"):
+            in_test(name)
+            capture.start_test_capture(name)
+            capture.log(logging.WARNING, "from %s with %r", (name, ExplodingArg.__name__))
+            capture.end_test_capture(name)
+
+        assert capture.test_logs == {}
+        assert capture.get_logs_for_test("test_a") == "WARNING: from test_a with 'ExplodingArg'"
+        assert capture.get_logs_for_test("test_b", fmt="json")[0]["message"] == "from test_b with 'ExplodingArg'"
+        assert capture.get_logs_for_test("test_c") == ""
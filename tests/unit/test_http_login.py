@@ -0,0 +1,96 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import pytest
+from utilities.http_login import HttpLogin
+
+VALID_USER = "admin@example.test"
+VALID_PASS = "secret"
+CSRF_TOKEN = "token-123"
+
+# Replica of the login form the page object drives
+LOGIN_FORM = f"""
+<html><body>
+<div class="navbar"><a href="/login">Sign In</a></div>
+<form method="POST" action="/login">
+    <input type="hidden" name="_token" value="{CSRF_TOKEN}">
+    <input type="email" name="email">
+    <input type="password" name="password">
+    <button id="login" type="submit">Login</button>
+</form>
+</body></html>
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, body, cookie=None):
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(payload)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        # Like real apps, hand out an XSRF cookie before anyone has logged in
+        self._respond(LOGIN_FORM, "XSRF-TOKEN=xsrf-456; Path=/")
+
+    def do_POST(self):
+        self.server.client_ports.add(self.client_address[1])
+        length = int(self.headers["Content-Length"])
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        if form == {"_token": CSRF_TOKEN, "email": VALID_USER, "password": VALID_PASS}:
+            self._respond("<button id='dropdownMenu1'></button>", "session=abc123; Path=/; HttpOnly")
+        elif form.get("email") == VALID_USER:
+            self._respond(LOGIN_FORM.replace("<form", "<span id='incorrectdetails'>Incorrect login details</span><form"))
+        else:
+            # Unknown users just get the empty form back
+            self._respond(LOGIN_FORM)
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpLogin:
+
+    def test_valid_login_returns_session_cookie(self, stand_in_server):
+        url = f"http://127.0.0.1:{stand_in_server.server_port}/login"
+        cookies = HttpLogin.login(url, VALID_USER, VALID_PASS)
+
+        assert sorted((c["name"], c["value"], c["httpOnly"]) for c in cookies) == [
+            ("XSRF-TOKEN", "xsrf-456", False),
+            ("session", "abc123", True),
+        ]
+
+    def test_invalid_login_returns_no_cookies(self, stand_in_server):
+        url = f"http://127.0.0.1:{stand_in_server.server_port}/login"
+
+        assert HttpLogin.login(url, VALID_USER, "wrong") == []
+
+    def test_login_form_served_again_counts_as_rejected(self, stand_in_server):
+        url = f"http://127.0.0.1:{stand_in_server.server_port}/login"
+
+        assert HttpLogin.login(url, "nobody@example.test", "wrong") == []
+
+    def test_logins_reuse_pooled_connection(self, stand_in_server):
+        url = f"http://127.0.0.1:{stand_in_server.server_port}/login"
+        HttpLogin.login(url, VALID_USER, VALID_PASS)
+        HttpLogin.login(url, VALID_USER, "wrong")
+
+        assert len(stand_in_server.client_ports) == 1
@@ -0,0 +1,57 @@
+import pytest
+from utilities.element_locator import LocatorCompiler, LocatorRegistry
+
+
+class TestLocatorCompiler:
+
+    @pytest.mark.parametrize("xpath, css", [
+        ("//form[contains(@method, 'POST')]//input[@type='email']", 'form[method*="POST"] input[type="email"]'),
+        ("//button[@id='dropdownMenu1']", "button#dropdownMenu1"),
+        ("//div[contains(@class, 'navbar')]//a[@href='/login']", 'div[class*="navbar"] a[href="/login"]'),
+        ("//ul/li[starts-with(@class, 'item') and @data-id]", 'ul > li[class^="item"][data-id]'),
+        ("//*[@id='9lives']", '[id="9lives"]'),
+        ("//a[@title='say \"hi\"']", 'a[title="say \\"hi\\""]'),
+    ])
+    def test_translatable_xpaths(self, xpath, css):
+        assert LocatorCompiler.xpath_to_css(xpath) == css
+
+    @pytest.mark.parametrize("xpath", [
+        "//a[text()='Login']",
+        "//li[1]",
+        "(//a)[2]",
+        "//a[@x='1' or @y='2']",
+        "//a/..",
+        "//div[contains(@class, '')]",
+    ])
+    def test_untranslatable_xpaths_stay_xpath(self, xpath):
+        assert LocatorCompiler.xpath_to_css(xpath) is None
+
+
+class FakeDriver:
+
+    def __init__(self, same, count):
+        self.result = {"same": same, "xpathCount": count, "cssCount": count if same else count + 1}
+
+    def execute_script(self, script, *args):
+        return self.result
+
+
+class TestLocatorRegistry:
+
+    def test_validated_css_is_preferred(self):
+        registry = LocatorRegistry(FakeDriver(same=True, count=1))
+        registry.register("button", "//button[@id='login']")
+
+        assert registry.get("button") == ("css", "button#login")
+
+    def test_mismatched_css_falls_back_to_xpath(self):
+        registry = LocatorRegistry(FakeDriver(same=False, count=1))
+        registry.register("button", "//button[@id='login']")
+
+        assert registry.get("button") == ("xpath", "//button[@id='login']")
+
+    def test_css_is_not_used_before_validation(self):
+        registry = LocatorRegistry()
+        registry.register("button", "//button[@id='login']")
+
+        assert registry.get("button") == ("xpath", "//button[@id='login']")
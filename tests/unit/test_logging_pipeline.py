@@ -0,0 +1,83 @@
+import io
+import logging
+import queue
+import pytest
+from utilities.utils import BatchingQueueListener, BoundedQueueHandler
+
+
+class CountingStream(io.StringIO):
+
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def make_logger(name, handler):
+    test_logger = logging.Logger(name)
+    test_logger.addHandler(handler)
+    return test_logger
+
+
+@pytest.fixture
+def stream():
+    return CountingStream()
+
+
+@pytest.fixture
+def console(stream):
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    return handler
+
+
+class TestLoggingPipeline:
+
+    def test_records_are_written_by_the_listener_in_batches(self, console, stream):
+        log_queue = queue.Queue(maxsize=100)
+        listener = BatchingQueueListener(log_queue, [console], batch_size=50)
+        test_logger = make_logger("pipeline-batches", BoundedQueueHandler(log_queue))
+        for index in range(20):
+            test_logger.info(f"record {index}")
+
+        listener.start()
+        assert listener.flush(5)
+        listener.stop()
+
+        lines = stream.getvalue().splitlines()
+        assert lines == [f"INFO record {index}" for index in range(20)]
+        # Everything was queued before the listener started, so one write covered it all
+        assert stream.flushes == 1
+
+    def test_handler_level_is_respected(self, console, stream):
+        console.setLevel(logging.WARNING)
+        log_queue = queue.Queue()
+        listener = BatchingQueueListener(log_queue, [console])
+        listener.start()
+        test_logger = make_logger("pipeline-levels", BoundedQueueHandler(log_queue))
+        test_logger.info("quiet")
+        test_logger.warning("loud")
+        listener.flush(5)
+        listener.stop()
+
+        assert stream.getvalue() == "WARNING loud\n"
+
+    def test_drop_policy_counts_discarded_records(self):
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, policy="drop")
+        test_logger = make_logger("pipeline-drop", handler)
+        for index in range(5):
+            test_logger.info(f"record {index}")
+
+        assert log_queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), policy="spill")
+
+    def test_flush_without_listener_returns_immediately(self):
+        assert BatchingQueueListener(queue.Queue(), []).flush(0.1)
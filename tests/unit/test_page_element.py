@@ -0,0 +1,79 @@
+import pytest
+from selenium.webdriver.common.by import By
+from base.page_element import Element, ElementProxy
+
+
+class FakeElement:
+
+    def __init__(self, finder, locator):
+        self.finder = finder
+        self.locator = locator
+        self.text = locator
+
+    def find_element(self, by_type, locator):
+        return self.finder.find_element(by_type, f"{self.locator} > {locator}")
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.lookups = []
+
+    def find_element(self, by_type, locator):
+        self.lookups.append((by_type, locator))
+        return FakeElement(self, locator)
+
+
+class FormPage:
+    form = Element(By.XPATH, "//form")
+    email = Element(By.CSS_SELECTOR, "input[type='email']", parent="form")
+
+    def __init__(self, driver):
+        self.driver = driver
+
+
+class TestPageElement:
+
+    def test_page_object_builds_without_lookups(self):
+        driver = FakeDriver()
+        FormPage(driver)
+
+        assert driver.lookups == []
+
+    def test_element_resolves_once_and_is_reused(self):
+        driver = FakeDriver()
+        page = FormPage(driver)
+
+        assert page.form.text == "//form"
+        assert page.form.text == "//form"
+        assert driver.lookups == [("xpath", "//form")]
+
+    def test_child_is_located_inside_parent(self):
+        driver = FakeDriver()
+        page = FormPage(driver)
+
+        assert page.email.text == "//form > input[type='email']"
+        assert isinstance(page.email, ElementProxy)
+        assert FormPage.email.locator_type == "css"
+
+    def test_every_by_strategy_is_mapped(self):
+        driver = FakeDriver()
+
+        class LinkPage:
+            heading = Element(By.TAG_NAME, "h1")
+            help_link = Element(By.PARTIAL_LINK_TEXT, "Help")
+
+            def __init__(self, driver):
+                self.driver = driver
+
+        page = LinkPage(driver)
+        page.heading.text
+        page.help_link.text
+        assert driver.lookups == [(By.TAG_NAME, "h1"), (By.PARTIAL_LINK_TEXT, "Help")]
+        for by in (By.ID, By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT, By.NAME, By.TAG_NAME,
+                   By.CLASS_NAME, By.CSS_SELECTOR):
+            Element(by, "x")
+
+    def test_unsupported_locator_type_is_rejected(self):
+        with pytest.raises(ValueError):
+            Element("shadow", "x")
@@ -0,0 +1,119 @@
+import pytest
+from utilities import command_instrumentation
+from utilities.command_instrumentation import current_test, instrument_page_object
+from utilities.page_performance import PerformanceBudgetExceeded, PerformanceCollector, performance_budget
+
+NAVIGATION = {
+    "requestStart": 10.0,
+    "responseStart": 60.0,
+    "domContentLoadedEventEnd": 300.0,
+    "loadEventEnd": 450.0,
+    "transferSize": 1000,
+}
+
+
+class FakeDriver:
+    """Serves page timings as PAGE_TIMINGS_JS would; navigating starts a new document."""
+
+    def __init__(self):
+        self.session_id = "session-1"
+        self.time_origin = 1.0
+        self.url = "about:blank"
+
+    def get(self, url):
+        self.url = url
+        self.time_origin += 1
+
+    def execute_script(self, script):
+        return {
+            "url": self.url,
+            "time_origin": self.time_origin,
+            "navigation": NAVIGATION,
+            "paint": {"first-contentful-paint": 200.0},
+            "resources": [{"name": "app.js", "type": "script", "duration": 80.0, "transfer_size": 500}],
+        }
+
+
+@instrument_page_object
+class FakePage:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @performance_budget("action_ms", 60000)
+    def open(self, url):
+        self.driver.get(url)
+
+    @performance_budget("first_contentful_paint_ms", 100)
+    def slow_paint(self):
+        pass
+
+    @performance_budget("first_contentful_paint_ms", None)
+    def unbudgeted(self):
+        pass
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    collector = PerformanceCollector(enabled=True)
+    # Replace the hooks conftest registers, so only this collector sees the actions
+    monkeypatch.setattr(command_instrumentation, "page_action_hooks", [collector.after_action])
+    token = current_test.set("tests/test_x.py::test_a")
+    yield collector
+    current_test.reset(token)
+
+
+class TestPerformanceCollector:
+
+    def test_summarize_navigation_and_paint(self):
+        summary = PerformanceCollector.summarize(FakeDriver().execute_script(""))
+
+        assert summary["ttfb_ms"] == 50.0
+        assert summary["load_ms"] == 450.0
+        assert summary["first_contentful_paint_ms"] == 200.0
+        assert summary["transfer_bytes"] == 1500
+
+    def test_navigation_metrics_only_reported_for_new_documents(self, collector):
+        driver = FakeDriver()
+        collector.collect(driver, "first")
+        collector.collect(driver, "same document")
+
+        first, second = collector.records_for("tests/test_x.py::test_a")
+        assert "load_ms" in first
+        assert "load_ms" not in second
+
+    def test_page_actions_are_recorded_with_their_duration(self, collector):
+        FakePage(FakeDriver()).open("http://localhost/")
+
+        record = collector.records_for("tests/test_x.py::test_a")[-1]
+        assert record["label"] == "FakePage.open"
+        assert record["url"] == "http://localhost/"
+        assert record["action_ms"] >= 0
+
+    def test_exceeded_budget_fails(self, collector):
+        with pytest.raises(PerformanceBudgetExceeded, match="first_contentful_paint_ms"):
+            FakePage(FakeDriver()).slow_paint()
+
+        assert collector.records_for("tests/test_x.py::test_a")[-1]["budget_exceeded"]
+
+    def test_unset_budget_is_not_enforced(self, collector):
+        collector.enabled = False
+        FakePage(FakeDriver()).unbudgeted()
+
+        assert collector.records_for("tests/test_x.py::test_a") == []
+
+    def test_watch_navigation_collects_after_get(self, collector):
+        driver = collector.watch_navigation(FakeDriver())
+        driver.get("about:blank")
+        driver.get("http://localhost/")
+
+        labels = [record["label"] for record in collector.records_for("tests/test_x.py::test_a")]
+        assert labels == ["get http://localhost/"]
+
+    def test_disabled_collector_only_measures_budgeted_actions(self, collector):
+        collector.enabled = False
+        page = FakePage(FakeDriver())
+        page.open("http://localhost/")
+        page.driver.get("http://localhost/other")
+
+        assert [record["label"] for record in collector.records_for("tests/test_x.py::test_a")] == ["FakePage.open"]
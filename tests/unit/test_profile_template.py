@@ -0,0 +1,100 @@
+import json
+import os
+import pytest
+from utilities.profile_template import ProfileTemplateCache
+
+
+class FakeDriver:
+    """Writes what a browser would into its profile directory."""
+
+    def __init__(self, profile_dir, version="120.0"):
+        self.profile_dir = profile_dir
+        self.capabilities = {"browserVersion": version}
+        os.makedirs(os.path.join(profile_dir, "Default", "Cache"))
+        with open(os.path.join(profile_dir, "Local State"), "w") as f:
+            f.write("{}")
+        os.symlink("host-1234", os.path.join(profile_dir, "SingletonLock"))
+
+    def get(self, url):
+        with open(os.path.join(self.profile_dir, "Default", "Cache", "entry_1"), "w") as f:
+            f.write(url)
+
+    def execute_script(self, script):
+        return "complete"
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ProfileTemplateCache(str(tmp_path / "profiles"), base_url="http://localhost/")
+
+
+@pytest.fixture
+def builds():
+    return []
+
+
+@pytest.fixture
+def builder(builds):
+    def build(path):
+        builds.append(path)
+        return FakeDriver(path)
+    return build
+
+
+class TestProfileTemplateCache:
+
+    def test_template_is_built_once_and_cloned(self, cache, builder, builds):
+        first = cache.clone("chrome", builder)
+        second = cache.clone("chrome", builder)
+
+        assert len(builds) == 1
+        assert first != second
+        for clone in (first, second):
+            assert os.path.isfile(os.path.join(clone, "Local State"))
+            assert not os.path.lexists(os.path.join(clone, "SingletonLock"))
+
+    def test_cache_files_are_hardlinked_and_others_copied(self, cache, builder):
+        clone = cache.clone("chrome", builder)
+        template = cache.template_path("chrome")
+
+        cached = os.path.join("Default", "Cache", "entry_1")
+        assert os.path.samefile(os.path.join(clone, cached), os.path.join(template, cached))
+        assert not os.path.samefile(os.path.join(clone, "Local State"), os.path.join(template, "Local State"))
+        # Copies are writable by the browser; the shared template files are not
+        with open(os.path.join(clone, "Local State"), "w") as f:
+            f.write("changed")
+        with open(os.path.join(template, "Local State")) as f:
+            assert f.read() == "{}"
+
+    def test_version_change_invalidates_template(self, cache, builder, builds):
+        cache.clone("chrome", builder)
+
+        assert cache.check_version("chrome", FakeDriver(os.path.join(cache.cache_dir, "other"), "121.0")) is False
+        cache.clone("chrome", builder)
+        assert len(builds) == 2
+
+    def test_base_url_change_rebuilds_template(self, cache, builder, builds):
+        cache.clone("chrome", builder)
+        cache.base_url = "http://localhost/other"
+        cache.clone("chrome", builder)
+
+        with open(os.path.join(cache.template_path("chrome"), "template.json")) as f:
+            assert json.load(f)["base_url"] == "http://localhost/other"
+        assert len(builds) == 2
+
+    def test_release_and_cleanup_remove_clones(self, cache, builder):
+        released = cache.clone("chrome", builder)
+        kept = cache.clone("chrome", builder)
+        orphan = os.path.join(cache.cache_dir, "clones", "chrome-999999999-deadbeef")
+        os.makedirs(orphan)
+
+        cache.release(released)
+        assert not os.path.exists(released)
+
+        cache.cleanup()
+        assert not os.path.exists(kept)
+        assert not os.path.exists(orphan)
+        assert os.path.isdir(cache.template_path("chrome"))
@@ -0,0 +1,66 @@
+import base64
+import io
+import os
+import pytest
+from utilities.screenshot_manager import ScreenshotManager
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(mode="RGBA"):
+    output = io.BytesIO()
+    Image.new(mode, (40, 30), (200, 30, 30, 255) if mode == "RGBA" else (200, 30, 30)).save(output, "PNG")
+    return output.getvalue()
+
+
+class FakeDriver:
+    """Returns a fixed PNG; the page reports ready unless told otherwise."""
+
+    def __init__(self, ready=True, fail=False):
+        self.ready = ready
+        self.fail = fail
+        self.scripts = []
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(args)
+        return self.ready
+
+    def get_screenshot_as_base64(self):
+        if self.fail:
+            raise RuntimeError("no browser")
+        return base64.b64encode(_png()).decode("ascii")
+
+
+class TestScreenshotManager:
+
+    def test_take_screenshot_waits_for_readiness_and_saves_in_background(self, tmp_path):
+        driver = FakeDriver()
+        future = ScreenshotManager.take_screenshot(driver, "shot", str(tmp_path), image_format="png")
+        path = future.result(timeout=5)
+        assert driver.scripts, "readiness was not checked"
+        assert path.endswith(".png") and os.path.dirname(path) == str(tmp_path)
+        with open(path, "rb") as f:
+            assert f.read() == _png()
+
+    @pytest.mark.parametrize("image_format, extension, pillow_format", [("webp", "webp", "WEBP"), ("jpeg", "jpg", "JPEG")])
+    def test_take_screenshot_recompresses(self, tmp_path, image_format, extension, pillow_format):
+        future = ScreenshotManager.take_screenshot(FakeDriver(ready=False), "shot", str(tmp_path), image_format, quality=50)
+        path = future.result(timeout=5)
+        assert path.endswith(f".{extension}")
+        with Image.open(path) as image:
+            assert image.format == pillow_format
+            assert image.size == (40, 30)
+
+    def test_take_screenshot_failure_resolves_to_none(self, tmp_path):
+        future = ScreenshotManager.take_screenshot(FakeDriver(fail=True), "shot", str(tmp_path))
+        assert future.result(timeout=5) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_encode_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            ScreenshotManager.encode(_png(), "bmp")
+
+    def test_wait_for_pending(self, tmp_path):
+        futures = [ScreenshotManager.take_screenshot(FakeDriver(), f"shot{i}", str(tmp_path)) for i in range(3)]
+        assert ScreenshotManager.wait_for_pending(timeout=5) == 0
+        assert all(future.done() for future in futures)
@@ -0,0 +1,79 @@
+import io
+import os
+import time
+import pytest
+from utilities.command_instrumentation import current_test
+from utilities.screenshot_store import ScreenshotStore, perceptual_hash
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _page(marker=(0, 0), size=(400, 300)):
+    """A fake page: a dark header over a light body, with a small marker that moves between shots."""
+    image = Image.new("RGB", size, (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, size[0], 60), fill=(30, 30, 90))
+    draw.rectangle((marker[0], 100 + marker[1], marker[0] + 3, 103 + marker[1]), fill=(200, 0, 0))
+    output = io.BytesIO()
+    image.save(output, "PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def in_test():
+    token = current_test.set("tests/test_x.py::test_a")
+    yield "tests/test_x.py::test_a"
+    current_test.reset(token)
+
+
+class TestScreenshotStore:
+
+    def test_identical_images_share_one_file(self, tmp_path, in_test):
+        store = ScreenshotStore(str(tmp_path), max_bytes=0)
+        first = store.put(_page(), "png", "first")
+        second = store.put(_page(), "png", "second")
+
+        assert first["path"] == second["path"]
+        assert os.path.basename(first["path"]) == f"{first['sha256']}.png"
+        assert (first["duplicate"], second["duplicate"]) == (None, "exact")
+        assert [record["label"] for record in store.records_for(in_test)] == ["first", "second"]
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".png")]) == 1
+
+    def test_near_duplicates_only_merged_when_enabled(self, tmp_path):
+        assert bin(perceptual_hash(_page((0, 0))) ^ perceptual_hash(_page((50, 10)))).count("1") <= 4
+
+        exact_only = ScreenshotStore(str(tmp_path / "exact"), max_bytes=0, dedup_distance=0)
+        assert exact_only.put(_page((0, 0)), "png", "a")["path"] != exact_only.put(_page((50, 10)), "png", "b")["path"]
+
+        near = ScreenshotStore(str(tmp_path / "near"), max_bytes=0, dedup_distance=4)
+        first = near.put(_page((0, 0)), "png", "a")
+        second = near.put(_page((50, 10)), "png", "b")
+        assert second["path"] == first["path"]
+        assert second["duplicate"] == "near"
+
+    def test_thumbnail_embedded_with_link_to_full_image(self, tmp_path):
+        store = ScreenshotStore(str(tmp_path / "store"), max_bytes=0, thumbnail_size=100)
+        record = store.put(_page(), "png", "Invalid <login>")
+
+        with Image.open(record["thumbnail"]) as thumbnail:
+            assert max(thumbnail.size) == 100
+        html = store.thumbnail_html(record, str(tmp_path / "reports"))
+        assert f'href="../store/{record["sha256"]}.png"' in html
+        assert "data:image/jpeg;base64," in html
+        assert "Invalid &lt;login&gt;" in html
+
+    def test_retention_removes_least_recently_stored(self, tmp_path):
+        store = ScreenshotStore(str(tmp_path), max_bytes=0)
+        records = [store.put(_page(size=(400 + i, 300)), "png", f"shot{i}") for i in range(3)]
+        # shot2 was stored (or last reused) longest ago
+        now = time.time()
+        for age, record in zip((10, 20, 30), records):
+            os.utime(record["path"], (now - age, now - age))
+
+        sizes = [os.path.getsize(record["path"]) + os.path.getsize(record["thumbnail"]) for record in records]
+        removed = store.enforce_retention(max_bytes=sum(sizes) - 1)
+
+        assert removed == 1
+        assert [os.path.exists(record["path"]) for record in records] == [True, True, False]
+        assert not os.path.exists(records[2]["thumbnail"])
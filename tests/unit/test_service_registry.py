@@ -0,0 +1,145 @@
+import json
+import stat
+import sys
+import pytest
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.common.exceptions import WebDriverException
+from utilities.service_registry import ServiceRegistry, SharedChromeService
+
+# Stands in for chromedriver/geckodriver: answers /status on the --port it is given and exits on /shutdown
+FAKE_DRIVER = """#!{python}
+import json, os, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+args = " ".join(sys.argv[1:]).replace("=", " ").split()
+port = int(args[args.index("--port") + 1])
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({{"value": {{"ready": True}}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/shutdown":
+            self.wfile.flush()
+            os._exit(0)
+    def log_message(self, *args):
+        pass
+HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+@pytest.fixture
+def fake_driver(tmp_path):
+    path = tmp_path / "fakedriver"
+    path.write_text(FAKE_DRIVER.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def service(fake_driver):
+    service = SharedChromeService(executable_path=fake_driver)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def registry(tmp_path, fake_driver):
+    cache_file = tmp_path / "cache" / "driver_paths.json"
+    cache_file.parent.mkdir()
+    cache_file.write_text(json.dumps({"chrome": fake_driver, "firefox": fake_driver}))
+    registry = ServiceRegistry(str(cache_file))
+    yield registry
+    registry.shutdown()
+
+
+class TestSharedService:
+
+    def test_process_is_started_once_and_survives_quit(self, service):
+        service.start()
+        pid = service.process.pid
+        service.start()
+        assert service.process.pid == pid
+        assert service.sessions == 2
+
+        service.stop()
+        service.stop()
+        assert service.is_running()
+        assert service.sessions == 0
+        assert service.is_healthy()
+
+    def test_crashed_process_is_restarted(self, service):
+        service.start()
+        crashed = service.process
+        crashed.kill()
+        crashed.wait()
+        assert not service.is_healthy()
+
+        service.start()
+        assert service.process is not crashed
+        assert service.is_healthy()
+
+    def test_shutdown_stops_the_process(self, service):
+        service.start()
+        process = service.process
+        service.shutdown()
+        assert process.poll() is not None
+
+
+class TestServiceRegistry:
+
+    def test_cached_driver_path_is_used(self, registry, fake_driver):
+        assert registry.resolve_driver_path("chrome", ChromeOptions()) == fake_driver
+
+    def test_chrome_sessions_share_one_service(self, registry):
+        first = registry.service_for("chrome", ChromeOptions())
+        first.start()
+        second = registry.service_for("chrome", ChromeOptions())
+        assert second is first
+
+    def test_firefox_gets_a_service_per_concurrent_session(self, registry):
+        first = registry.service_for("firefox", FirefoxOptions())
+        second = registry.service_for("firefox", FirefoxOptions())
+        assert second is not first
+
+        first.start()
+        first.stop()
+        assert registry.service_for("firefox", FirefoxOptions()) is first
+
+    def test_invalidate_drops_cached_path_and_idle_services(self, registry):
+        service = registry.service_for("chrome", ChromeOptions())
+        service.start()
+        process = service.process
+        service.stop()
+
+        registry.invalidate("chrome")
+
+        with open(registry.cache_file, encoding="utf-8") as f:
+            assert "chrome" not in json.load(f)
+        assert process.poll() is not None
+
+    def test_health_check_reports_running_services(self, registry):
+        service = registry.service_for("chrome", ChromeOptions())
+        service.start()
+        assert registry.health_check() == {f"chrome@{service.service_url}": True}
+
+    def test_dead_service_is_dropped_and_session_retried(self, registry):
+        attempts = []
+
+        def driver_class(service, options):
+            service.start()
+            attempts.append(service)
+            if len(attempts) == 1:
+                # The process dies before the session is created
+                service.process.kill()
+                service.process.wait()
+                service.stop()
+                raise WebDriverException("connection refused")
+            return service
+
+        service = registry.create_driver("chrome", driver_class, ChromeOptions())
+
+        assert len(attempts) == 2 and service is not attempts[0]
+        assert service.is_healthy()
+        assert registry.health_check() == {f"chrome@{service.service_url}": True}
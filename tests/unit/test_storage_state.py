@@ -0,0 +1,80 @@
+import time
+from utilities.storage_state import StorageState, StorageStateCache
+
+
+def make_state(created=None):
+    return StorageState("https://example.test/account/", [], {}, {}, created=created)
+
+
+class FakeDriver:
+    """Records navigation; the page reports a session cookie the server no longer accepts."""
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.visited = []
+
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+
+    def add_cookie(self, cookie):
+        pass
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "fresh"}]
+
+    def execute_script(self, script, *args):
+        return {"local": {}, "session": {}}
+
+
+class FakeLoginPage:
+    """Logged in only after login() runs; remembers the timeout of every check."""
+
+    def __init__(self):
+        self.logged_in = False
+        self.logins = 0
+        self.checks = []
+
+    def login(self):
+        self.logins += 1
+        self.logged_in = True
+
+    def is_logged_in(self, timeout=10):
+        self.checks.append(timeout)
+        return self.logged_in
+
+
+class TestStorageStateCache:
+
+    def test_state_is_returned_within_ttl(self):
+        cache = StorageStateCache(ttl=60)
+        state = make_state()
+        cache.put("admin", state)
+
+        assert cache.get("admin") is state
+
+    def test_expired_state_is_dropped(self):
+        cache = StorageStateCache(ttl=60)
+        cache.put("admin", make_state(created=time.monotonic() - 120))
+
+        assert cache.get("admin") is None
+        assert cache.get("admin") is None
+
+    def test_origin_strips_path(self):
+        assert make_state().origin == "https://example.test/"
+
+    def test_stale_state_is_dropped_and_user_logs_in_again(self):
+        cache = StorageStateCache(ttl=60, validate_timeout=0.5)
+        stale = make_state()
+        cache.put("admin", stale)
+        driver, page = FakeDriver(), FakeLoginPage()
+
+        assert cache.restore_or_login(driver, "admin", "https://example.test/login", page.login, page.is_logged_in)
+
+        # The restored state is checked with the short timeout, the real login with the page's default
+        assert page.checks == [0.5, 10]
+        assert page.logins == 1
+        assert driver.visited[-1] == "https://example.test/login"
+        fresh = cache.get("admin")
+        assert fresh is not stale
+        assert fresh.cookies == [{"name": "session", "value": "fresh"}]
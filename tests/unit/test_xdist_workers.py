@@ -0,0 +1,113 @@
+import importlib
+import pytest
+import conftest
+from utilities import config, utils
+from utilities.utils import logger, merge_worker_logs
+
+
+@pytest.fixture
+def worker_config(monkeypatch, tmp_path):
+    """Re-read utilities.config as xdist worker gw1 would, then restore it."""
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    monkeypatch.setenv("SELENIUM_SCREENSHOT_DIR", str(tmp_path / "screenshots"))
+    yield importlib.reload(config)
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+@pytest.fixture
+def worker_logger(monkeypatch, tmp_path):
+    """Set up the shared logger again as worker gw1, and put the original handlers back afterwards."""
+    monkeypatch.setattr(utils, "WORKER_ID", "gw1")
+    monkeypatch.setattr(utils, "LOG_DIR", str(tmp_path / "logs"))
+    handlers = list(logger.handlers)
+    log_file, listener = logger.log_file, logger.log_listener
+    worker = utils.setup_logging()
+    yield worker
+    worker.log_listener.stop()
+    for handler in logger.handlers[:]:
+        if handler not in handlers:
+            logger.removeHandler(handler)
+    logger.log_file, logger.log_listener = log_file, listener
+
+
+class FakeWorkerNode:
+    """What the controller sees of a finished xdist worker."""
+
+    def __init__(self, worker_id, workeroutput):
+        self.workerinput = {"workerid": worker_id}
+        self.workeroutput = workeroutput
+
+
+class FakeConfig:
+
+    def __init__(self, rootdir, workeroutput=None):
+        self.rootdir = str(rootdir)
+        if workeroutput is not None:
+            self.workeroutput = workeroutput
+
+
+class FakeSession:
+
+    def __init__(self, config):
+        self.config = config
+
+
+class TestWorkerPaths:
+
+    def test_workers_share_the_screenshot_root(self, worker_config, tmp_path):
+        assert worker_config.WORKER_ID == "gw1"
+        assert worker_config.SCREENSHOT_ROOT == str(tmp_path / "screenshots")
+        assert not (tmp_path / "screenshots" / "gw1").exists()
+
+    def test_log_file_and_lines_name_the_worker(self, worker_logger, tmp_path):
+        assert worker_logger.log_file.startswith(str(tmp_path / "logs"))
+        assert worker_logger.log_file.endswith("_gw1.log")
+
+        worker_logger.info("hello from the worker")
+        assert worker_logger.log_listener.flush(5)
+        with open(worker_logger.log_file, encoding="utf-8") as f:
+            line = next(line for line in f if "hello from the worker" in line)
+        assert " [gw1] - " in line
+
+
+class TestWorkerLogHandOff:
+
+    def test_worker_reports_its_log_file(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(logger, "log_file", str(tmp_path / "log_gw1.log"))
+        workeroutput = {}
+
+        conftest.pytest_sessionfinish(FakeSession(FakeConfig(tmp_path, workeroutput)))
+        assert workeroutput == {"log_file": str(tmp_path / "log_gw1.log")}
+
+    def test_controller_merges_reported_logs(self, monkeypatch, tmp_path):
+        merged = tmp_path / "log_controller.log"
+        merged.write_text("controller line\n", encoding="utf-8")
+        monkeypatch.setattr(logger, "log_file", str(merged))
+        for worker_id in ("gw1", "gw0"):
+            (tmp_path / f"log_{worker_id}.log").write_text(f"{worker_id} line\n", encoding="utf-8")
+
+        reporting = conftest.XdistReporting()
+        reporting.pytest_testnodedown(FakeWorkerNode("gw1", {"log_file": str(tmp_path / "log_gw1.log")}), None)
+        reporting.pytest_testnodedown(FakeWorkerNode("gw0", {"log_file": str(tmp_path / "log_gw0.log")}), None)
+        # A worker that crashed before session end sends nothing back
+        reporting.pytest_testnodedown(FakeWorkerNode("gw2", {}), None)
+        reporting.pytest_sessionfinish(FakeSession(FakeConfig(tmp_path)))
+
+        lines = merged.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "controller line"
+        sections = [line for line in lines if line.startswith("===== Worker")]
+        assert sections == [f"===== Worker gw0: {tmp_path / 'log_gw0.log'} =====",
+                            f"===== Worker gw1: {tmp_path / 'log_gw1.log'} ====="]
+        assert lines.index("gw0 line") < lines.index("gw1 line")
+        assert "gw2" not in merged.read_text(encoding="utf-8")
+
+
+class TestMergeWorkerLogs:
+
+    def test_unreadable_worker_log_is_noted(self, monkeypatch, tmp_path):
+        merged = tmp_path / "log_controller.log"
+        monkeypatch.setattr(logger, "log_file", str(merged))
+
+        assert merge_worker_logs({"gw0": str(tmp_path / "missing.log")}) == str(merged)
+        assert "Could not read worker log" in merged.read_text(encoding="utf-8")
@@ -0,0 +1,89 @@
+# browser_context.py
+
+from typing import Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from .browser_options import BrowserOptions
+from .utils import logger
+
+
+class BrowserContext:
+    """An isolated browsing context opened inside an already running browser."""
+
+    # Browsers that can create isolated contexts, over CDP's Target.createBrowserContext
+    SUPPORTED_BROWSERS = ("chrome", "edge")
+
+    @staticmethod
+    def supports(browser_name: str) -> bool:
+        """
+        Check whether a browser can open isolated contexts.
+
+        Firefox can't over WebDriver: a new window shares the profile's cookies and storage, and
+        clearing them only reaches the origin currently loaded. Use a fresh session there instead.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+
+        Returns:
+            bool: True if BrowserContext.open() works for the browser.
+        """
+        return browser_name in BrowserContext.SUPPORTED_BROWSERS
+
+    def __init__(self, driver: WebDriver):
+        """
+        Initialize the BrowserContext.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance that owns the browser.
+        """
+        self.driver = driver
+        self.home_handle: Optional[str] = None
+        self.handle: Optional[str] = None
+        self.context_id: Optional[str] = None
+
+    def open(self) -> str:
+        """
+        Open a fresh context and switch the driver into it.
+
+        Creates a new incognito-style browser context over CDP, which has its own cookie jar and
+        storage. Only Chrome and Edge support this; see supports().
+
+        Raises:
+            ValueError: If the driver has no CDP access, e.g. Firefox.
+
+        Returns:
+            str: The window handle of the new context.
+        """
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            raise ValueError(
+                f"{getattr(self.driver, 'name', 'This browser')} cannot open isolated browser contexts; "
+                f"use a fresh session per test instead"
+            )
+        self.home_handle = self.driver.current_window_handle
+        result = self.driver.execute_cdp_cmd("Target.createBrowserContext", {})
+        self.context_id = result["browserContextId"]
+        target = self.driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id}
+        )
+        # chromedriver uses the CDP target id as the WebDriver window handle
+        self.handle = target["targetId"]
+        self.driver.switch_to.window(self.handle)
+        # The new target starts without the profile's URL blocking
+        BrowserOptions.apply_blocking(self.driver)
+
+        logger.info(f"Opened browser context {self.context_id}")
+        return self.handle
+
+    def close(self) -> None:
+        """Close the context and every window opened in it, then switch back to the home window."""
+        if self.context_id is None:
+            return
+        try:
+            # Disposing the context closes all of its targets, including popups the test opened
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+            self.driver.switch_to.window(self.home_handle)
+            logger.info(f"Closed browser context {self.context_id}")
+        except Exception as e:
+            logger.warning(f"Problem closing browser context: {str(e)}")
+        finally:
+            self.handle = None
+            self.context_id = None
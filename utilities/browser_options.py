@@ -0,0 +1,155 @@
+# browser_options.py
+
+from typing import Optional, Tuple, Type
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.webdriver import WebDriver
+from .config import BROWSER_PROFILES
+from .utils import logger
+
+_BROWSERS = {
+    "chrome": (ChromeOptions, webdriver.Chrome, "--incognito"),
+    "edge": (EdgeOptions, webdriver.Edge, "--inprivate"),
+    "firefox": (FirefoxOptions, webdriver.Firefox, None),
+}
+
+
+class BrowserOptions:
+    """A class for building browser options from the named profiles in config.BROWSER_PROFILES."""
+
+    @staticmethod
+    def get_profile(profile: str) -> dict:
+        """
+        Look up a browser profile.
+
+        Args:
+            profile (str): Name of the profile, e.g. 'default' or 'fast'.
+
+        Raises:
+            ValueError: If no profile has that name.
+
+        Returns:
+            dict: The profile's settings.
+        """
+        try:
+            return BROWSER_PROFILES[profile]
+        except KeyError:
+            raise ValueError(f"Unknown browser profile '{profile}', expected one of {sorted(BROWSER_PROFILES)}")
+
+    @staticmethod
+    def build(browser_name: str, headless: bool = False, private: bool = False, profile: str = "default",
+              user_data_dir: Optional[str] = None) -> Tuple[ArgOptions, Type[WebDriver]]:
+        """
+        Build the options for launching a browser with a profile.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            headless (bool, optional): Run the browser headless. Defaults to False.
+            private (bool, optional): Run the browser in private/incognito mode. Defaults to False.
+            profile (str, optional): Name of the browser profile. Defaults to 'default'.
+            user_data_dir (Optional[str]): Existing profile directory to launch with. Defaults to
+                None, a fresh temporary profile.
+
+        Raises:
+            ValueError: If the browser or profile is not supported.
+
+        Returns:
+            Tuple[ArgOptions, Type[WebDriver]]: The options and the WebDriver class to launch with them.
+        """
+        if browser_name not in _BROWSERS:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        settings = BrowserOptions.get_profile(profile)
+        options_class, driver_class, private_argument = _BROWSERS[browser_name]
+        options = options_class()
+
+        if "page_load_strategy" in settings:
+            options.page_load_strategy = settings["page_load_strategy"]
+        window_size = settings.get("window_size")
+
+        if browser_name == "firefox":
+            if headless:
+                options.add_argument("--headless")
+                if window_size:
+                    options.add_argument(f"--width={window_size[0]}")
+                    options.add_argument(f"--height={window_size[1]}")
+            if private:
+                options.set_preference("browser.privatebrowsing.autostart", True)
+            if user_data_dir:
+                # Passed as an argument so geckodriver uses the directory in place instead of
+                # zipping it up and copying it
+                options.add_argument("-profile")
+                options.add_argument(user_data_dir)
+            for name, value in settings.get("firefox_prefs", {}).items():
+                options.set_preference(name, value)
+        else:
+            if headless:
+                options.add_argument("--headless")
+                if window_size:
+                    options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+            if private:
+                options.add_argument(private_argument)
+            if user_data_dir:
+                options.add_argument(f"--user-data-dir={user_data_dir}")
+            for argument in settings.get("chromium_arguments", []):
+                options.add_argument(argument)
+            if settings.get("chromium_prefs"):
+                options.add_experimental_option("prefs", dict(settings["chromium_prefs"]))
+
+        return options, driver_class
+
+    @staticmethod
+    def prepare(driver: WebDriver, headless: bool = False, profile: str = "default", maximize: bool = True) -> None:
+        """
+        Apply the parts of a profile that can only be set once the browser is running.
+
+        Blocks the profile's URL patterns (see apply_blocking), and maximizes the window unless
+        the browser is headless and the profile gives it a fixed size at launch.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            headless (bool, optional): Whether the browser runs headless. Defaults to False.
+            profile (str, optional): Name of the browser profile. Defaults to 'default'.
+            maximize (bool, optional): Maximize the window when no fixed size applies. Defaults to True.
+        """
+        settings = BrowserOptions.get_profile(profile)
+        # Remembered so blocking can be reapplied to tabs and contexts opened later
+        driver.browser_profile = profile
+        BrowserOptions.apply_blocking(driver, profile)
+
+        if headless and settings.get("window_size"):
+            return
+        if maximize:
+            driver.maximize_window()
+
+    @staticmethod
+    def apply_blocking(driver: WebDriver, profile: Optional[str] = None) -> bool:
+        """
+        Block the profile's URL patterns over CDP on Chrome and Edge.
+
+        CDP commands only reach the driver's current target, so this has to be called again
+        whenever the driver switches to a new tab or browser context.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            profile (Optional[str]): Name of the browser profile. Defaults to None, the profile
+                the driver was prepared with.
+
+        Returns:
+            bool: True if URL patterns were blocked, False if there was nothing to block or it failed.
+        """
+        if profile is None:
+            profile = getattr(driver, "browser_profile", "default")
+        blocked_urls = BrowserOptions.get_profile(profile).get("blocked_urls")
+        if not blocked_urls or not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_urls)})
+            logger.info(f"Blocking {len(blocked_urls)} URL pattern(s) for the '{profile}' profile")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not block URLs over CDP: {str(e)}")
+            return False
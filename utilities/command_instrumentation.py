@@ -0,0 +1,175 @@
+# command_instrumentation.py
+
+import functools
+import inspect
+import json
+import os
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from .utils import logger, current_test
+
+# The page-object method on whose behalf commands are currently sent (the test is current_test).
+# Background threads (e.g. pre-warming a browser) start with empty values, so their commands
+# aren't charged to a test.
+current_page_method: ContextVar[Optional[str]] = ContextVar("current_page_method", default=None)
+
+# Called as hook(label, page, method, elapsed_ms) after each outermost page-object method returns
+page_action_hooks: List[Callable] = []
+
+
+def _new_stats() -> Dict[str, float]:
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "request_bytes": 0, "response_bytes": 0}
+
+
+def _add(stats: Dict[str, float], latency_ms: float, request_bytes: int, response_bytes: int) -> None:
+    stats["count"] += 1
+    stats["total_ms"] += latency_ms
+    stats["max_ms"] = max(stats["max_ms"], latency_ms)
+    stats["request_bytes"] += request_bytes
+    stats["response_bytes"] += response_bytes
+
+
+def _request_size(params) -> int:
+    # Every parameter is sent (e.g. executeScript's script and args), so measure all of them
+    if not params:
+        return 0
+    return len(json.dumps(params, default=str))
+
+
+def _response_size(response) -> int:
+    value = response.get("value") if isinstance(response, dict) else response
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        # Screenshots and page sources are large strings; len() avoids re-serializing them
+        return len(value)
+    return len(json.dumps(value, default=str))
+
+
+class CommandRecorder:
+    """Aggregates WebDriver command counts, latencies and payload sizes per test and per page-object method."""
+
+    def __init__(self):
+        self.tests: Dict[str, dict] = {}
+        self._lock = Lock()
+
+    def record(self, command: str, latency_ms: float, request_bytes: int, response_bytes: int) -> None:
+        """
+        Add one command to the current test's totals.
+
+        Args:
+            command (str): The WebDriver command name, e.g. 'findElement'.
+            latency_ms (float): Round-trip time in milliseconds.
+            request_bytes (int): Size of the serialized request parameters.
+            response_bytes (int): Size of the response value.
+        """
+        test = current_test.get() or "<outside tests>"
+        method = current_page_method.get() or "<test body>"
+        with self._lock:
+            summary = self.tests.setdefault(test, {"total": _new_stats(), "by_command": {}, "by_method": {}})
+            _add(summary["total"], latency_ms, request_bytes, response_bytes)
+            _add(summary["by_command"].setdefault(command, _new_stats()), latency_ms, request_bytes, response_bytes)
+            _add(summary["by_method"].setdefault(method, _new_stats()), latency_ms, request_bytes, response_bytes)
+
+    def summary_for(self, test: str) -> Optional[dict]:
+        """
+        Return the command totals recorded for a test so far.
+
+        Args:
+            test (str): The test's node id.
+
+        Returns:
+            Optional[dict]: {'total', 'by_command', 'by_method'}, or None if it sent no commands.
+        """
+        with self._lock:
+            summary = self.tests.get(test)
+            return json.loads(json.dumps(summary)) if summary is not None else None
+
+    def dump(self, path: str) -> str:
+        """
+        Write every test's totals to a JSON file.
+
+        Args:
+            path (str): Destination file.
+
+        Returns:
+            str: The path written.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.tests, f, indent=2, sort_keys=True)
+        logger.info(f"WebDriver command statistics written to {path}")
+        return path
+
+
+# Shared by every instrumented driver in this process
+command_recorder = CommandRecorder()
+
+
+def instrument_driver(driver: WebDriver, recorder: CommandRecorder = command_recorder) -> WebDriver:
+    """
+    Wrap a driver's command executor so every command it sends is recorded.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        recorder (CommandRecorder, optional): Where to record. Defaults to the shared command_recorder.
+
+    Returns:
+        WebDriver: The same driver, now instrumented.
+    """
+    executor = driver.command_executor
+    if getattr(executor, "_instrumented", False):
+        return driver
+    execute = executor.execute
+
+    def instrumented_execute(command, params):
+        start = time.perf_counter()
+        response = None
+        try:
+            response = execute(command, params)
+            return response
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            recorder.record(command, latency_ms, _request_size(params), _response_size(response))
+
+    executor.execute = instrumented_execute
+    executor._instrumented = True
+    return driver
+
+
+def instrument_page_object(cls):
+    """
+    Class decorator that charges WebDriver commands to the page-object method that caused them.
+
+    When public methods call each other, commands are charged to the outermost one, i.e. the
+    action the test asked for.
+    """
+    for name, method in list(vars(cls).items()):
+        # Only plain methods; static/class methods and Element descriptors are left alone
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        setattr(cls, name, _track_method(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _track_method(label, method):
+    @functools.wraps(method)
+    def tracked(*args, **kwargs):
+        if current_page_method.get() is not None:
+            return method(*args, **kwargs)
+        token = current_page_method.set(label)
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            current_page_method.reset(token)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for hook in page_action_hooks:
+            hook(label, args[0], method, elapsed_ms)
+        return result
+
+    return tracked
@@ -6,12 +6,16 @@ from dotenv import load_dotenv
 # Load environmental variables from .env file
 load_dotenv()
 
+# pytest-xdist worker id ('gw0', 'gw1', ...); empty when not running under xdist
+WORKER_ID = os.environ.get('PYTEST_XDIST_WORKER', '')
+
 # File paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOG_DIR = os.path.join(BASE_DIR, 'logs')
 
 # URLs
 QA_BASE_URL = "https://wildxr-cm-qa.azurewebsites.net/"
+BASE_URL = os.environ.get('BASE_URL', "https://www.letskodeit.com/")
 # LOGIN_URL = f'{BASE_URL}/login'
 
 # WebDrivers
@@ -19,6 +23,55 @@ CHROME_DRIVER_PATH = os.environ.get('CHROME_DRIVER_PATH', os.path.join(BASE_DIR,
 EDGE_DRIVER_PATH = os.environ.get('EDGE_DRIVER_PATH', os.path.join(BASE_DIR, 'webdrivers', 'msedgedriver.exe'))
 FIREFOX_DRIVER_PATH = os.environ.get('GECKO_DRIVER_PATH', os.path.join(BASE_DIR, 'webdrivers', 'geckodriver.exe'))
 
+# Named browser launch profiles, selected with --browser-profile or BROWSER_PROFILE.
+#   page_load_strategy: 'normal' waits for every subresource, 'eager' returns at DOMContentLoaded
+#   chromium_arguments / chromium_prefs: extra Chrome and Edge switches and preferences
+#   firefox_prefs: extra about:config preferences
+#   blocked_urls: URL patterns Chromium blocks over CDP (Network.setBlockedURLs)
+#   window_size: fixed (width, height) used instead of maximizing when headless
+_STABILITY_ARGUMENTS = ["--no-sandbox", "--disable-gpu", "--disable-extensions", "--disable-dev-shm-usage"]
+BROWSER_PROFILES = {
+    "default": {},
+    "stable": {
+        "chromium_arguments": _STABILITY_ARGUMENTS,
+    },
+    "fast": {
+        "page_load_strategy": "eager",
+        "chromium_arguments": _STABILITY_ARGUMENTS + ["--blink-settings=imagesEnabled=false", "--disable-remote-fonts"],
+        "chromium_prefs": {"profile.managed_default_content_settings.images": 2},
+        "firefox_prefs": {
+            "permissions.default.image": 2,
+            "gfx.downloadable_fonts.enabled": False,
+            "browser.display.use_document_fonts": 0,
+            # Firefox has no URL blocklist pref; strict tracking protection blocks analytics and ad hosts
+            "browser.contentblocking.category": "strict",
+            "privacy.trackingprotection.enabled": True,
+        },
+        "blocked_urls": [
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*doubleclick.net*",
+            "*facebook.net*",
+            "*hotjar.com*",
+            "*.woff",
+            "*.woff2",
+            "*.ttf",
+            "*.otf",
+        ],
+        "window_size": (1920, 1080),
+    },
+}
+BROWSER_PROFILE = os.environ.get('BROWSER_PROFILE', 'default')
+
+# Launch browsers from a clone of a warmed profile instead of an empty one
+PROFILE_TEMPLATE = os.environ.get('PROFILE_TEMPLATE', 'false').lower() == 'true'
+PROFILE_TEMPLATE_DIR = os.environ.get('PROFILE_TEMPLATE_DIR', os.path.join(BASE_DIR, '.cache', 'profile_templates'))
+
+# Start each driver binary once per run and create every session against it (opt-in)
+SHARED_DRIVER_SERVICE = os.environ.get('SHARED_DRIVER_SERVICE', 'false').lower() == 'true'
+# Driver executables resolved by Selenium Manager, remembered across runs
+DRIVER_PATH_CACHE = os.environ.get('DRIVER_PATH_CACHE', os.path.join(BASE_DIR, '.cache', 'driver_paths.json'))
+
 #  Validate WebDriver paths
 # for driver_name, driver_path in [
 #     ("chrome", CHROME_DRIVER_PATH),
@@ -28,9 +81,21 @@ FIREFOX_DRIVER_PATH = os.environ.get('GECKO_DRIVER_PATH', os.path.join(BASE_DIR,
 #     if not os.path.exists(driver_path):
 #         raise FileNotFoundError(f"{driver_name} WebDriver not found at {driver_path}. Please check your WebDriver path settings.")
 
-# Screenshot Folder
-SCREENSHOT_DIR = os.environ.get('SELENIUM_SCREENSHOT_DIR', os.path.join(BASE_DIR, 'screenshots'))
-os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+# Screenshot Folder (the screenshot store under it is shared by every xdist worker)
+SCREENSHOT_ROOT = os.environ.get('SELENIUM_SCREENSHOT_DIR', os.path.join(BASE_DIR, 'screenshots'))
+# Screenshots are saved as 'png', 'webp' or 'jpeg' (WebP/JPEG need Pillow) by SCREENSHOT_WORKERS
+# background threads, once the page has settled or SCREENSHOT_READY_TIMEOUT seconds have passed
+SCREENSHOT_FORMAT = os.environ.get('SCREENSHOT_FORMAT', 'png')
+SCREENSHOT_QUALITY = int(os.environ.get('SCREENSHOT_QUALITY', 80))
+SCREENSHOT_WORKERS = int(os.environ.get('SCREENSHOT_WORKERS', 2))
+SCREENSHOT_READY_TIMEOUT = float(os.environ.get('SCREENSHOT_READY_TIMEOUT', 3))
+# Screenshots are stored once per distinct image under SCREENSHOT_ROOT/store. Images whose perceptual
+# hashes differ in at most SCREENSHOT_DEDUP_DISTANCE of 64 bits are treated as duplicates (0 = exact
+# matches only). The least recently stored images are deleted past SCREENSHOT_STORE_MAX_MB (0 = no cap).
+SCREENSHOT_DEDUP_DISTANCE = int(os.environ.get('SCREENSHOT_DEDUP_DISTANCE', 0))
+SCREENSHOT_STORE_MAX_MB = int(os.environ.get('SCREENSHOT_STORE_MAX_MB', 500))
+# Longest side (pixels) of the thumbnails embedded in the HTML report
+SCREENSHOT_THUMBNAIL_SIZE = int(os.environ.get('SCREENSHOT_THUMBNAIL_SIZE', 320))
 
 # Upload file folder
 FILE_UPLOAD_DIR = os.environ.get("FILE_UPLOAD_DIR", os.path.join(BASE_DIR, 'uploads'))
@@ -39,6 +104,37 @@ FILE_UPLOAD_DIR = os.environ.get("FILE_UPLOAD_DIR", os.path.join(BASE_DIR, 'uplo
 DEFAULT_TIMEOUT = 10
 EXTENDED_TIMEOUT = 30
 
+# How waits detect DOM changes: 'observer' resolves from a MutationObserver inside the page as soon
+# as the condition holds, 'polling' re-queries from Python with adaptive backoff
+WAIT_STRATEGY = os.environ.get('WAIT_STRATEGY', 'observer')
+
+# Reuse located elements until the page navigates or reloads (opt-in)
+ELEMENT_CACHE = os.environ.get('ELEMENT_CACHE', 'false').lower() == 'true'
+
+# Record every WebDriver command (name, latency, payload size) per test and page-object method (opt-in)
+COMMAND_INSTRUMENTATION = os.environ.get('COMMAND_INSTRUMENTATION', 'false').lower() == 'true'
+
+# Collect Navigation/Resource/Paint timings after navigations and page-object actions (opt-in; each
+# collection is an extra script call)
+PAGE_TIMINGS = os.environ.get('PAGE_TIMINGS', 'false').lower() == 'true'
+# Performance budgets (milliseconds) declared by page objects, only enforced when set
+LOGIN_BUDGET_MS = int(os.environ['LOGIN_BUDGET_MS']) if os.environ.get('LOGIN_BUDGET_MS') else None
+
+# Logging pipeline: records wait in a bounded queue for the writer thread. When it is full,
+# 'block' makes the logging call wait and 'drop' discards the record (counted and reported).
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_QUEUE_POLICY = os.environ.get('LOG_QUEUE_POLICY', 'block')
+LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', 500))
+
+# Per-test log capture for the HTML report: most lines and characters kept per test (oldest dropped first)
+LOG_CAPTURE_MAX_LINES = int(os.environ.get('LOG_CAPTURE_MAX_LINES', 5000))
+LOG_CAPTURE_MAX_BYTES = int(os.environ.get('LOG_CAPTURE_MAX_BYTES', 1_000_000))
+
 # Other constants
 MAX_RETRIES = 3
 
+# How long (seconds) a cached logged-in storage state is reused before logging in again
+STORAGE_STATE_TTL = int(os.environ.get('STORAGE_STATE_TTL', 900))
+# How long (seconds) to look for the logged-in marker after restoring a cached state before logging in again
+STORAGE_STATE_VALIDATE_TIMEOUT = float(os.environ.get('STORAGE_STATE_VALIDATE_TIMEOUT', 2))
+
@@ -0,0 +1,99 @@
+# dom_snapshot.py
+
+from typing import Dict
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.remote.webdriver import WebDriver
+from .element_locator import ElementLocator, LocatorSpec
+from .utils import logger
+
+
+class DomSnapshot:
+    """A parsed copy of a page's DOM for checking many locators without browser round trips."""
+
+    def __init__(self, source: str):
+        """
+        Initialize the DomSnapshot.
+
+        Args:
+            source (str): The page's HTML, e.g. driver.page_source.
+        """
+        # Parse bytes: lxml rejects str input that carries an XML encoding declaration
+        self.tree = lxml_html.document_fromstring(source.encode("utf-8"))
+
+    @classmethod
+    def from_driver(cls, driver: WebDriver) -> "DomSnapshot":
+        """
+        Capture the driver's current DOM with a single page_source command.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Returns:
+            DomSnapshot: The parsed snapshot.
+        """
+        return cls(driver.page_source)
+
+    def count(self, locator_type: str, locator: str) -> int:
+        """
+        Count the nodes a locator matches in the snapshot.
+
+        Args:
+            locator_type (str): The type of locator (e.g., 'id', 'xpath', 'css').
+            locator (str): The locator string.
+
+        Returns:
+            int: The number of matching elements.
+        """
+        spec = ElementLocator.to_script_locator(locator_type, locator)
+        if spec["by"] == "css":
+            return len(CSSSelector(spec["value"])(self.tree))
+        return len(self.tree.xpath(spec["value"]))
+
+    def query(self, locators: Dict[str, LocatorSpec]) -> Dict[str, dict]:
+        """
+        Check presence and match count of many locators in-process.
+
+        Args:
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, or to a (locator_type, locator) tuple.
+
+        Returns:
+            Dict[str, dict]: For each name, {'present': bool, 'count': int}, plus 'error' if the
+                expression was invalid.
+        """
+        results = {}
+        for name, locator in locators.items():
+            locator_type, locator = locator if isinstance(locator, tuple) else ("xpath", locator)
+            try:
+                count = self.count(locator_type, locator)
+                results[name] = {"present": count > 0, "count": count}
+            except Exception as e:
+                logger.error(f"Invalid locator for '{name}': {str(e)}")
+                results[name] = {"present": False, "count": 0, "error": str(e)}
+        return results
+
+    @staticmethod
+    def check(driver: WebDriver, locators: Dict[str, LocatorSpec], condition: str = "present") -> Dict[str, dict]:
+        """
+        Check locators against one page_source snapshot, going live only for what needs layout.
+
+        Presence is decided from the snapshot. Visibility needs computed styles, so for
+        condition='visible' the locators present in the snapshot are checked live, together in a
+        single script call.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, or to a (locator_type, locator) tuple.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'present'.
+
+        Returns:
+            Dict[str, dict]: Per-locator results with 'present' and 'count', plus 'visible' when
+                condition='visible'.
+        """
+        results = DomSnapshot.from_driver(driver).query(locators)
+        if condition == "visible":
+            present = {name: locators[name] for name, result in results.items() if result["present"]}
+            live = ElementLocator.query_elements(driver, present) if present else {}
+            for name, result in results.items():
+                result["visible"] = live.get(name, {}).get("visible", False)
+        return results
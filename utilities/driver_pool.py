@@ -0,0 +1,270 @@
+# driver_pool.py
+
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+from .browser_options import BrowserOptions
+from .profile_template import profile_templates
+from .utils import logger
+
+PoolKey = Tuple[str, bool, bool]
+DriverFactory = Callable[[str, bool, bool], Tuple[WebDriver, WebDriverWait]]
+
+
+class DriverPool:
+    """A session-scoped pool of warm WebDriver instances keyed by (browser, headless, private)."""
+
+    def __init__(self, factory: DriverFactory, size: int = 1, prewarm: bool = False, max_live: int = 2):
+        """
+        Initialize the DriverPool.
+
+        Args:
+            factory (DriverFactory): Callable that launches a new driver and returns (driver, wait).
+            size (int, optional): Maximum number of idle drivers kept per key. Defaults to 1.
+            prewarm (bool, optional): Launch the next driver in the background after each acquire.
+                Defaults to False.
+            max_live (int, optional): Cap on browsers alive at once (in use, idle or warming) before
+                pre-warming holds off. Defaults to 2.
+        """
+        self.factory = factory
+        self.size = size
+        self.prewarm = prewarm
+        self.max_live = max_live
+        self.hidden_setup_time = 0.0
+        self._idle: Dict[PoolKey, Deque[Tuple[WebDriver, WebDriverWait]]] = defaultdict(deque)
+        self._warming: Dict[PoolKey, Deque[Future]] = defaultdict(deque)
+        self._keys: Dict[str, PoolKey] = {}
+        self._live = 0
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-prewarm") if prewarm else None
+
+    def acquire(self, browser_name: str, headless: bool, private: bool) -> Tuple[WebDriver, WebDriverWait]:
+        """
+        Hand out an idle or pre-warmed driver for the key, launching a new one if none is available.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            headless (bool): Whether the browser runs headless.
+            private (bool): Whether the browser runs in private/incognito mode.
+
+        Returns:
+            Tuple[WebDriver, WebDriverWait]: The driver and a wait bound to it.
+        """
+        key = (browser_name, headless, private)
+        entry = None
+        future = None
+        with self._lock:
+            if self._idle[key]:
+                entry = self._idle[key].popleft()
+            elif self._warming[key]:
+                future = self._warming[key].popleft()
+
+        if entry is not None:
+            logger.info(f"Reusing pooled {browser_name} driver {entry[0].session_id}")
+        elif future is not None:
+            entry = self._collect_prewarmed(future)
+        if entry is None:
+            entry = self._launch(key)
+
+        self._schedule_prewarm(key)
+        return entry
+
+    def release(self, driver: WebDriver, wait: WebDriverWait) -> None:
+        """
+        Reset a driver and return it to the pool, or quit it if the pool is full or the reset fails.
+
+        Args:
+            driver (WebDriver): The driver handed out by acquire().
+            wait (WebDriverWait): The wait handed out alongside the driver.
+        """
+        with self._lock:
+            key = self._keys.get(driver.session_id)
+            has_room = key is not None and len(self._idle[key]) < self.size
+
+        if has_room and self.reset_driver(driver):
+            with self._lock:
+                self._idle[key].append((driver, wait))
+            logger.info(f"Returned {key[0]} driver {driver.session_id} to the pool")
+            return
+
+        self._discard(driver)
+
+    @staticmethod
+    def reset_driver(driver: WebDriver) -> bool:
+        """
+        Bring a driver back to a clean state: one fresh tab, no cookies or site data, about:blank.
+
+        Only Chrome and Edge can be reset. Over CDP, cookies are cleared for every domain and site
+        data (localStorage, IndexedDB, caches, service workers) for every origin in each window's
+        navigation history; replacing the windows with a new tab drops their sessionStorage.
+        WebDriver alone can only clear the origin currently loaded, so other browsers (Firefox)
+        are reported as not reset, and the pool quits them instead of reusing them.
+
+        Args:
+            driver (WebDriver): The driver to reset.
+
+        Returns:
+            bool: True if the reset succeeded, False otherwise.
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.info(f"Can't clear every origin's storage on {driver.name}; not reusing driver {driver.session_id}")
+            return False
+        try:
+            origins = set()
+            old_handles = list(driver.window_handles)
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+                origins.update(_origin(entry["url"]) for entry in history.get("entries", []))
+            origins.discard(None)
+
+            driver.switch_to.new_window("tab")
+            fresh_handle = driver.current_window_handle
+            for handle in old_handles:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(fresh_handle)
+
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            # URL blocking was set on the closed tab's target, so the fresh tab needs it again
+            BrowserOptions.apply_blocking(driver)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not reset pooled driver {driver.session_id}: {str(e)}")
+            return False
+
+    def launch_parallel(self, keys: List[PoolKey]) -> None:
+        """
+        Start one driver per key concurrently; acquire() hands them over as they become ready.
+
+        Every key is launched, even past max_live, which only caps pre-warming. Released drivers
+        are kept or quit as with any other driver, so with a pool size of 0 each one is quit after
+        the test that used it.
+
+        This only overlaps browser startup: tests still run one after another. Running the
+        per-browser tests themselves concurrently needs pytest-xdist (-n).
+
+        Args:
+            keys (List[PoolKey]): The (browser, headless, private) keys to launch.
+        """
+        if not keys:
+            return
+        executor = ThreadPoolExecutor(max_workers=len(keys), thread_name_prefix="driver-launch")
+        with self._lock:
+            for key in keys:
+                self._live += 1
+                self._warming[key].append(executor.submit(self._timed_launch, key))
+        executor.shutdown(wait=False)
+        logger.info(f"Launching {', '.join(key[0] for key in keys)} drivers in parallel")
+
+    def _launch(self, key: PoolKey, reserved: bool = False) -> Tuple[WebDriver, WebDriverWait]:
+        if not reserved:
+            with self._lock:
+                self._live += 1
+        try:
+            driver, wait = self.factory(*key)
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        with self._lock:
+            self._keys[driver.session_id] = key
+        return driver, wait
+
+    def _timed_launch(self, key: PoolKey) -> Tuple[Tuple[WebDriver, WebDriverWait], float]:
+        start = time.perf_counter()
+        entry = self._launch(key, reserved=True)
+        return entry, time.perf_counter() - start
+
+    def _schedule_prewarm(self, key: PoolKey) -> None:
+        if self._executor is None:
+            return
+        with self._lock:
+            if self._idle[key] or self._warming[key] or self._live >= self.max_live:
+                return
+            self._live += 1
+            self._warming[key].append(self._executor.submit(self._timed_launch, key))
+        logger.info(f"Pre-warming a {key[0]} driver in the background")
+
+    def _collect_prewarmed(self, future: Future) -> Optional[Tuple[WebDriver, WebDriverWait]]:
+        start = time.perf_counter()
+        try:
+            entry, launch_time = future.result()
+        except Exception as e:
+            logger.warning(f"Pre-warmed driver failed to launch, starting one in the foreground: {str(e)}")
+            return None
+        waited = time.perf_counter() - start
+        hidden = max(launch_time - waited, 0.0)
+        self.hidden_setup_time += hidden
+        logger.info(
+            f"Handed over pre-warmed {entry[0].name} driver: {hidden:.2f}s of {launch_time:.2f}s setup hidden "
+            f"({self.hidden_setup_time:.2f}s total)"
+        )
+        return entry
+
+    def _discard(self, driver: WebDriver) -> None:
+        with self._lock:
+            if self._keys.pop(driver.session_id, None) is not None:
+                self._live -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Problem quitting pooled driver: {str(e)}")
+        # Drivers launched from a profile template own a cloned profile directory
+        profile_templates.release(getattr(driver, "profile_clone", None))
+
+    def close(self) -> None:
+        """Quit every idle and pre-warmed driver held by the pool."""
+        with self._lock:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            futures = [future for warming in self._warming.values() for future in warming]
+            self._idle.clear()
+            self._warming.clear()
+
+        for future in futures:
+            try:
+                entries.append(future.result()[0])
+            except Exception as e:
+                logger.warning(f"Pre-warmed driver failed to launch: {str(e)}")
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            logger.info(f"Pre-warming hid {self.hidden_setup_time:.2f}s of browser setup time")
+
+        logger.info(f"Closing driver pool with {len(entries)} idle driver(s)")
+        for driver, _ in entries:
+            self._discard(driver)
+
+    def idle_count(self, key: Optional[PoolKey] = None) -> int:
+        """
+        Count idle drivers, either for one key or across the whole pool.
+
+        Args:
+            key (Optional[PoolKey]): The (browser, headless, private) key. Defaults to all keys.
+
+        Returns:
+            int: The number of idle drivers.
+        """
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, ()))
+            return sum(len(idle) for idle in self._idle.values())
+
+    @property
+    def live_count(self) -> int:
+        """int: Number of browsers currently alive, whether in use, idle or warming."""
+        with self._lock:
+            return self._live
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
@@ -2,25 +2,49 @@ import os
 from .config import FILE_UPLOAD_DIR
 from .utils import logger
 from traceback import print_stack
-from typing import Optional, List
-from utilities.element_locator import ElementLocator
+from typing import Any, Dict, Optional, List
+from utilities.element_locator import ElementLocator, LocatorSpec
+from utilities.explicit_wait_type import ExplicitWaitType
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from datetime import datetime
 
+# Sets each element's value through the native setter (so framework-bound inputs notice) and fires
+# input and change events. arguments[0] is a list of [element, value]; returns an error or null each.
+FILL_FIELDS_JS = """
+return arguments[0].map(function (field) {
+    var element = field[0], value = field[1];
+    try {
+        var prototype = Object.getPrototypeOf(element);
+        var descriptor = Object.getOwnPropertyDescriptor(prototype, 'value');
+        if (descriptor && descriptor.set) { descriptor.set.call(element, value); } else { element.value = value; }
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        return null;
+    } catch (e) {
+        return String(e);
+    }
+});
+"""
 
 
 class ElementInteractor:
     """A class for interacting with web elements."""
     
-    def __init__(self, driver):
+    def __init__(self, driver, locator=None):
+        """
+        Initialize the ElementInteractor.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            locator (ElementLocator, optional): Locator to share, e.g. with a page object so both
+                use the same element cache. Defaults to a new ElementLocator.
+        """
         self.driver = driver
-        self.locator = ElementLocator(driver)
+        self.locator = locator or ElementLocator(driver)
 
     @staticmethod
     def scroll_to_element(driver: WebDriver, element: WebElement, timeout: int = 10) -> Optional[WebElement]:
@@ -39,7 +63,7 @@ class ElementInteractor:
             actions = ActionChains(driver)
             actions.move_to_element(element).perform()
 
-            WebDriverWait(driver, timeout).until(EC.visibility_of(element))
+            ExplicitWaitType(driver).wait_for_elements({"element": element}, "visible", timeout)
             logger.info(f"Scrolled to {element} and it's visible")
             return element
         except TimeoutException:
@@ -72,9 +96,16 @@ class ElementInteractor:
         """
         
         try:
-            element = self.locator.get_element(self.driver, locator, locator_type)
-            element.click()
-            logger.info(f"Element clicked successfully: {element.text}")
+            def click(element):
+                # Read the text first; after a navigating click the element is gone
+                text = element.text
+                element.click()
+                return text
+
+            text = self.locator.use_element(locator, locator_type, click)
+            # The click may have navigated, so cached elements need re-validating
+            self.locator.page_changed()
+            logger.info(f"Element clicked successfully: {text}")
         except Exception as e:
             logger.warning(f"Could not click {locator} with {locator_type}")
             logger.error(f"Error: {str(e)}")
@@ -88,9 +119,80 @@ class ElementInteractor:
             locator_type (str, optional): The method to find the element. Defaults to "XPATH".
         """
         try:
-            element = self.locator.get_element(self.driver, locator, locator_type)
-            element.send_keys(data)
+            self.locator.use_element(locator, locator_type, lambda element: element.send_keys(data))
         except Exception as e:
             logger.warning(f"Could not send data into {locator}.")
             logger.error(f"Error: {str(e)}")
-            
\ No newline at end of file
+
+    def fill_form(self, fields: Dict[LocatorSpec, Any], submit: Optional[LocatorSpec] = None,
+                  mode: str = "actions") -> Dict[str, Optional[str]]:
+        """
+        Fill several fields at once and optionally submit.
+
+        All fields (and the submit button) are located in one script call. In 'actions' mode they
+        are then typed into through a single ActionChains sequence; in 'fast' mode their values are
+        set in one script call that also fires input/change events. A field that can't be found or
+        filled is reported without stopping the others.
+
+        Args:
+            fields (Dict[LocatorSpec, Any]): XPath or (locator_type, locator) mapped to the value to enter.
+            submit (Optional[LocatorSpec]): Element to click once the fields are filled. Defaults to None.
+            mode (str, optional): 'actions' or 'fast'. Defaults to 'actions'.
+
+        Returns:
+            Dict[str, Optional[str]]: Each field's locator mapped to None on success or an error message.
+        """
+        if mode not in ("actions", "fast"):
+            raise ValueError(f"Unsupported fill mode: {mode}")
+
+        names = {f"field{index}": locator for index, locator in enumerate(fields)}
+        lookup = dict(names)
+        if submit is not None:
+            lookup["submit"] = submit
+        found = self.locator.query_elements(self.driver, lookup, with_elements=True)
+
+        results: Dict[str, Optional[str]] = {}
+        to_fill = []
+        for name, locator in names.items():
+            label = locator[1] if isinstance(locator, tuple) else locator
+            element = found[name].get("element")
+            if element is None:
+                results[label] = found[name].get("error", "element not found")
+            else:
+                results[label] = None
+                to_fill.append((label, element, fields[locator]))
+
+        if mode == "fast":
+            errors = self.driver.execute_script(FILL_FIELDS_JS, [[element, str(value)] for _, element, value in to_fill])
+            for (label, _, _), error in zip(to_fill, errors):
+                results[label] = error
+        else:
+            actions = ActionChains(self.driver)
+            for _, element, value in to_fill:
+                actions.click(element).send_keys(str(value))
+            try:
+                actions.perform()
+            except Exception as e:
+                # Work out which field failed by filling them one at a time. The batch may have
+                # typed into some fields before failing, so clear each one first.
+                logger.warning(f"Batched typing failed, filling fields individually: {str(e)}")
+                for label, element, value in to_fill:
+                    try:
+                        element.clear()
+                        element.send_keys(str(value))
+                    except Exception as field_error:
+                        results[label] = str(field_error)
+
+        for label, error in results.items():
+            if error is not None:
+                logger.warning(f"Could not fill {label}: {error}")
+        logger.info(f"Filled {sum(error is None for error in results.values())} of {len(results)} field(s)")
+
+        if submit is not None:
+            button = found["submit"].get("element")
+            if button is None:
+                logger.error(f"Submit element not found: {submit}")
+            else:
+                button.click()
+                self.locator.page_changed()
+        return results
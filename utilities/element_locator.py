@@ -1,23 +1,216 @@
 # element_locator.py
 
 import os
+import re
+import time
 from .utils import logger
-from typing import Optional, List
+from .config import DEFAULT_TIMEOUT, ELEMENT_CACHE
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, StaleElementReferenceException, TimeoutException
 from datetime import datetime
 
+# Defines resolveLocators(specs, withElements), which resolves a set of named locators in the page
+# in one go. specs maps each name to {by: 'xpath' | 'css' | 'element', value}; withElements asks for
+# the first matching element to be returned as well.
+RESOLVE_LOCATORS_JS = """
+var resolveLocators = function (specs, withElements) {
+    var results = {};
+    var isVisible = function (el) {
+        if (!el.getClientRects || el.getClientRects().length === 0) { return false; }
+        var style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+    };
+    Object.keys(specs).forEach(function (name) {
+        var spec = specs[name], nodes = [];
+        try {
+            if (spec.by === 'element') {
+                nodes = spec.value && spec.value.isConnected ? [spec.value] : [];
+            } else if (spec.by === 'xpath') {
+                var found = document.evaluate(spec.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+            } else {
+                nodes = Array.prototype.slice.call(document.querySelectorAll(spec.value));
+            }
+        } catch (e) {
+            results[name] = {present: false, visible: false, count: 0, error: String(e)};
+            return;
+        }
+        results[name] = {present: nodes.length > 0, visible: nodes.some(isVisible), count: nodes.length};
+        if (withElements) { results[name].element = nodes.length ? nodes[0] : null; }
+    });
+    return results;
+};
+"""
+
+BULK_QUERY_JS = RESOLVE_LOCATORS_JS + "return resolveLocators(arguments[0], arguments[1]);"
+
+# Returns a token identifying the current document. The token lives on window, so a navigation or
+# reload replaces it with a fresh one.
+PAGE_GENERATION_JS = """
+if (!window.__pomGeneration) {
+    window.__pomGeneration = Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+return window.__pomGeneration;
+"""
+
+# Checks that an XPath and a CSS selector match exactly the same nodes, in document order
+COMPARE_LOCATORS_JS = """
+var found = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var byCss = document.querySelectorAll(arguments[1]);
+var same = found.snapshotLength === byCss.length;
+for (var i = 0; same && i < byCss.length; i++) { same = found.snapshotItem(i) === byCss[i]; }
+return {same: same, xpathCount: found.snapshotLength, cssCount: byCss.length};
+"""
+
+# Average milliseconds to resolve an XPath and a CSS selector over arguments[2] runs
+BENCHMARK_LOCATORS_JS = """
+var xpath = arguments[0], css = arguments[1], runs = arguments[2], i;
+var start = performance.now();
+for (i = 0; i < runs; i++) {
+    document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+}
+var middle = performance.now();
+for (i = 0; i < runs; i++) { document.querySelectorAll(css); }
+var end = performance.now();
+return {xpath: (middle - start) / runs, css: (end - middle) / runs};
+"""
+
+LocatorSpec = Union[str, Tuple[str, str], WebElement]
+
+
+class ElementCache:
+    """Located WebElements keyed by (locator type, locator), valid for one page generation."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.generation: Optional[str] = None
+        self.verified = False
+        self.hits = 0
+        self.misses = 0
+        self.generation_checks = 0
+        self.stale_drops = 0
+        self._elements: Dict[Tuple[str, str], WebElement] = {}
+
+    def sync(self) -> None:
+        """Drop every cached element if the page generation changed since it was last checked."""
+        if self.verified:
+            return
+        generation = self.driver.execute_script(PAGE_GENERATION_JS)
+        self.generation_checks += 1
+        if generation != self.generation:
+            self._elements.clear()
+            self.generation = generation
+        self.verified = True
+
+    def mark_dirty(self) -> None:
+        """Note that the page may have navigated, so the next lookup re-checks the generation."""
+        self.verified = False
+
+    def get(self, key: Tuple[str, str]) -> Optional[WebElement]:
+        element = self._elements.get(key)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, key: Tuple[str, str], element: WebElement) -> None:
+        self._elements[key] = element
+
+    def drop(self, key: Tuple[str, str]) -> None:
+        self._elements.pop(key, None)
+        self.stale_drops += 1
+        self.mark_dirty()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Summarize cache effectiveness.
+
+        Returns:
+            Dict[str, int]: Hits, misses, generation checks, stale drops and the net number of
+                find_element round trips saved (hits minus generation checks).
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation_checks": self.generation_checks,
+            "stale_drops": self.stale_drops,
+            "round_trips_saved": self.hits - self.generation_checks,
+        }
+
 
 class ElementLocator:
     """A class for locating web elements."""
     
-    def __init__(self, driver):
+    def __init__(self, driver, cache=ELEMENT_CACHE):
+        """
+        Initialize the ElementLocator.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            cache (bool, optional): Reuse located elements until the page changes. Defaults to
+                ELEMENT_CACHE from config.
+        """
         self.driver = driver
+        self.cache = ElementCache(driver) if cache else None
+
+    def find(self, locator: str, locator_type: str = "xpath") -> Optional[WebElement]:
+        """
+        Find an element, serving it from the element cache when enabled.
+
+        Args:
+            locator (str): The locator string.
+            locator_type (str, optional): The type of locator. Defaults to 'xpath'.
+
+        Returns:
+            Optional[WebElement]: The found WebElement, or None if not found.
+        """
+        if self.cache is None:
+            return ElementLocator.get_element(self.driver, locator, locator_type)
+
+        key = (locator_type.lower(), locator)
+        self.cache.sync()
+        element = self.cache.get(key)
+        if element is not None:
+            return element
+
+        element = ElementLocator.get_element(self.driver, locator, locator_type)
+        if element is not None:
+            self.cache.put(key, element)
+        return element
+
+    def use_element(self, locator: str, locator_type: str, action: Callable[[WebElement], Any]) -> Any:
+        """
+        Run an action on an element, re-locating it once if the cached handle has gone stale.
+
+        Args:
+            locator (str): The locator string.
+            locator_type (str): The type of locator.
+            action (Callable[[WebElement], Any]): What to do with the element.
+
+        Returns:
+            Any: Whatever the action returns.
+        """
+        element = self.find(locator, locator_type)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            if self.cache is None:
+                raise
+            logger.info(f"Cached element went stale, locating again: {locator}")
+            self.cache.drop((locator_type.lower(), locator))
+            return action(self.find(locator, locator_type))
+
+    def page_changed(self) -> None:
+        """Tell the element cache that the page may have navigated (e.g. after a click)."""
+        if self.cache is not None:
+            self.cache.mark_dirty()
 
     @staticmethod
     def get_by_type(locator_type: str) -> Optional[str]:
@@ -37,6 +230,8 @@ class ElementLocator:
             "css": By.CSS_SELECTOR,
             "classname": By.CLASS_NAME,
             "linktext": By.LINK_TEXT,
+            "partiallinktext": By.PARTIAL_LINK_TEXT,
+            "tagname": By.TAG_NAME,
             "name": By.NAME
         }
         if locator_type not in locator_map:
@@ -109,3 +304,356 @@ class ElementLocator:
         else:
             logger.info(f"No elements found with locator: {locator}")
             return False
+
+    @staticmethod
+    def to_script_locator(locator_type: str, locator: str) -> Dict[str, str]:
+        """
+        Translate a locator into the XPath or CSS form understood by BULK_QUERY_JS.
+
+        Args:
+            locator_type (str): The type of locator (e.g., 'id', 'xpath', 'css').
+            locator (str): The locator string.
+
+        Returns:
+            Dict[str, str]: {'by': 'xpath' or 'css', 'value': the expression}.
+        """
+        locator_type = locator_type.lower()
+        quoted = f"'{locator}'" if '"' in locator else f'"{locator}"'
+        if locator_type == "xpath":
+            return {"by": "xpath", "value": locator}
+        if locator_type == "css":
+            return {"by": "css", "value": locator}
+        if locator_type == "id":
+            return {"by": "xpath", "value": f"//*[@id={quoted}]"}
+        if locator_type == "name":
+            return {"by": "xpath", "value": f"//*[@name={quoted}]"}
+        if locator_type == "classname":
+            return {"by": "xpath", "value": f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {locator} ')]"}
+        if locator_type == "linktext":
+            return {"by": "xpath", "value": f"//a[normalize-space(.)={quoted}]"}
+        if locator_type == "partiallinktext":
+            return {"by": "xpath", "value": f"//a[contains(normalize-space(.), {quoted})]"}
+        if locator_type == "tagname":
+            return {"by": "css", "value": locator}
+        raise ValueError(f"Locator type '{locator_type}' is not supported")
+
+    @staticmethod
+    def to_script_specs(locators: Dict[str, LocatorSpec]) -> Dict[str, dict]:
+        """
+        Build the specs argument of RESOLVE_LOCATORS_JS from named locators.
+
+        Args:
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, a (locator_type, locator)
+                tuple or an already located WebElement.
+
+        Returns:
+            Dict[str, dict]: Name mapped to {'by': ..., 'value': ...}.
+        """
+        specs = {}
+        for name, locator in locators.items():
+            if isinstance(locator, WebElement):
+                specs[name] = {"by": "element", "value": locator}
+                continue
+            locator_type, locator = locator if isinstance(locator, tuple) else ("xpath", locator)
+            specs[name] = ElementLocator.to_script_locator(locator_type, locator)
+        return specs
+
+    @staticmethod
+    def query_elements(driver: WebDriver, locators: Dict[str, LocatorSpec],
+                       with_elements: bool = False) -> Dict[str, dict]:
+        """
+        Check presence, visibility and match count of many locators in a single browser round trip.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, a (locator_type, locator)
+                tuple or an already located WebElement.
+            with_elements (bool, optional): Also return the first matching WebElement of each locator.
+                Defaults to False.
+
+        Returns:
+            Dict[str, dict]: For each name, {'present': bool, 'visible': bool, 'count': int}, plus
+                'element' when with_elements is set and 'error' if the expression was invalid.
+        """
+        specs = ElementLocator.to_script_specs(locators)
+        results = driver.execute_script(BULK_QUERY_JS, specs, with_elements)
+        for name, result in results.items():
+            if "error" in result:
+                logger.error(f"Invalid locator for '{name}': {result['error']}")
+        return results
+
+    @staticmethod
+    def is_satisfied(results: Dict[str, dict], condition: str = "present", mode: str = "all") -> bool:
+        """
+        Check query_elements results against a wait condition.
+
+        Args:
+            results (Dict[str, dict]): Results from query_elements.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'present'.
+            mode (str, optional): 'all' needs every locator to match, 'any' needs one. Defaults to 'all'.
+
+        Returns:
+            bool: True if the results satisfy the condition.
+        """
+        matched = [result[condition] for result in results.values()]
+        return any(matched) if mode == "any" else all(matched)
+
+    @staticmethod
+    def raise_for_errors(results: Dict[str, dict]) -> None:
+        """
+        Fail on locators that query_elements reported as invalid, since waiting can't fix them.
+
+        Args:
+            results (Dict[str, dict]): Results from query_elements.
+
+        Raises:
+            InvalidSelectorException: If any locator has an 'error'.
+        """
+        invalid = {name: result["error"] for name, result in results.items() if result.get("error")}
+        if invalid:
+            raise InvalidSelectorException(
+                "Invalid locator(s): " + "; ".join(f"{name}: {error}" for name, error in invalid.items())
+            )
+
+    @staticmethod
+    def wait_for_elements(driver: WebDriver, locators: Dict[str, LocatorSpec], condition: str = "present",
+                          timeout: float = DEFAULT_TIMEOUT, mode: str = "all", with_elements: bool = False,
+                          max_poll_interval: float = 0.5) -> Dict[str, dict]:
+        """
+        Poll locators together until they are satisfied, backing off from 50 ms up to max_poll_interval.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, a (locator_type, locator)
+                tuple or an already located WebElement.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'present'.
+            timeout (float, optional): Maximum time to wait. Defaults to DEFAULT_TIMEOUT.
+            mode (str, optional): 'all' waits for every locator, 'any' for the first. Defaults to 'all'.
+            with_elements (bool, optional): Include the first matching WebElement of each locator.
+                Defaults to False.
+            max_poll_interval (float, optional): Longest pause between polls. Defaults to 0.5.
+
+        Raises:
+            InvalidSelectorException: If a locator is not a valid expression.
+            TimeoutException: If the locators are still unsatisfied when the timeout expires.
+
+        Returns:
+            Dict[str, dict]: The final results, as returned by query_elements.
+        """
+        if condition not in ("present", "visible"):
+            raise ValueError(f"Unsupported condition: {condition}")
+
+        end_time = time.monotonic() + timeout
+        interval = 0.05
+        while True:
+            results = ElementLocator.query_elements(driver, locators, with_elements)
+            if ElementLocator.is_satisfied(results, condition, mode):
+                return results
+            ElementLocator.raise_for_errors(results)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                missing = [name for name, result in results.items() if not result[condition]]
+                logger.error(f"Elements not {condition} after {timeout} seconds: {', '.join(missing)}")
+                raise TimeoutException(f"Elements not {condition}: {', '.join(missing)}")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_poll_interval)
+
+
+# Pieces of the XPath subset the compiler understands
+_XPATH_STEP = re.compile(r"(//|/)(\*|[A-Za-z_][\w-]*)((?:\[[^\[\]]*\])*)")
+_XPATH_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_XPATH_STRING = r"(?:'([^']*)'|\"([^\"]*)\")"
+_XPATH_CONDITIONS = [
+    (re.compile(r"@([\w-]+)\s*=\s*" + _XPATH_STRING), "="),
+    (re.compile(r"contains\(\s*@([\w-]+)\s*,\s*" + _XPATH_STRING + r"\s*\)"), "*="),
+    (re.compile(r"starts-with\(\s*@([\w-]+)\s*,\s*" + _XPATH_STRING + r"\s*\)"), "^="),
+    (re.compile(r"@([\w-]+)"), None),
+]
+_XPATH_AND = re.compile(r"\s+and\s+")
+_CSS_IDENTIFIER = re.compile(r"[A-Za-z_][\w-]*")
+
+
+class CompiledLocator:
+    """An XPath locator together with its CSS equivalent, if one exists."""
+
+    def __init__(self, name: str, xpath: str, css: Optional[str]):
+        self.name = name
+        self.xpath = xpath
+        self.css = css
+        # None until checked against a page; then whether both forms matched the same nodes
+        self.validated: Optional[bool] = None
+
+    def as_locator(self) -> Tuple[str, str]:
+        """
+        Pick the form to use: the CSS selector once it has been validated, the XPath otherwise.
+
+        Returns:
+            Tuple[str, str]: (locator_type, locator).
+        """
+        if self.css is not None and self.validated:
+            return "css", self.css
+        return "xpath", self.xpath
+
+
+class LocatorCompiler:
+    """Rewrites simple descendant XPaths into equivalent, faster CSS selectors."""
+
+    @staticmethod
+    def xpath_to_css(xpath: str) -> Optional[str]:
+        """
+        Translate an XPath into CSS when the semantics carry over.
+
+        Supported: '//' and '/' steps over tag names or '*', with predicates made of
+        @attr='value', contains(@attr, 'value'), starts-with(@attr, 'value') and @attr, joined by
+        'and'. Anything else (positions, text(), axes, unions, 'or') is left as XPath.
+
+        Args:
+            xpath (str): The XPath to translate.
+
+        Returns:
+            Optional[str]: The CSS selector, or None if the XPath can't be expressed in CSS.
+        """
+        xpath = xpath.strip()
+        parts = []
+        position = 0
+        while position < len(xpath):
+            step = _XPATH_STEP.match(xpath, position)
+            if step is None:
+                return None
+            axis, tag, predicates = step.groups()
+            selector = "" if tag == "*" else tag
+            for predicate in _XPATH_PREDICATE.findall(predicates):
+                conditions = LocatorCompiler._predicate_to_css(predicate)
+                if conditions is None:
+                    return None
+                selector += conditions
+
+            if not parts:
+                # A leading '/' anchors the first step at the document's root element
+                parts.append(f"{selector or '*'}:root" if axis == "/" else selector or "*")
+            else:
+                parts.append((" > " if axis == "/" else " ") + (selector or "*"))
+            position = step.end()
+        return "".join(parts) or None
+
+    @staticmethod
+    def _predicate_to_css(predicate: str) -> Optional[str]:
+        css = ""
+        for condition in _XPATH_AND.split(predicate.strip()):
+            for pattern, operator in _XPATH_CONDITIONS:
+                match = pattern.fullmatch(condition.strip())
+                if match is None:
+                    continue
+                attribute = match.group(1)
+                if operator is None:
+                    css += f"[{attribute}]"
+                    break
+                value = match.group(2) if match.group(2) is not None else match.group(3)
+                if operator != "=" and value == "":
+                    # XPath treats an empty needle as always matching; CSS never matches it
+                    return None
+                if attribute == "id" and operator == "=" and _CSS_IDENTIFIER.fullmatch(value):
+                    css += f"#{value}"
+                else:
+                    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+                    css += f'[{attribute}{operator}"{escaped}"]'
+                break
+            else:
+                return None
+        return css
+
+
+class LocatorRegistry:
+    """Named XPath locators compiled to CSS and validated against a live page."""
+
+    def __init__(self, driver: Optional[WebDriver] = None):
+        """
+        Initialize the LocatorRegistry.
+
+        Args:
+            driver (Optional[WebDriver]): If given, locators are validated against the page it is on
+                as they are registered.
+        """
+        self.driver = driver
+        self.locators: Dict[str, CompiledLocator] = {}
+
+    def register(self, name: str, xpath: str) -> CompiledLocator:
+        """
+        Compile an XPath and, if a driver is attached, validate the CSS form against its page.
+
+        Args:
+            name (str): Name to register the locator under.
+            xpath (str): The XPath locator.
+
+        Returns:
+            CompiledLocator: The compiled locator.
+        """
+        compiled = CompiledLocator(name, xpath, LocatorCompiler.xpath_to_css(xpath))
+        self.locators[name] = compiled
+        if compiled.css is None:
+            logger.info(f"Locator '{name}' has no CSS equivalent, keeping XPath: {xpath}")
+        elif self.driver is not None:
+            self._validate(compiled)
+        return compiled
+
+    def validate(self, driver: Optional[WebDriver] = None) -> Dict[str, Optional[bool]]:
+        """
+        Check every registered CSS translation against the current page.
+
+        Args:
+            driver (Optional[WebDriver]): Driver whose page to check. Defaults to the registry's driver.
+
+        Returns:
+            Dict[str, Optional[bool]]: Validation result per locator name.
+        """
+        self.driver = driver or self.driver
+        for compiled in self.locators.values():
+            if compiled.css is not None:
+                self._validate(compiled)
+        return {name: compiled.validated for name, compiled in self.locators.items()}
+
+    def _validate(self, compiled: CompiledLocator) -> None:
+        result = self.driver.execute_script(COMPARE_LOCATORS_JS, compiled.xpath, compiled.css)
+        if not result["same"]:
+            compiled.validated = False
+            logger.warning(
+                f"CSS for '{compiled.name}' matched {result['cssCount']} node(s) but the XPath matched "
+                f"{result['xpathCount']}, keeping XPath: {compiled.css}"
+            )
+        elif result["xpathCount"] == 0:
+            # Matching nothing on this page proves nothing either way
+            logger.info(f"Locator '{compiled.name}' matched nothing here, CSS left unvalidated")
+        else:
+            compiled.validated = True
+            logger.info(f"Locator '{compiled.name}' compiled to CSS: {compiled.css}")
+
+    def get(self, name: str) -> Tuple[str, str]:
+        """
+        Return the best form of a registered locator.
+
+        Args:
+            name (str): The locator name.
+
+        Returns:
+            Tuple[str, str]: (locator_type, locator), CSS only once validated.
+        """
+        return self.locators[name].as_locator()
+
+    def benchmark(self, runs: int = 100) -> Dict[str, Dict[str, float]]:
+        """
+        Time both forms of every compiled locator in the browser and log the results.
+
+        Args:
+            runs (int, optional): Resolutions per form to average over. Defaults to 100.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per locator, average milliseconds for 'xpath' and 'css'.
+        """
+        timings = {}
+        for name, compiled in self.locators.items():
+            if compiled.css is None:
+                continue
+            timing = self.driver.execute_script(BENCHMARK_LOCATORS_JS, compiled.xpath, compiled.css, runs)
+            timings[name] = timing
+            logger.info(f"Locator '{name}': XPath {timing['xpath']:.4f} ms, CSS {timing['css']:.4f} ms")
+        return timings
@@ -1,29 +1,197 @@
+import time
 from traceback import print_stack
+from typing import Dict, Optional, Tuple
 from .utils import logger
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from .config import DEFAULT_TIMEOUT, WAIT_STRATEGY
 from selenium.common.exceptions import *
-from utilities.element_locator import ElementLocator
+from selenium.webdriver.remote.webelement import WebElement
+from utilities.element_locator import ElementLocator, LocatorSpec, RESOLVE_LOCATORS_JS
+
+# Waits inside the page until resolveLocators() satisfies the condition, re-checking whenever a
+# MutationObserver reports a DOM change (and on a short in-page timer for style/layout changes that
+# aren't mutations). Resolves with {satisfied, results}.
+OBSERVER_WAIT_JS = RESOLVE_LOCATORS_JS + """
+var specs = arguments[0], condition = arguments[1], mode = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var check = function () {
+    var results = resolveLocators(specs, true);
+    var names = Object.keys(results);
+    var matched = names.filter(function (name) { return results[name][condition]; }).length;
+    return (mode === 'any' ? matched > 0 : matched === names.length) ? results : null;
+};
+var initial = resolveLocators(specs, true);
+if (Object.keys(initial).some(function (name) { return initial[name].error; })) {
+    // An invalid expression will never match; report it instead of waiting out the timeout
+    done({satisfied: false, results: initial});
+    return;
+}
+initial = check();
+if (initial) { done({satisfied: true, results: initial}); return; }
+var finished = false, scheduled = false, observer, interval, timer;
+var finish = function (satisfied, results) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done({satisfied: satisfied, results: results || resolveLocators(specs, true)});
+};
+var recheck = function () {
+    scheduled = false;
+    var results = check();
+    if (results) { finish(true, results); }
+};
+observer = new MutationObserver(function () {
+    // Coalesce a burst of mutations into a single check
+    if (!scheduled) { scheduled = true; Promise.resolve().then(recheck); }
+});
+observer.observe(document.documentElement || document,
+                 {childList: true, subtree: true, attributes: true, characterData: true});
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () { finish(false); }, timeoutMs);
+"""
+
+# Longest single in-page wait, kept well below the default 30s script timeout
+_OBSERVER_SLICE = 5.0
+
+# Script errors drivers report when the document the wait ran in was replaced by a navigation
+_NAVIGATION_ERRORS = ("unloaded", "execution context was destroyed", "cannot find context", "navigated")
 
 
 class ExplicitWaitType:
 
-    def __init__(self, driver):
+    def __init__(self, driver, strategy=WAIT_STRATEGY):
+        """
+        Initialize the ExplicitWaitType.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            strategy (str, optional): 'observer' or 'polling'. Defaults to WAIT_STRATEGY from config.
+        """
         self.driver = driver
+        self.strategy = strategy
+
+    def wait_for_element(self, locator, locator_type="xpath", timeout=DEFAULT_TIMEOUT) -> Optional[WebElement]:
+        """
+        Wait for an element to become visible.
+
+        Args:
+            locator (str): The locator string.
+            locator_type (str, optional): The type of locator. Defaults to 'xpath'.
+            timeout (float, optional): Maximum time to wait. Defaults to DEFAULT_TIMEOUT.
 
-    def wait_for_element(self, locator, locator_type="xpath", timeout=10, poll_frequency=0.5):
-        element = None
-        locator = ElementLocator
+        Returns:
+            Optional[WebElement]: The visible element, or None if it did not appear.
+        """
+        logger.info("Waiting for maximum :: " + str(timeout) + " :: seconds for element to be visible")
         try:
-            self.driver.implicitly_wait(0)
-            by_type = self.locator.get_by_type(locator_type)
-            logger.info("Waiting for maximum :: " + str(timeout) + " :: seconds for element to be clickable")
-            wait = WebDriverWait(self.driver, timeout, poll_frequency, ignored_exceptions=[NoSuchElementException,
-                                                                                               ElementNotVisibleException,
-                                                                                               ElementNotSelectableException])
-            element = wait.until(EC.visibility_of_element_located((by_type, locator)))
+            results = self.wait_until({"element": (locator_type, locator)}, "visible", timeout)
             logger.info("Element appeared on webpage")
-        except Exception as e:
-            logger.error(f"Element has not appeared on webpage: {str()}")
-        self.driver.implicitly_wait(10)
-        return element
+            return results["element"]["element"]
+        except TimeoutException as e:
+            logger.error(f"Element has not appeared on webpage: {str(e)}")
+            return None
+
+    def wait_for_elements(self, locators: Dict[str, LocatorSpec], condition: str = "present",
+                          timeout: float = DEFAULT_TIMEOUT) -> Dict[str, dict]:
+        """
+        Wait until every locator is present (or visible).
+
+        Args:
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, a (locator_type, locator)
+                tuple or an already located WebElement.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'present'.
+            timeout (float, optional): Maximum time to wait. Defaults to DEFAULT_TIMEOUT.
+
+        Raises:
+            TimeoutException: If some locators are still unsatisfied when the timeout expires.
+
+        Returns:
+            Dict[str, dict]: Per-locator results, as returned by ElementLocator.query_elements.
+        """
+        results = self.wait_until(locators, condition, timeout)
+        logger.info(f"All {len(results)} element(s) are {condition}")
+        return results
+
+    def wait_for_any(self, locators: Dict[str, LocatorSpec], timeout: float = DEFAULT_TIMEOUT,
+                     condition: str = "visible") -> Tuple[str, WebElement, float]:
+        """
+        Wait for whichever of several elements appears first.
+
+        Every locator is checked on each poll, so a page that can end up in different states
+        (e.g. logged in vs. an error message) resolves as soon as any state shows up instead of
+        timing out on the one that never will. Outcome markers such as error messages are often
+        in the DOM but hidden, so by default an outcome only counts once it is visible.
+
+        Args:
+            locators (Dict[str, LocatorSpec]): Outcome name mapped to an XPath, or to a
+                (locator_type, locator) tuple.
+            timeout (float, optional): Maximum time to wait. Defaults to DEFAULT_TIMEOUT.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'visible'.
+
+        Raises:
+            TimeoutException: If none of the elements appear within the timeout.
+
+        Returns:
+            Tuple[str, WebElement, float]: The name of the outcome that appeared, its element and
+                the seconds it took.
+        """
+        start = time.perf_counter()
+        results = self.wait_until(locators, condition, timeout, mode="any")
+        latency = time.perf_counter() - start
+        # Dicts keep declaration order, so the first declared outcome wins a tie
+        name = next(name for name in locators if results[name][condition])
+        logger.info(f"'{name}' appeared first after {latency:.3f} seconds")
+        return name, results[name]["element"], latency
+
+    def wait_until(self, locators: Dict[str, LocatorSpec], condition: str = "present",
+                   timeout: float = DEFAULT_TIMEOUT, mode: str = "all") -> Dict[str, dict]:
+        """
+        Wait for locators to satisfy a condition using the configured strategy.
+
+        The observer strategy falls back to polling if the browser can't run async scripts.
+
+        Args:
+            locators (Dict[str, LocatorSpec]): Name mapped to an XPath, a (locator_type, locator)
+                tuple or an already located WebElement.
+            condition (str, optional): 'present' or 'visible'. Defaults to 'present'.
+            timeout (float, optional): Maximum time to wait. Defaults to DEFAULT_TIMEOUT.
+            mode (str, optional): 'all' waits for every locator, 'any' for the first. Defaults to 'all'.
+
+        Raises:
+            InvalidSelectorException: If a locator is not a valid expression.
+            JavascriptException: If the wait script failed for a reason other than a navigation.
+            TimeoutException: If the condition does not hold within the timeout.
+
+        Returns:
+            Dict[str, dict]: Per-locator results including the first matching element.
+        """
+        if condition not in ("present", "visible"):
+            raise ValueError(f"Unsupported condition: {condition}")
+
+        end_time = time.monotonic() + timeout
+        if self.strategy == "observer":
+            specs = ElementLocator.to_script_specs(locators)
+            while True:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    break
+                slice_ms = int(min(remaining, _OBSERVER_SLICE) * 1000)
+                try:
+                    outcome = self.driver.execute_async_script(OBSERVER_WAIT_JS, specs, condition, mode, slice_ms)
+                except JavascriptException as e:
+                    if not any(error in (e.msg or "").lower() for error in _NAVIGATION_ERRORS):
+                        raise
+                    # The page navigated while waiting; observe the new document
+                    logger.info(f"Observer wait interrupted, re-attaching: {e.msg}")
+                    time.sleep(0.05)
+                    continue
+                except WebDriverException as e:
+                    logger.warning(f"Async scripts unavailable, falling back to polling: {e.msg}")
+                    break
+                if outcome["satisfied"]:
+                    return outcome["results"]
+                ElementLocator.raise_for_errors(outcome["results"])
+
+        remaining = max(end_time - time.monotonic(), 0)
+        return ElementLocator.wait_for_elements(self.driver, locators, condition, remaining, mode, with_elements=True)
@@ -0,0 +1,192 @@
+# http_login.py
+
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.remote.webdriver import WebDriver
+from .config import DEFAULT_TIMEOUT
+from .utils import logger
+
+# One adapter (and so one keep-alive connection pool) shared by every login. Each login still
+# gets its own Session so cookie jars of different users never mix.
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+
+
+# Ids and classes of the warnings the login page shows when the credentials are rejected
+_LOGIN_ERROR_IDS = {"incorrectdetails"}
+_LOGIN_ERROR_CLASSES = {"alert-danger"}
+
+
+class LoginFormParser(HTMLParser):
+    """Extracts the fields of the POST login form from a page's HTML, and notes any login warning."""
+
+    def __init__(self):
+        super().__init__()
+        self.action: Optional[str] = None
+        self.fields: Dict[str, str] = {}
+        self.email_field: Optional[str] = None
+        self.password_field: Optional[str] = None
+        self.found = False
+        self.error = False
+        self._in_form = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if attrs.get("id") in _LOGIN_ERROR_IDS or _LOGIN_ERROR_CLASSES.intersection((attrs.get("class") or "").split()):
+            self.error = True
+        if tag == "form" and not self.found and "post" in (attrs.get("method") or "").lower():
+            self._in_form = True
+            self.action = attrs.get("action") or ""
+        elif self._in_form and tag == "input" and attrs.get("name"):
+            input_type = (attrs.get("type") or "text").lower()
+            if input_type == "email":
+                self.email_field = attrs["name"]
+            elif input_type == "password":
+                self.password_field = attrs["name"]
+            elif input_type == "hidden":
+                self.fields[attrs["name"]] = attrs.get("value") or ""
+            elif input_type == "checkbox" and "checked" in attrs:
+                self.fields[attrs["name"]] = attrs.get("value") or "on"
+        elif self._in_form and tag == "button" and attrs.get("id") == "login" and attrs.get("name"):
+            self.fields[attrs["name"]] = attrs.get("value") or ""
+
+    def handle_endtag(self, tag):
+        if tag == "form" and self._in_form:
+            self._in_form = False
+            self.found = self.email_field is not None and self.password_field is not None
+
+
+class HttpLogin:
+    """A class for logging in over HTTP, without driving the login form in a browser."""
+
+    @staticmethod
+    def session() -> requests.Session:
+        """
+        Create a Session that uses the shared keep-alive connection pool.
+
+        Returns:
+            requests.Session: A new session with its own cookie jar.
+        """
+        session = requests.Session()
+        session.mount("http://", _ADAPTER)
+        session.mount("https://", _ADAPTER)
+        return session
+
+    @staticmethod
+    def login(login_url: str, user: str, password: str, timeout: int = DEFAULT_TIMEOUT) -> List[dict]:
+        """
+        Submit the login form over HTTP and return the resulting cookies.
+
+        Args:
+            login_url (str): URL of the page that serves the login form.
+            user (str): The username (email) to log in with.
+            password (str): The password for the user.
+            timeout (int, optional): Seconds to wait for each request. Defaults to DEFAULT_TIMEOUT.
+
+        Returns:
+            List[dict]: The session cookies in WebDriver format, or an empty list if the form
+                could not be found or submitted, or the login was rejected.
+        """
+        session = HttpLogin.session()
+        try:
+            page = session.get(login_url, timeout=timeout)
+            page.raise_for_status()
+
+            form = LoginFormParser()
+            form.feed(page.text)
+            if not form.found:
+                logger.error(f"No POST login form with email and password fields found at {login_url}")
+                return []
+
+            data = dict(form.fields)
+            data[form.email_field] = user
+            data[form.password_field] = password
+            response = session.post(urljoin(page.url, form.action), data=data, timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"HTTP login for {user} failed: {str(e)}")
+            return []
+        # The session is deliberately not closed: that would also close the shared adapter's pool
+
+        # Cookies set by the GET (session id, XSRF token) are in the jar whether or not the login
+        # worked, so check that the response moved on from the login form
+        if HttpLogin.login_rejected(response.text):
+            logger.error(f"HTTP login for {user} was rejected")
+            return []
+
+        cookies = [HttpLogin.to_webdriver_cookie(cookie) for cookie in session.cookies]
+        logger.info(f"HTTP login for {user} returned {len(cookies)} cookie(s)")
+        return cookies
+
+    @staticmethod
+    def login_rejected(html: str) -> bool:
+        """
+        Check whether the page returned after submitting the login form shows the login failed.
+
+        Args:
+            html (str): The response body, after any redirects.
+
+        Returns:
+            bool: True if it shows a login warning or still serves the login form.
+        """
+        page = LoginFormParser()
+        page.feed(html)
+        return page.error or page.found
+
+    @staticmethod
+    def to_webdriver_cookie(cookie) -> dict:
+        """
+        Convert a cookie from a requests cookie jar into the dict format WebDriver expects.
+
+        Args:
+            cookie (http.cookiejar.Cookie): The cookie to convert.
+
+        Returns:
+            dict: The cookie as accepted by WebDriver.add_cookie.
+        """
+        converted = {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path or "/",
+            "secure": bool(cookie.secure),
+            "httpOnly": cookie.has_nonstandard_attr("HttpOnly") or cookie.has_nonstandard_attr("httponly"),
+        }
+        if cookie.expires:
+            converted["expiry"] = int(cookie.expires)
+        return converted
+
+    @staticmethod
+    def inject_cookies(driver: WebDriver, cookies: List[dict], url: str) -> None:
+        """
+        Put cookies into the browser so the first navigation to url is already authenticated.
+
+        Chrome and Edge set them over CDP without loading anything. Other browsers only accept
+        cookies for the loaded domain, so the origin is opened first.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            cookies (List[dict]): Cookies in WebDriver format.
+            url (str): The URL the cookies are meant for.
+        """
+        if hasattr(driver, "execute_cdp_cmd"):
+            for cookie in cookies:
+                params = {key: cookie[key] for key in ("name", "value", "path", "secure", "httpOnly")}
+                params["url"] = url
+                if cookie.get("domain", "").startswith("."):
+                    # Domain cookies keep their domain; host-only cookies are scoped by the url
+                    params["domain"] = cookie["domain"]
+                if "expiry" in cookie:
+                    params["expires"] = cookie["expiry"]
+                driver.execute_cdp_cmd("Network.setCookie", params)
+            return
+
+        parts = urlsplit(url)
+        driver.get(f"{parts.scheme}://{parts.netloc}/")
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.warning(f"Could not add cookie {cookie['name']}: {str(e)}")
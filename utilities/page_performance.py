@@ -0,0 +1,212 @@
+# page_performance.py
+
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from .command_instrumentation import current_test
+from .config import PAGE_TIMINGS
+from .utils import logger
+
+# Navigation, paint and (new since the last call) resource timings of the current document.
+# window.__pomResourcesSeen lives on the document, so it starts over after every navigation.
+PAGE_TIMINGS_JS = """
+var navigation = performance.getEntriesByType('navigation')[0];
+var paint = {};
+performance.getEntriesByType('paint').forEach(function (entry) { paint[entry.name] = entry.startTime; });
+var resources = performance.getEntriesByType('resource');
+var seen = window.__pomResourcesSeen || 0;
+window.__pomResourcesSeen = resources.length;
+return {
+    url: location.href,
+    time_origin: performance.timeOrigin,
+    navigation: navigation ? navigation.toJSON() : null,
+    paint: paint,
+    resources: resources.slice(seen).map(function (entry) {
+        return {name: entry.name, type: entry.initiatorType, duration: entry.duration, transfer_size: entry.transferSize};
+    })
+};
+"""
+
+# Slowest resources kept per record; the rest are only counted
+_TOP_RESOURCES = 10
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """Raised when a page-object action is slower than one of its budgets."""
+
+
+def performance_budget(metric: str, max_ms: Optional[float]):
+    """
+    Declare a budget on a page-object method of a class decorated with @instrument_page_object.
+
+    Example:
+        @performance_budget("action_ms", 5000)
+        @performance_budget("first_contentful_paint_ms", 2000)
+        def login(self, username, password): ...
+
+    Args:
+        metric (str): 'action_ms' (wall-clock time of the call) or a page metric from
+            PerformanceCollector.summarize, e.g. 'load_ms'.
+        max_ms (Optional[float]): Largest acceptable value in milliseconds. None leaves the
+            method unbudgeted, so budgets can be switched on from configuration.
+    """
+    def decorate(method):
+        if max_ms is None:
+            return method
+        budgets = dict(getattr(method, "__performance_budgets__", {}))
+        budgets[metric] = max_ms
+        method.__performance_budgets__ = budgets
+        return method
+
+    return decorate
+
+
+class PerformanceCollector:
+    """Collects page timings after navigations and page-object actions, per test."""
+
+    def __init__(self, enabled: bool = PAGE_TIMINGS):
+        """
+        Initialize the PerformanceCollector.
+
+        Args:
+            enabled (bool, optional): Collect after every page-object action. When False, only
+                actions with budgets are measured. Defaults to PAGE_TIMINGS.
+        """
+        self.enabled = enabled
+        self.records: Dict[str, List[dict]] = {}
+        self._time_origins: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def collect(self, driver: WebDriver, label: str, action_ms: Optional[float] = None) -> Optional[dict]:
+        """
+        Read the page's timings and record them against the current test.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            label (str): What just happened, e.g. 'LoginPage.login' or 'get https://...'.
+            action_ms (Optional[float]): How long the action took, if known. Defaults to None.
+
+        Returns:
+            Optional[dict]: The recorded entry, or None if the timings couldn't be read.
+        """
+        try:
+            raw = driver.execute_script(PAGE_TIMINGS_JS)
+        except Exception as e:
+            logger.warning(f"Could not read page timings after {label}: {str(e)}")
+            return None
+
+        # The navigation entry only changes when a new document loads; don't report it twice
+        session = getattr(driver, "session_id", None) or ""
+        with self._lock:
+            new_document = self._time_origins.get(session) != raw.get("time_origin")
+            self._time_origins[session] = raw.get("time_origin")
+
+        record = {"label": label, "url": raw.get("url")}
+        if action_ms is not None:
+            record["action_ms"] = round(action_ms, 1)
+        record.update(PerformanceCollector.summarize(raw, new_document))
+
+        test = current_test.get() or "<outside tests>"
+        with self._lock:
+            self.records.setdefault(test, []).append(record)
+        return record
+
+    @staticmethod
+    def summarize(raw: dict, new_document: bool = True) -> dict:
+        """
+        Reduce raw timing entries to the metrics reported and budgeted on.
+
+        Args:
+            raw (dict): The result of PAGE_TIMINGS_JS.
+            new_document (bool, optional): Include navigation and paint metrics. Defaults to True.
+
+        Returns:
+            dict: Metrics in milliseconds and bytes, plus the slowest new resources.
+        """
+        resources = raw.get("resources") or []
+        summary = {
+            "resource_count": len(resources),
+            "transfer_bytes": sum(resource.get("transfer_size") or 0 for resource in resources),
+            "slowest_resources": sorted(resources, key=lambda resource: resource["duration"], reverse=True)[:_TOP_RESOURCES],
+        }
+        navigation = raw.get("navigation")
+        if new_document and navigation:
+            paint = raw.get("paint") or {}
+            summary.update({
+                "ttfb_ms": navigation["responseStart"] - navigation["requestStart"],
+                "dom_content_loaded_ms": navigation["domContentLoadedEventEnd"] or None,
+                # Zero until the load event has finished, e.g. with an eager page-load strategy
+                "load_ms": navigation["loadEventEnd"] or None,
+                "first_paint_ms": paint.get("first-paint"),
+                "first_contentful_paint_ms": paint.get("first-contentful-paint"),
+            })
+            summary["transfer_bytes"] += navigation.get("transferSize") or 0
+        return summary
+
+    def after_action(self, label: str, page, method: Callable, elapsed_ms: float) -> None:
+        """
+        Page action hook: collect timings after a page-object method and enforce its budgets.
+
+        Args:
+            label (str): 'Class.method' of the page-object method.
+            page: The page object; its driver attribute is used.
+            method (Callable): The undecorated method, carrying any @performance_budget budgets.
+            elapsed_ms (float): Wall-clock time the call took.
+
+        Raises:
+            PerformanceBudgetExceeded: If a budgeted metric is over its limit.
+        """
+        driver = getattr(page, "driver", None)
+        budgets = getattr(method, "__performance_budgets__", {})
+        if driver is None or not (self.enabled or budgets):
+            return
+        record = self.collect(driver, label, elapsed_ms)
+        if record is None or not budgets:
+            return
+
+        exceeded = [
+            f"{metric} {record[metric]:.0f} ms > {max_ms} ms"
+            for metric, max_ms in budgets.items()
+            if record.get(metric) is not None and record[metric] > max_ms
+        ]
+        if exceeded:
+            record["budget_exceeded"] = exceeded
+            logger.error(f"{label} exceeded its performance budget: {', '.join(exceeded)}")
+            raise PerformanceBudgetExceeded(f"{label} exceeded its performance budget: {', '.join(exceeded)}")
+
+    def watch_navigation(self, driver: WebDriver) -> WebDriver:
+        """
+        Collect timings after every driver.get().
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Returns:
+            WebDriver: The same driver.
+        """
+        get = driver.get
+
+        def get_and_collect(url):
+            get(url)
+            if not url.startswith("about:"):
+                self.collect(driver, f"get {url}")
+
+        driver.get = get_and_collect
+        return driver
+
+    def records_for(self, test: str) -> List[dict]:
+        """
+        Return the timings recorded for a test.
+
+        Args:
+            test (str): The test's node id.
+
+        Returns:
+            List[dict]: One entry per navigation or page-object action, oldest first.
+        """
+        with self._lock:
+            return list(self.records.get(test, []))
+
+
+# Shared by every page object and driver in this process
+performance_collector = PerformanceCollector()
@@ -0,0 +1,264 @@
+# profile_template.py
+
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+from threading import Lock
+from typing import Callable, Dict, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+from .config import PROFILE_TEMPLATE_DIR, BASE_URL, DEFAULT_TIMEOUT
+from .utils import logger
+
+# Directories whose files the browser only ever adds or replaces, never rewrites in place. Their
+# files are hardlinked into clones; everything else (SQLite databases, prefs) is copied.
+_LINKABLE_DIRS = {"Cache", "Code Cache", "GPUCache", "GrShaderCache", "ShaderCache", "cache2", "startupCache"}
+# Per-process lock files that must never be carried into a template or clone
+_LOCK_FILES = {"SingletonLock", "SingletonSocket", "SingletonCookie", "lock", ".parentlock", "parent.lock"}
+_MANIFEST = "template.json"
+
+TemplateBuilder = Callable[[str], WebDriver]
+
+
+class ProfileTemplateCache:
+    """Warmed browser profiles built once and cloned for each session, so browsers skip first-run work."""
+
+    def __init__(self, cache_dir: str = PROFILE_TEMPLATE_DIR, base_url: str = BASE_URL):
+        """
+        Initialize the ProfileTemplateCache.
+
+        Args:
+            cache_dir (str, optional): Where templates and clones are kept. Defaults to PROFILE_TEMPLATE_DIR.
+            base_url (str, optional): Page loaded while building a template to prime its caches.
+                Defaults to BASE_URL.
+        """
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self._clones: Dict[str, str] = {}
+        self._lock = Lock()
+
+    def template_path(self, browser_name: str) -> str:
+        """
+        Return where a browser's template profile is kept.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+
+        Returns:
+            str: The template directory (it may not exist yet).
+        """
+        return os.path.join(self.cache_dir, "templates", browser_name)
+
+    def clone(self, browser_name: str, builder: TemplateBuilder) -> str:
+        """
+        Return a fresh copy of the browser's template profile, building the template first if needed.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            builder (TemplateBuilder): Launches the browser with a given profile directory; only
+                called when the template has to be built.
+
+        Returns:
+            str: Path of the cloned profile directory, owned by the caller until release().
+        """
+        template = self.template_path(browser_name)
+        manifest = self._read_manifest(template)
+        if manifest is None or manifest.get("base_url") != self.base_url:
+            self.build(browser_name, builder)
+
+        start = time.perf_counter()
+        clone = os.path.join(self.cache_dir, "clones", f"{browser_name}-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        _clone_tree(template, clone)
+        with self._lock:
+            self._clones[clone] = browser_name
+        logger.info(f"Cloned {browser_name} profile template in {time.perf_counter() - start:.2f}s: {clone}")
+        return clone
+
+    def build(self, browser_name: str, builder: TemplateBuilder) -> str:
+        """
+        Launch the browser on an empty profile, load the base URL and keep the result as the template.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            builder (TemplateBuilder): Launches the browser with a given profile directory.
+
+        Returns:
+            str: Path of the template directory.
+        """
+        template = self.template_path(browser_name)
+        staging = f"{template}.{os.getpid()}-{uuid.uuid4().hex[:8]}.building"
+        os.makedirs(staging)
+        logger.info(f"Building {browser_name} profile template from {self.base_url}")
+
+        driver = builder(staging)
+        try:
+            driver.get(self.base_url)
+            WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            version = driver.capabilities.get("browserVersion")
+        finally:
+            driver.quit()
+
+        _remove_lock_files(staging)
+        with open(os.path.join(staging, _MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"browser_version": version, "base_url": self.base_url, "built": time.time()}, f)
+        _make_read_only(staging)
+
+        existing = self._read_manifest(template)
+        if existing is not None and existing.get("base_url") == self.base_url:
+            # Another worker finished its template first; use that one
+            logger.info(f"{browser_name} profile template already built by another process")
+            _remove_tree(staging)
+            return template
+        self._discard(template)
+        try:
+            os.rename(staging, template)
+        except OSError:
+            _remove_tree(staging)
+        return template
+
+    def check_version(self, browser_name: str, driver: WebDriver) -> bool:
+        """
+        Compare the running browser's version with the template's, dropping the template on a mismatch.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            driver (WebDriver): A driver launched from a clone of the template.
+
+        Returns:
+            bool: True if the template matches the browser version.
+        """
+        template = self.template_path(browser_name)
+        manifest = self._read_manifest(template) or {}
+        version = driver.capabilities.get("browserVersion")
+        if manifest.get("browser_version") == version:
+            return True
+        logger.warning(
+            f"{browser_name} updated from {manifest.get('browser_version')} to {version}; "
+            f"its profile template will be rebuilt"
+        )
+        self.invalidate(browser_name)
+        return False
+
+    def invalidate(self, browser_name: str) -> None:
+        """
+        Drop a browser's template. Existing clones are unaffected.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+        """
+        self._discard(self.template_path(browser_name))
+
+    def release(self, clone: Optional[str]) -> None:
+        """
+        Delete a cloned profile once its browser has quit.
+
+        Args:
+            clone (Optional[str]): Path returned by clone(). None is ignored.
+        """
+        if not clone:
+            return
+        with self._lock:
+            self._clones.pop(clone, None)
+        _remove_tree(clone)
+
+    def cleanup(self) -> None:
+        """Delete this process's clones and any left behind by processes that no longer exist."""
+        with self._lock:
+            clones = list(self._clones)
+            self._clones.clear()
+        for clone in clones:
+            _remove_tree(clone)
+
+        clones_dir = os.path.join(self.cache_dir, "clones")
+        if not os.path.isdir(clones_dir):
+            return
+        for name in os.listdir(clones_dir):
+            try:
+                pid = int(name.split("-")[1])
+            except (IndexError, ValueError):
+                continue
+            if pid != os.getpid() and not _process_exists(pid):
+                _remove_tree(os.path.join(clones_dir, name))
+
+    def _read_manifest(self, template: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(template, _MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _discard(self, template: str) -> None:
+        # Rename first so no other process clones a half-deleted template
+        if os.path.isdir(template):
+            trash = f"{template}.{uuid.uuid4().hex[:8]}.old"
+            try:
+                os.rename(template, trash)
+            except OSError:
+                return
+            _remove_tree(trash)
+
+
+def _clone_tree(source: str, destination: str) -> None:
+    for root, dirs, files in os.walk(source):
+        relative = os.path.relpath(root, source)
+        target_dir = os.path.normpath(os.path.join(destination, relative))
+        os.makedirs(target_dir, exist_ok=True)
+        linkable = bool(_LINKABLE_DIRS.intersection(relative.split(os.sep)))
+        for name in files:
+            if name in _LOCK_FILES or (relative == "." and name == _MANIFEST):
+                continue
+            source_file = os.path.join(root, name)
+            if os.path.islink(source_file):
+                continue
+            target_file = os.path.join(target_dir, name)
+            if linkable:
+                try:
+                    os.link(source_file, target_file)
+                    continue
+                except OSError:
+                    # Different filesystem or no hardlink support; fall back to a copy
+                    pass
+            shutil.copyfile(source_file, target_file)
+
+
+def _remove_lock_files(path: str) -> None:
+    # Chrome's Singleton* entries are dangling symlinks once it exits; os.walk lists them as files
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name in _LOCK_FILES:
+                os.remove(os.path.join(root, name))
+
+
+def _make_read_only(path: str) -> None:
+    # Hardlinked files share one inode with every clone; read-only stops a browser writing through
+    # a clone into the template. The browser can still delete and replace its own links.
+    read_only = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                os.chmod(file_path, read_only)
+
+
+def _remove_tree(path: str) -> None:
+    # Read-only files can still be unlinked, since their directories stay writable
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Shared by every browser launched in this process
+profile_templates = ProfileTemplateCache()
@@ -1,36 +1,220 @@
-import os
-import time
+import atexit
+import base64
+import contextvars
+import io
 from .utils import logger
-from datetime import datetime
-from .config import SCREENSHOT_DIR
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from .config import (SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SCREENSHOT_READY_TIMEOUT,
+                     SCREENSHOT_WORKERS)
+from .screenshot_store import ScreenshotStore, screenshot_store
 from selenium.webdriver.remote.webdriver import WebDriver
 
+# Resolves once the page looks settled: the document has loaded, no finite animation is running and
+# no new resource has started for arguments[1] ms. Gives up after arguments[0] ms. Infinite animations
+# (spinners, marquees) are ignored, since waiting for them would always time out.
+READY_FOR_SCREENSHOT_JS = """
+var timeout = arguments[0], quietMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), quietSince = start, resourceCount = -1;
+function animating() {
+    if (!document.getAnimations) { return false; }
+    return document.getAnimations().some(function (animation) {
+        var timing = animation.effect && animation.effect.getComputedTiming ? animation.effect.getComputedTiming() : {};
+        return animation.playState === 'running' && timing.iterations !== Infinity;
+    });
+}
+(function check() {
+    var count = performance.getEntriesByType('resource').length;
+    if (count !== resourceCount) { resourceCount = count; quietSince = Date.now(); }
+    var ready = document.readyState === 'complete' && !animating() && Date.now() - quietSince >= quietMs;
+    if (ready || Date.now() - start >= timeout) { done(ready); return; }
+    setTimeout(check, 50);
+})();
+"""
+
+# How long the resource count must stay unchanged before the network counts as idle
+_NETWORK_QUIET_MS = 200
+
+# Pillow format names and file extensions for SCREENSHOT_FORMAT
+_FORMATS = {"png": ("PNG", "png"), "webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg"), "jpg": ("JPEG", "jpg")}
+
 
 class ScreenshotManager:
-    """A class for managing screenshots."""
+    """A class for managing screenshots. Encoding and writing happen on a background thread pool."""
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _pending: List[Future] = []
+    _stores: Dict[str, ScreenshotStore] = {}
+    _lock = Lock()
 
     @staticmethod
-    def take_screenshot(driver: WebDriver, file_name: str, shot_directory: str = SCREENSHOT_DIR ) -> None:
+    def take_screenshot(driver: WebDriver, file_name: str, shot_directory: Optional[str] = None,
+                        image_format: str = SCREENSHOT_FORMAT, quality: int = SCREENSHOT_QUALITY) -> "Future[Optional[str]]":
         """
-        Take a screenshot of the current page.
+        Take a screenshot of the current page once it has settled.
+
+        Only the capture runs on the calling thread; decoding, recompression and the disk write are
+        handed to a background thread, so this returns as soon as the browser has sent the image.
+        Images are saved in a content-addressed ScreenshotStore, so a screenshot identical to one
+        already stored reuses its file.
 
         Args:
             driver (WebDriver): The Selenium WebDriver instance.
-            file_name (str): Base name for the screenshot file.
-            shot_directory (str): Directory to save the screenshot. If None, uses SCREENSHOT_DIR from config
+            file_name (str): Label for the screenshot, shown in the report.
+            shot_directory (Optional[str]): Directory of the store to save into. If None, uses the
+                shared screenshot_store.
+            image_format (str, optional): 'png', 'webp' or 'jpeg'. Defaults to SCREENSHOT_FORMAT.
+            quality (int, optional): WebP/JPEG quality from 1 to 100. Defaults to SCREENSHOT_QUALITY.
+
+        Returns:
+            Future[Optional[str]]: Resolves to the stored file's path, or None if saving failed.
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        file_name = f"{file_name}_{timestamp}.png"
+        store = ScreenshotManager.store_for(shot_directory)
 
-        # Use the provided shot_directory or fall back to SCREENSHOT_DIR from config
-        screenshot_dir = shot_directory or SCREENSHOT_DIR
-        os.makedirs(screenshot_dir, exist_ok=True)
+        ScreenshotManager.wait_until_ready(driver)
+        try:
+            encoded = driver.get_screenshot_as_base64()
+        except Exception as e:
+            logger.error(f"Failed to take screenshot: {str(e)}")
+            future: Future = Future()
+            future.set_result(None)
+            return future
+
+        # Run in the test's context so the save is logged against the test that took it
+        context = contextvars.copy_context()
+        future = ScreenshotManager._get_executor().submit(
+            context.run, ScreenshotManager._save,
+            encoded, store, file_name, image_format, quality,
+        )
+        with ScreenshotManager._lock:
+            ScreenshotManager._pending = [f for f in ScreenshotManager._pending if not f.done()]
+            ScreenshotManager._pending.append(future)
+        return future
 
-        screenshot_destination = os.path.join(screenshot_dir, file_name)
+    @staticmethod
+    def wait_until_ready(driver: WebDriver, timeout: float = SCREENSHOT_READY_TIMEOUT) -> bool:
+        """
+        Wait until the document has loaded with no animations or network activity in progress.
 
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            timeout (float, optional): Most seconds to wait. Defaults to SCREENSHOT_READY_TIMEOUT.
+
+        Returns:
+            bool: True if the page settled, False if it timed out or couldn't be checked.
+        """
         try:
-            time.sleep(1)
-            driver.save_screenshot(screenshot_destination)
-            logger.info(f"Screenshot saved to: {screenshot_destination}")
+            ready = driver.execute_async_script(READY_FOR_SCREENSHOT_JS, int(timeout * 1000), _NETWORK_QUIET_MS)
+        except Exception as e:
+            logger.warning(f"Could not check page readiness before screenshot: {str(e)}")
+            return False
+        if not ready:
+            logger.warning(f"Page still busy after {timeout}s, taking screenshot anyway")
+        return bool(ready)
+
+    @staticmethod
+    def encode(png: bytes, image_format: str = SCREENSHOT_FORMAT, quality: int = SCREENSHOT_QUALITY) -> Tuple[bytes, str]:
+        """
+        Recompress a PNG screenshot.
+
+        Args:
+            png (bytes): The PNG image the browser returned.
+            image_format (str, optional): 'png', 'webp' or 'jpeg'. Defaults to SCREENSHOT_FORMAT.
+            quality (int, optional): WebP/JPEG quality from 1 to 100. Defaults to SCREENSHOT_QUALITY.
+
+        Raises:
+            ValueError: If the format is not supported.
+
+        Returns:
+            Tuple[bytes, str]: The encoded image and its file extension. The PNG is returned
+                unchanged for 'png', or when Pillow is not installed.
+        """
+        image_format = image_format.lower()
+        if image_format not in _FORMATS:
+            raise ValueError(f"Unsupported screenshot format '{image_format}', expected one of {sorted(_FORMATS)}")
+        pillow_format, extension = _FORMATS[image_format]
+        if pillow_format == "PNG":
+            return png, extension
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning(f"Pillow is not installed; saving screenshot as PNG instead of {image_format}")
+            return png, "png"
+
+        with Image.open(io.BytesIO(png)) as image:
+            if pillow_format == "JPEG" and image.mode != "RGB":
+                # JPEG has no alpha channel
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, pillow_format, quality=quality)
+        return output.getvalue(), extension
+
+    @staticmethod
+    def wait_for_pending(timeout: Optional[float] = None) -> int:
+        """
+        Wait for screenshots still being encoded or written.
+
+        Args:
+            timeout (Optional[float]): Most seconds to wait. Defaults to None, no limit.
+
+        Returns:
+            int: How many screenshots were still unfinished when the wait ended.
+        """
+        with ScreenshotManager._lock:
+            pending = list(ScreenshotManager._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} screenshot(s) still being saved after {timeout}s")
+        return len(not_done)
+
+    @staticmethod
+    def shutdown() -> None:
+        """Finish any pending screenshots and stop the background threads."""
+        with ScreenshotManager._lock:
+            executor, ScreenshotManager._executor = ScreenshotManager._executor, None
+            ScreenshotManager._pending = []
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def store_for(shot_directory: Optional[str] = None) -> ScreenshotStore:
+        """
+        Return the store that saves into a directory.
+
+        Args:
+            shot_directory (Optional[str]): The store's directory. Defaults to None, the shared
+                screenshot_store.
+
+        Returns:
+            ScreenshotStore: The store, created on first use.
+        """
+        if not shot_directory:
+            return screenshot_store
+        with ScreenshotManager._lock:
+            if shot_directory not in ScreenshotManager._stores:
+                ScreenshotManager._stores[shot_directory] = ScreenshotStore(shot_directory)
+            return ScreenshotManager._stores[shot_directory]
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with ScreenshotManager._lock:
+            if ScreenshotManager._executor is None:
+                ScreenshotManager._executor = ThreadPoolExecutor(
+                    max_workers=SCREENSHOT_WORKERS, thread_name_prefix="screenshot"
+                )
+            return ScreenshotManager._executor
+
+    @staticmethod
+    def _save(encoded: str, store: ScreenshotStore, label: str, image_format: str, quality: int) -> Optional[str]:
+        try:
+            image, extension = ScreenshotManager.encode(base64.b64decode(encoded), image_format, quality)
+            record = store.put(image, extension, label)
+            logger.info(f"Screenshot saved to: {record['path']}")
+            return record["path"]
         except Exception as e:
             logger.error(f"Failed to save screenshot: {str(e)}")
+            return None
+
+
+atexit.register(ScreenshotManager.shutdown)
@@ -0,0 +1,303 @@
+# screenshot_store.py
+
+import base64
+import hashlib
+import html
+import io
+import os
+import time
+import uuid
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from .config import (SCREENSHOT_ROOT, SCREENSHOT_DEDUP_DISTANCE, SCREENSHOT_STORE_MAX_MB,
+                     SCREENSHOT_THUMBNAIL_SIZE)
+from .utils import logger, current_test
+
+_THUMBNAILS = "thumbnails"
+
+
+class ScreenshotStore:
+    """
+    Screenshots kept once per distinct image, named by the SHA-256 of their content.
+
+    Identical images share a file, and with a dedup distance set, images whose perceptual hash is
+    within that many bits of an earlier one reuse the earlier file too. Every image gets a small
+    JPEG thumbnail for embedding in the report. The least recently stored images are deleted once
+    the store grows past its size cap.
+    """
+
+    def __init__(self, store_dir: str = os.path.join(SCREENSHOT_ROOT, "store"),
+                 max_bytes: int = SCREENSHOT_STORE_MAX_MB * 1024 * 1024,
+                 dedup_distance: int = SCREENSHOT_DEDUP_DISTANCE,
+                 thumbnail_size: int = SCREENSHOT_THUMBNAIL_SIZE):
+        """
+        Initialize the ScreenshotStore.
+
+        Args:
+            store_dir (str, optional): Where images and thumbnails are kept. Defaults to
+                SCREENSHOT_ROOT/store, shared by every xdist worker.
+            max_bytes (int, optional): Largest total size of the store; 0 means no cap.
+                Defaults to SCREENSHOT_STORE_MAX_MB.
+            dedup_distance (int, optional): Most differing perceptual-hash bits (out of 64) for an
+                image to count as a near duplicate; 0 only merges identical images.
+                Defaults to SCREENSHOT_DEDUP_DISTANCE.
+            thumbnail_size (int, optional): Longest side of a thumbnail in pixels.
+                Defaults to SCREENSHOT_THUMBNAIL_SIZE.
+        """
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.dedup_distance = dedup_distance
+        self.thumbnail_size = thumbnail_size
+        self.records: Dict[str, List[dict]] = {}
+        # (perceptual hash, path) of images stored by this process, for near-duplicate lookups
+        self._perceptual: List[Tuple[int, str]] = []
+        self._total_bytes: Optional[int] = None
+        self._lock = Lock()
+
+    def put(self, image: bytes, extension: str, label: str) -> dict:
+        """
+        Store an image (unless it is already stored) and record it against the current test.
+
+        Args:
+            image (bytes): The encoded image.
+            extension (str): File extension of its format, e.g. 'png'.
+            label (str): What the screenshot shows, e.g. 'Invalid_Login_Creds'.
+
+        Returns:
+            dict: The record: label, path, thumbnail (None without Pillow), sha256, and
+                duplicate ('exact', 'near' or None).
+        """
+        digest = hashlib.sha256(image).hexdigest()
+        path = os.path.join(self.store_dir, f"{digest}.{extension}")
+        duplicate = None
+        perceptual = None
+
+        if os.path.exists(path):
+            duplicate = "exact"
+        elif self.dedup_distance > 0:
+            perceptual = perceptual_hash(image)
+            match = self._find_near_duplicate(perceptual) if perceptual is not None else None
+            if match is not None:
+                path, duplicate = match, "near"
+
+        if duplicate:
+            # Storing an image again counts as using it, so retention keeps it longer
+            _touch(path)
+            _touch(self._thumbnail_path(path))
+        else:
+            self._write(path, image)
+            self._add_size(len(image))
+            if perceptual is not None:
+                with self._lock:
+                    self._perceptual.append((perceptual, path))
+
+        thumbnail = self._thumbnail_path(path)
+        if not os.path.exists(thumbnail):
+            thumbnail = self._make_thumbnail(image, thumbnail)
+
+        record = {
+            "label": label,
+            "path": path,
+            "thumbnail": thumbnail,
+            "sha256": os.path.splitext(os.path.basename(path))[0],
+            "duplicate": duplicate,
+            "time": time.time(),
+        }
+        test = current_test.get() or "<outside tests>"
+        with self._lock:
+            self.records.setdefault(test, []).append(record)
+        if duplicate:
+            logger.info(f"Screenshot '{label}' is {'identical' if duplicate == 'exact' else 'nearly identical'} "
+                        f"to {path}; not stored again")
+
+        if self.max_bytes and self._add_size(0) > self.max_bytes:
+            self.enforce_retention()
+        return record
+
+    def records_for(self, test: str) -> List[dict]:
+        """
+        Return the screenshots taken during a test.
+
+        Args:
+            test (str): The test's node id.
+
+        Returns:
+            List[dict]: One record per screenshot taken, oldest first.
+        """
+        with self._lock:
+            return list(self.records.get(test, []))
+
+    def thumbnail_html(self, record: dict, relative_to: Optional[str] = None) -> str:
+        """
+        Render a screenshot record as an embedded thumbnail linking to the full-size image.
+
+        Args:
+            record (dict): A record from put() or records_for().
+            relative_to (Optional[str]): Directory the link is made relative to, i.e. the report's.
+                Defaults to None, an absolute file:// link.
+
+        Returns:
+            str: An HTML fragment. Without a thumbnail, only the link.
+        """
+        path = record["path"]
+        if relative_to:
+            href = os.path.relpath(path, relative_to).replace(os.sep, "/")
+        else:
+            href = "file://" + os.path.abspath(path).replace(os.sep, "/")
+        label = html.escape(record["label"])
+        thumbnail = record.get("thumbnail")
+        if thumbnail and os.path.exists(thumbnail):
+            with open(thumbnail, "rb") as f:
+                data = base64.b64encode(f.read()).decode("ascii")
+            content = f'<img src="data:image/jpeg;base64,{data}" alt="{label}" title="{label}"/>'
+        else:
+            content = label
+        return f'<div class="screenshot"><a href="{html.escape(href)}" target="_blank">{content}</a></div>'
+
+    def enforce_retention(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete the least recently stored images (and their thumbnails) until the store fits its cap.
+
+        Args:
+            max_bytes (Optional[int]): Size cap to apply. Defaults to None, the store's max_bytes.
+
+        Returns:
+            int: How many images were deleted.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if not max_bytes or not os.path.isdir(self.store_dir):
+            return 0
+
+        images = []
+        total = 0
+        for directory in (self.store_dir, os.path.join(self.store_dir, _THUMBNAILS)):
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                total += info.st_size
+                if directory == self.store_dir:
+                    images.append((info.st_mtime, entry.path, info.st_size))
+
+        removed = 0
+        for _, path, size in sorted(images):
+            if total <= max_bytes:
+                break
+            thumbnail = self._thumbnail_path(path)
+            for file_path in (path, thumbnail):
+                try:
+                    freed = os.path.getsize(file_path)
+                    os.remove(file_path)
+                    total -= freed
+                except OSError:
+                    # Already gone, e.g. removed by another worker
+                    pass
+            removed += 1
+
+        with self._lock:
+            self._total_bytes = total
+            self._perceptual = [(value, path) for value, path in self._perceptual if os.path.exists(path)]
+        if removed:
+            logger.info(f"Removed {removed} screenshot(s) to keep the store under {max_bytes // (1024 * 1024)} MB")
+        return removed
+
+    def _find_near_duplicate(self, perceptual: int) -> Optional[str]:
+        with self._lock:
+            candidates = list(self._perceptual)
+        for value, path in candidates:
+            if bin(value ^ perceptual).count("1") <= self.dedup_distance and os.path.exists(path):
+                return path
+        return None
+
+    def _thumbnail_path(self, path: str) -> str:
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.store_dir, _THUMBNAILS, f"{name}.jpg")
+
+    def _make_thumbnail(self, image: bytes, thumbnail: str) -> Optional[str]:
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+        try:
+            with Image.open(io.BytesIO(image)) as picture:
+                picture.thumbnail((self.thumbnail_size, self.thumbnail_size))
+                output = io.BytesIO()
+                picture.convert("RGB").save(output, "JPEG", quality=70)
+        except Exception as e:
+            logger.warning(f"Could not make a screenshot thumbnail: {str(e)}")
+            return None
+        self._write(thumbnail, output.getvalue())
+        self._add_size(len(output.getvalue()))
+        return thumbnail
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Written under a temporary name and renamed, so other workers never see a partial image
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    def _add_size(self, size: int) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = _directory_size(self.store_dir)
+            else:
+                self._total_bytes += size
+            return self._total_bytes
+
+
+def perceptual_hash(image: bytes) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash (dHash) of an image.
+
+    Visually similar images, e.g. the same page with a different clock or cursor, differ in only a
+    few bits, so the Hamming distance between two hashes measures how alike the images look.
+
+    Args:
+        image (bytes): The encoded image.
+
+    Returns:
+        Optional[int]: The hash, or None if Pillow is not installed or the image can't be read.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(image)) as picture:
+            pixels = picture.convert("L").resize((9, 8)).tobytes()
+    except Exception:
+        return None
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return value
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+# Shared by every screenshot taken in this process
+screenshot_store = ScreenshotStore()
@@ -0,0 +1,306 @@
+# service_registry.py
+
+import atexit
+import json
+import os
+from threading import Lock
+from typing import Dict, List, Optional, Type
+from urllib import request
+from urllib.error import URLError
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.webdriver import WebDriver
+from .config import DRIVER_PATH_CACHE
+from .utils import logger
+
+
+class SharedService:
+    """
+    Mixin that keeps a driver binary (chromedriver, geckodriver, msedgedriver) running between sessions.
+
+    Selenium calls start() when a driver is created and stop() when it quits. Here start() only
+    spawns the process if it isn't already running (so a crashed binary is restarted on next use)
+    and stop() just releases the session; the process is stopped by shutdown().
+    """
+
+    # Concurrent sessions one process accepts; None means unlimited
+    max_sessions: Optional[int] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sessions = 0
+        self.pending = 0
+        self.process = None
+        self._session_lock = Lock()
+
+    def start(self) -> None:
+        with self._session_lock:
+            if not self.is_running():
+                if self.process is not None:
+                    logger.warning(f"Driver service {self.path} exited (code {self.process.poll()}), restarting it")
+                self.sessions = 0
+                super().start()
+                logger.info(f"Started shared driver service {self.path} at {self.service_url}")
+            elif not self.is_connectable():
+                logger.warning(f"Driver service {self.path} stopped responding, restarting it")
+                self._terminate_process()
+                self.sessions = 0
+                super().start()
+            self.pending = max(0, self.pending - 1)
+            self.sessions += 1
+
+    def stop(self) -> None:
+        with self._session_lock:
+            self.sessions = max(0, self.sessions - 1)
+
+    def shutdown(self) -> None:
+        """Stop the driver process for real."""
+        with self._session_lock:
+            if self.process is not None:
+                super().stop()
+                self.process = None
+            self.sessions = 0
+
+    def is_running(self) -> bool:
+        """
+        Check whether the driver process is alive.
+
+        Returns:
+            bool: True if the process has been started and hasn't exited.
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def is_healthy(self, timeout: float = 2) -> bool:
+        """
+        Ask the driver's /status endpoint whether it can create sessions.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the answer. Defaults to 2.
+
+        Returns:
+            bool: True if the process is running and reports itself ready.
+        """
+        if not self.is_running():
+            return False
+        try:
+            with request.urlopen(f"{self.service_url}/status", timeout=timeout) as response:
+                status = json.loads(response.read().decode("utf-8"))
+            return bool(status.get("value", {}).get("ready", True))
+        except (URLError, OSError, ValueError):
+            return False
+
+    def has_capacity(self) -> bool:
+        """
+        Check whether another session can be created against this process.
+
+        Returns:
+            bool: True if the process accepts another concurrent session.
+        """
+        return self.max_sessions is None or self.sessions + self.pending < self.max_sessions
+
+    def __del__(self):
+        # Service.__del__ would call stop(); leave the process to shutdown() instead
+        pass
+
+
+class SharedChromeService(SharedService, ChromeService):
+    pass
+
+
+class SharedEdgeService(SharedService, EdgeService):
+    pass
+
+
+class SharedFirefoxService(SharedService, FirefoxService):
+    # geckodriver only runs one session at a time, so concurrent Firefox sessions get their own process
+    max_sessions = 1
+
+
+_SERVICE_CLASSES: Dict[str, Type[SharedService]] = {
+    "chrome": SharedChromeService,
+    "edge": SharedEdgeService,
+    "firefox": SharedFirefoxService,
+}
+
+
+class ServiceRegistry:
+    """Process-wide registry of running driver services, one binary reused by many browser sessions."""
+
+    def __init__(self, cache_file: str = DRIVER_PATH_CACHE):
+        """
+        Initialize the ServiceRegistry.
+
+        Args:
+            cache_file (str, optional): JSON file the resolved driver paths are kept in across runs.
+                Defaults to DRIVER_PATH_CACHE.
+        """
+        self.cache_file = cache_file
+        self._services: Dict[str, List[SharedService]] = {}
+        self._lock = Lock()
+
+    def service_for(self, browser_name: str, options: ArgOptions, driver_path: Optional[str] = None) -> SharedService:
+        """
+        Return a running (or about to be started) service that can take one more session.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            options (ArgOptions): The browser options; used to resolve the driver if it isn't cached.
+            driver_path (Optional[str]): Explicit driver executable. Defaults to the cached or
+                Selenium Manager resolved path.
+
+        Returns:
+            SharedService: A service to pass to the WebDriver constructor.
+        """
+        if browser_name not in _SERVICE_CLASSES:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        path = driver_path or self.resolve_driver_path(browser_name, options)
+
+        with self._lock:
+            services = self._services.setdefault(browser_name, [])
+            service = next((s for s in services if s.path == path and s.has_capacity()), None)
+            if service is None:
+                service = _SERVICE_CLASSES[browser_name](executable_path=path)
+                services.append(service)
+            # Hold the slot until the driver starts the service, so no other thread takes it
+            service.pending += 1
+            return service
+
+    def create_driver(self, browser_name: str, driver_class: Type[WebDriver], options: ArgOptions,
+                      driver_path: Optional[str] = None) -> WebDriver:
+        """
+        Start a browser session against a shared service.
+
+        If the session can't be created with a cached driver path (typically because the browser
+        was updated), the cached path is dropped and the driver resolved again once. If it fails
+        for another reason, e.g. a shared process that died or hung between sessions, unhealthy
+        services are dropped with health_check() and the session is tried once more.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            driver_class (Type[WebDriver]): webdriver.Chrome, webdriver.Firefox or webdriver.Edge.
+            options (ArgOptions): The browser options.
+            driver_path (Optional[str]): Explicit driver executable. Defaults to None.
+
+        Raises:
+            WebDriverException: If the session still can't be created after the retry.
+
+        Returns:
+            WebDriver: The new driver.
+        """
+        try:
+            return self._create(browser_name, driver_class, options, driver_path)
+        except SessionNotCreatedException:
+            if driver_path is not None:
+                raise
+            logger.warning(f"Session not created with the cached {browser_name} driver, resolving it again")
+            self.invalidate(browser_name)
+            return self._create(browser_name, driver_class, options, None)
+        except WebDriverException as e:
+            logger.warning(f"Could not start a {browser_name} session on a shared driver service: {e.msg}")
+            self.health_check()
+            return self._create(browser_name, driver_class, options, driver_path)
+
+    def _create(self, browser_name, driver_class, options, driver_path):
+        service = self.service_for(browser_name, options, driver_path)
+        try:
+            return driver_class(service=service, options=options)
+        except Exception:
+            # Give back the slot if the driver failed before it started the service
+            with service._session_lock:
+                service.pending = max(0, service.pending - 1)
+            raise
+
+    def resolve_driver_path(self, browser_name: str, options: ArgOptions) -> str:
+        """
+        Return the driver executable for a browser, asking Selenium Manager only on a cache miss.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+            options (ArgOptions): The browser options.
+
+        Returns:
+            str: Path to the driver executable.
+        """
+        cached = self._read_cache().get(browser_name)
+        if cached and os.path.isfile(cached):
+            return cached
+
+        path = DriverFinder(_SERVICE_CLASSES[browser_name](), options).get_driver_path()
+        cache = self._read_cache()
+        cache[browser_name] = path
+        self._write_cache(cache)
+        logger.info(f"Resolved {browser_name} driver to {path}")
+        return path
+
+    def invalidate(self, browser_name: str) -> None:
+        """
+        Forget a browser's cached driver path and stop its idle services.
+
+        Args:
+            browser_name (str): Name of the browser ('chrome', 'firefox' or 'edge').
+        """
+        cache = self._read_cache()
+        if cache.pop(browser_name, None) is not None:
+            self._write_cache(cache)
+        with self._lock:
+            services = self._services.get(browser_name, [])
+            idle = [service for service in services if service.sessions == 0 and service.pending == 0]
+            self._services[browser_name] = [service for service in services if service not in idle]
+        for service in idle:
+            service.shutdown()
+
+    def health_check(self) -> Dict[str, bool]:
+        """
+        Check every service and drop the ones whose process has died with no sessions left.
+
+        A dead service that still has sessions is kept; its next start() restarts it.
+
+        Returns:
+            Dict[str, bool]: '<browser>@<url>' mapped to whether that service is healthy.
+        """
+        results = {}
+        with self._lock:
+            for browser_name, services in self._services.items():
+                for service in list(services):
+                    healthy = service.is_healthy()
+                    results[f"{browser_name}@{service.service_url}"] = healthy
+                    if not healthy and service.sessions == 0 and service.pending == 0 and service.process is not None:
+                        logger.warning(f"Dropping unhealthy {browser_name} driver service at {service.service_url}")
+                        service.shutdown()
+                        services.remove(service)
+        return results
+
+    def shutdown(self) -> None:
+        """Stop every driver process the registry started."""
+        with self._lock:
+            services = [service for group in self._services.values() for service in group]
+            self._services.clear()
+        for service in services:
+            try:
+                service.shutdown()
+            except Exception as e:
+                logger.warning(f"Problem stopping driver service {service.path}: {str(e)}")
+
+    def _read_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, cache: Dict[str, str]) -> None:
+        # Write then rename, so parallel workers never read a half-written file
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        temp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temp_file, self.cache_file)
+
+
+# Shared by every driver created in this process
+service_registry = ServiceRegistry()
+atexit.register(service_registry.shutdown)
@@ -0,0 +1,162 @@
+# storage_state.py
+
+import time
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webdriver import WebDriver
+from .config import STORAGE_STATE_TTL, STORAGE_STATE_VALIDATE_TIMEOUT
+from .utils import logger
+
+_DUMP_STORAGE_JS = """
+var dump = function (storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_LOAD_STORAGE_JS = """
+var state = arguments[0];
+Object.keys(state.local).forEach(function (key) { window.localStorage.setItem(key, state.local[key]); });
+Object.keys(state.session).forEach(function (key) { window.sessionStorage.setItem(key, state.session[key]); });
+"""
+
+
+class StorageState:
+    """A snapshot of the cookies, localStorage and sessionStorage of one origin."""
+
+    def __init__(self, url: str, cookies: List[dict], local_storage: Dict[str, str],
+                 session_storage: Dict[str, str], created: Optional[float] = None):
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.created = created if created is not None else time.monotonic()
+
+    @classmethod
+    def capture(cls, driver: WebDriver) -> "StorageState":
+        """
+        Snapshot the state of the page the driver is currently on.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Returns:
+            StorageState: The captured state.
+        """
+        storage = driver.execute_script(_DUMP_STORAGE_JS)
+        return cls(driver.current_url, driver.get_cookies(), storage["local"], storage["session"])
+
+    @property
+    def origin(self) -> str:
+        """str: Scheme and host of the page the state was captured on."""
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    def age(self) -> float:
+        """float: Seconds since the state was captured."""
+        return time.monotonic() - self.created
+
+    def apply(self, driver: WebDriver) -> None:
+        """
+        Inject the state into a driver and reload so the application picks it up.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+        """
+        # Cookies and web storage can only be written for the origin that is currently loaded
+        driver.get(self.origin)
+        for cookie in self.cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.warning(f"Could not restore cookie {cookie.get('name')}: {str(e)}")
+        driver.execute_script(_LOAD_STORAGE_JS, {"local": self.local_storage, "session": self.session_storage})
+        driver.get(self.url)
+
+
+class StorageStateCache:
+    """A session-wide cache of logged-in storage states, keyed by user."""
+
+    def __init__(self, ttl: float = STORAGE_STATE_TTL, validate_timeout: float = STORAGE_STATE_VALIDATE_TIMEOUT):
+        """
+        Initialize the StorageStateCache.
+
+        Args:
+            ttl (float, optional): Seconds a cached state stays usable. Defaults to STORAGE_STATE_TTL.
+            validate_timeout (float, optional): Seconds to wait when checking a restored state.
+                Defaults to STORAGE_STATE_VALIDATE_TIMEOUT.
+        """
+        self.ttl = ttl
+        self.validate_timeout = validate_timeout
+        self._states: Dict[str, StorageState] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[StorageState]:
+        """
+        Return the cached state for a user, dropping it if it has outlived the TTL.
+
+        Args:
+            key (str): The user the state belongs to.
+
+        Returns:
+            Optional[StorageState]: The cached state, or None if missing or expired.
+        """
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and state.age() > self.ttl:
+                logger.info(f"Cached login state for '{key}' expired after {state.age():.0f}s")
+                del self._states[key]
+                state = None
+            return state
+
+    def put(self, key: str, state: StorageState) -> None:
+        """Cache a state for a user."""
+        with self._lock:
+            self._states[key] = state
+
+    def invalidate(self, key: str) -> None:
+        """Forget the cached state for a user."""
+        with self._lock:
+            self._states.pop(key, None)
+
+    def restore_or_login(self, driver: WebDriver, key: str, url: str,
+                         login: Callable[[], None], validate: Callable[..., bool]) -> bool:
+        """
+        Restore a user's cached logged-in state, falling back to a real login when needed.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            key (str): The user to log in as.
+            url (str): Page to open before running the real login flow.
+            login (Callable[[], None]): Performs the real login on the current page.
+            validate (Callable[..., bool]): Returns True if the browser is logged in. A restored state
+                is checked with validate(timeout=self.validate_timeout), so an expired session falls
+                back to the real login quickly; after a real login it is called with its own default.
+
+        Returns:
+            bool: True if the browser ends up logged in, False otherwise.
+        """
+        state = self.get(key)
+        if state is not None:
+            state.apply(driver)
+            if validate(timeout=self.validate_timeout):
+                logger.info(f"Restored cached login state for '{key}'")
+                return True
+            logger.warning(f"Cached login state for '{key}' did not validate, logging in again")
+            self.invalidate(key)
+
+        driver.get(url)
+        login()
+        if not validate():
+            logger.error(f"Login as '{key}' failed, nothing cached")
+            return False
+
+        self.put(key, StorageState.capture(driver))
+        logger.info(f"Cached login state for '{key}'")
+        return True
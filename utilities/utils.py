@@ -1,72 +1,220 @@
 # utils.py
+import atexit
+import json
 import logging
 import os
+import queue
+import tempfile
+import time
+import zlib
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
-from threading import Lock
-from .config import LOG_DIR
+from logging.handlers import QueueHandler
+from threading import Event, Lock, Thread
+from typing import Dict, Optional, Tuple
+from .config import LOG_DIR, WORKER_ID, LOG_QUEUE_SIZE, LOG_QUEUE_POLICY, LOG_BATCH_SIZE, \
+    LOG_CAPTURE_MAX_LINES, LOG_CAPTURE_MAX_BYTES
+
+
+# The test (pytest node id) and browser session whose work the current thread is doing. Threads
+# started by helpers don't inherit them, so their records are never charged to the wrong test.
+current_test: ContextVar[Optional[str]] = ContextVar("current_test", default=None)
+current_session: ContextVar[Optional[str]] = ContextVar("current_session", default=None)
+
+# A captured record: (timestamp, level, template, args). Formatting waits until it is rendered.
+LogRecordTuple = Tuple[float, int, str, tuple]
+
+
+def _record_size(record):
+    # Cheap estimate that doesn't format the record
+    return len(record[2]) + sum(len(arg) if isinstance(arg, str) else 8 for arg in record[3])
+
+
+def _plain_args(args):
+    # Arguments that survive being written to the spill file; anything else is reduced to str
+    return [arg if isinstance(arg, (str, int, float, bool, type(None))) else str(arg) for arg in args]
+
+
+def _format_record(template, args):
+    try:
+        return template % tuple(args) if args else template
+    except (TypeError, ValueError):
+        return f"{template} {list(args)}"
+
+
+class _TestLogBuffer:
+    """Ring buffer of one test's records for one browser session, capped by count and size."""
+
+    def __init__(self, max_lines, max_bytes):
+        self.records = deque(maxlen=max_lines)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.dropped = 0
+        self.lock = Lock()
+
+    def append(self, record):
+        with self.lock:
+            if len(self.records) == self.records.maxlen:
+                self.size -= _record_size(self.records[0])
+                self.dropped += 1
+            self.records.append(record)
+            self.size += _record_size(record)
+            while self.size > self.max_bytes and len(self.records) > 1:
+                self.size -= _record_size(self.records.popleft())
+                self.dropped += 1
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.records), self.dropped
 
 
 class HTMLReportLogger:
-    """_summary_
+    """
+    Captures log records per test for the HTML report.
 
-    Returns:
-        _type_: _description_
+    Records are filed under the current_test and current_session context variables, so each
+    (test, browser session) pair gets its own ring buffer capped at max_lines records and roughly
+    max_bytes characters, oldest dropped first. Records are kept as (timestamp, level, template,
+    args) tuples and only formatted when rendered. When a test ends its records are compressed
+    into a temporary spill file and only read back if the report asks for them.
     """
-    def __init__(self):
-        self.test_logs = {}
-        self.current_test = None
+    def __init__(self, max_lines=LOG_CAPTURE_MAX_LINES, max_bytes=LOG_CAPTURE_MAX_BYTES):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.test_logs: Dict[Tuple[str, Optional[str]], _TestLogBuffer] = {}
+        self._active = set()
+        self._spilled = {}
+        self._spill_file = None
         self.lock = Lock()
         
     def start_test_capture(self, test_name):
-        """_summary_
+        """
+        Start capturing records logged while current_test is test_name.
 
         Args:
-            test_name (_type_): _description_
-
-        Returns:
-            _type_: _description_
+            test_name (str): The test's node id.
         """
         with self.lock:
-            self.current_test = test_name
-            self.test_logs[test_name] = []
+            self._discard(test_name)
+            self._active.add(test_name)
             
     def end_test_capture(self, test_name):
-        """_summary_
+        """
+        Stop capturing for a test and move its records out of memory into the spill file.
 
         Args:
-            test_name (_type_): _description_
+            test_name (str): The test's node id.
+        """
+        with self.lock:
+            self._active.discard(test_name)
+            sessions = {}
+            dropped = 0
+            for key in [key for key in self.test_logs if key[0] == test_name]:
+                records, key_dropped = self.test_logs.pop(key).snapshot()
+                sessions[key[1] or ""] = [[ts, level, template, _plain_args(args)] for ts, level, template, args in records]
+                dropped += key_dropped
+            if not sessions:
+                return
+            data = zlib.compress(json.dumps({"dropped": dropped, "sessions": sessions}).encode("utf-8"))
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="test_logs_")
+            self._spill_file.seek(0, os.SEEK_END)
+            self._spilled[test_name] = (self._spill_file.tell(), len(data))
+            self._spill_file.write(data)
+
+    def get_records(self, test_name):
+        """
+        Return a test's captured records, reading them back from the spill file if the test has ended.
+
+        Args:
+            test_name (str): The test's node id.
 
         Returns:
-            _type_: _description_
+            Tuple[List[Tuple[Optional[str], LogRecordTuple]], int]: (session id, record) pairs in
+                time order, and how many records the caps dropped.
         """
         with self.lock:
-            self.current_tests = None
+            keys = [key for key in self.test_logs if key[0] == test_name]
+            if keys:
+                records = []
+                dropped = 0
+                for key in keys:
+                    key_records, key_dropped = self.test_logs[key].snapshot()
+                    records.extend((key[1], record) for record in key_records)
+                    dropped += key_dropped
+                return sorted(records, key=lambda pair: pair[1][0]), dropped
+            if test_name not in self._spilled:
+                return [], 0
+            offset, length = self._spilled[test_name]
+            self._spill_file.seek(offset)
+            data = self._spill_file.read(length)
+
+        spilled = json.loads(zlib.decompress(data).decode("utf-8"))
+        records = [
+            (session or None, (ts, level, template, tuple(args)))
+            for session, session_records in spilled["sessions"].items()
+            for ts, level, template, args in session_records
+        ]
+        return sorted(records, key=lambda pair: pair[1][0]), spilled["dropped"]
             
-    def get_logs_for_test(self, test_name):
-        """_summary_
+    def get_logs_for_test(self, test_name, fmt="text"):
+        """
+        Render a test's captured records.
 
         Args:
-            test_name (_type_): _description_
+            test_name (str): The test's node id.
+            fmt (str, optional): 'text' for one 'LEVEL: message' line per record, or 'json' for a
+                JSON-ready list of {time, level, session, message} dicts. Defaults to 'text'.
 
         Returns:
-            _type_: _description_
+            Union[str, List[dict]]: The rendered log; empty if nothing was captured.
         """
-        with self.lock:
-            return "\n".join(self.test_logs.get(test_name, []))
+        records, dropped = self.get_records(test_name)
+        if fmt == "json":
+            return [
+                {
+                    "time": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+                    "level": logging.getLevelName(level),
+                    "session": session,
+                    "message": _format_record(template, args),
+                }
+                for session, (ts, level, template, args) in records
+            ]
+
+        # Only tag lines with their session when the test drove more than one browser
+        tag = len({session for session, _ in records}) > 1
+        lines = [f"... {dropped} earlier line(s) dropped ..."] if dropped else []
+        for session, (ts, level, template, args) in records:
+            prefix = f"[{(session or '-')[:8]}] " if tag else ""
+            lines.append(f"{prefix}{logging.getLevelName(level)}: {_format_record(template, args)}")
+        return "\n".join(lines)
         
-    def log(self, level, message):
-        """_summary_
+    def log(self, level, msg, args=None):
+        """
+        Capture a record for the test running in this context. Nothing is formatted here.
 
         Args:
-            level (_type_): _description_
-            message (_type_): _description_
-
-        Returns:
-            _type_: _description_
+            level (int): The logging level.
+            msg (str): The message, possibly a %-format string.
+            args (tuple, optional): Arguments for msg. Defaults to None.
         """
-        with self.lock:
-            if self.current_test:
-                self.test_logs[self.current_test].append(f"{level}: {message}")
+        test = current_test.get()
+        if test not in self._active:
+            return
+        key = (test, current_session.get())
+        buffer = self.test_logs.get(key)
+        if buffer is None:
+            with self.lock:
+                if test not in self._active:
+                    return
+                buffer = self.test_logs.setdefault(key, _TestLogBuffer(self.max_lines, self.max_bytes))
+        buffer.append((time.time(), level, msg, tuple(args) if args else ()))
+
+    def _discard(self, test_name):
+        for key in [key for key in self.test_logs if key[0] == test_name]:
+            del self.test_logs[key]
+        self._spilled.pop(test_name, None)
                 
 class CustomLogger(logging.Logger):
     """_summary_
@@ -96,8 +244,135 @@ class CustomLogger(logging.Logger):
             _type_: _description_
         """
         super()._log(level, msg, args, exc_info, extra, stack_info)
-        self.html_logger.log(logging.getLevelName(level), msg % args if args else msg)
+        self.html_logger.log(level, msg, args)
         
+class BoundedQueueHandler(QueueHandler):
+    """Puts records on a bounded queue, either waiting for room or dropping them when it is full."""
+
+    def __init__(self, log_queue, policy="block"):
+        """
+        Initialize the BoundedQueueHandler.
+
+        Args:
+            log_queue (queue.Queue): The bounded queue the listener reads from.
+            policy (str, optional): 'block' waits for room when the queue is full, 'drop' discards
+                the record. Defaults to 'block'.
+        """
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Unsupported log queue policy: {policy}")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _FlushRequest:
+    """Queue marker: the listener sets done once everything queued before it is written."""
+
+    def __init__(self):
+        self.done = Event()
+
+
+class BatchingQueueListener:
+    """Background thread that drains the log queue and writes records to its handlers in batches."""
+
+    _STOP = object()
+
+    def __init__(self, log_queue, handlers, batch_size=LOG_BATCH_SIZE):
+        """
+        Initialize the BatchingQueueListener.
+
+        Args:
+            log_queue (queue.Queue): The queue records are read from.
+            handlers (list): StreamHandler/FileHandler instances to write to.
+            batch_size (int, optional): Most records written before the streams are flushed.
+                Defaults to LOG_BATCH_SIZE.
+        """
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread = None
+
+    def start(self):
+        self._thread = Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """
+        Write everything still queued, then end the thread.
+
+        Args:
+            timeout (int, optional): Seconds to wait for the thread. Defaults to 10.
+        """
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout=10):
+        """
+        Wait until every record queued so far has been written and flushed.
+
+        Args:
+            timeout (int, optional): Seconds to wait. Defaults to 10.
+
+        Returns:
+            bool: True if the queue was flushed in time.
+        """
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            # Take whatever else is already waiting, so one write and flush covers many records
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = []
+            flush_requests = []
+            for item in batch:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    records.append(item)
+            self._write(records)
+            for request in flush_requests:
+                request.done.set()
+
+    def _write(self, records):
+        for handler in self.handlers:
+            lines = [handler.format(record) for record in records if record.levelno >= handler.level]
+            if not lines:
+                continue
+            handler.acquire()
+            try:
+                handler.stream.write(handler.terminator.join(lines) + handler.terminator)
+                handler.stream.flush()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
+
+
 # Set up logging
 def setup_logging():
     """_summary_
@@ -108,9 +383,11 @@ def setup_logging():
     # Ensure the log directory exists
     os.makedirs(LOG_DIR, exist_ok=True)
 
-    # Create a timestamp for the log file name
+    # Create a timestamp for the log file name, suffixed with the xdist worker id so workers
+    # started in the same second write to separate files
     timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    log_file = os.path.join(LOG_DIR, f'log_{timestamp}.log')
+    suffix = f'_{WORKER_ID}' if WORKER_ID else ''
+    log_file = os.path.join(LOG_DIR, f'log_{timestamp}{suffix}.log')
 
     # Setup logging
     logging.setLoggerClass(CustomLogger)
@@ -126,14 +403,24 @@ def setup_logging():
     console_handler.setLevel(logging.INFO)
     
     # Formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    worker = f' [{WORKER_ID}]' if WORKER_ID else ''
+    formatter = logging.Formatter(f'%(asctime)s{worker} - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
+    # The test thread only puts records on a queue; a listener thread does the file and console I/O
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = BoundedQueueHandler(log_queue, LOG_QUEUE_POLICY)
+    queue_handler.setLevel(logging.INFO)
+    listener = BatchingQueueListener(log_queue, [file_handler, console_handler])
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Add handlers to Logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
     
+    logger.log_file = log_file
+    logger.log_listener = listener
     logger.info(f"Logging initialized. Log File: {log_file}")
 
     return logger
@@ -148,5 +435,43 @@ def start_test_capture(test_name):
 def end_test_capture(test_name):
     logger.html_logger.end_test_capture(test_name)
     
-def get_logs_for_test(test_name):
-    return logger.html_logger.get_logs_for_test(test_name)
\ No newline at end of file
+def get_logs_for_test(test_name, fmt="text"):
+    return logger.html_logger.get_logs_for_test(test_name, fmt)
+
+def flush_logs(timeout=10):
+    """
+    Block until every log record so far is written to the log file and console.
+
+    Args:
+        timeout (int, optional): Seconds to wait. Defaults to 10.
+
+    Returns:
+        bool: True if everything was written in time.
+    """
+    queue_handler = next((h for h in logger.handlers if isinstance(h, BoundedQueueHandler)), None)
+    if queue_handler is not None and queue_handler.dropped:
+        dropped, queue_handler.dropped = queue_handler.dropped, 0
+        logger.warning(f"Log queue was full; {dropped} record(s) dropped")
+    return logger.log_listener.flush(timeout)
+
+def merge_worker_logs(worker_logs):
+    """
+    Append each xdist worker's log file to this process's log file, one section per worker.
+
+    Args:
+        worker_logs (dict): Mapping of worker id to that worker's log file path.
+
+    Returns:
+        str: Path of the merged log file.
+    """
+    flush_logs()
+
+    with open(logger.log_file, 'a', encoding='utf-8') as merged:
+        for worker_id, log_file in sorted(worker_logs.items()):
+            merged.write(f"\n===== Worker {worker_id}: {log_file} =====\n")
+            try:
+                with open(log_file, encoding='utf-8') as worker_log:
+                    merged.write(worker_log.read())
+            except OSError as e:
+                merged.write(f"Could not read worker log: {str(e)}\n")
+    return logger.log_file
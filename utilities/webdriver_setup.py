@@ -1,18 +1,19 @@
 # File: utilities/webdriver_setup.py
 
-from selenium import webdriver
 from .utils import logger
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.common.exceptions import WebDriverException
-from .config import CHROME_DRIVER_PATH, FIREFOX_DRIVER_PATH, EDGE_DRIVER_PATH
+from .config import CHROME_DRIVER_PATH, FIREFOX_DRIVER_PATH, EDGE_DRIVER_PATH, COMMAND_INSTRUMENTATION, SHARED_DRIVER_SERVICE
+from .browser_options import BrowserOptions
+from .command_instrumentation import instrument_driver
+from .service_registry import service_registry
 
+_SERVICES = {'chrome': ChromeService, 'firefox': FirefoxService, 'edge': EdgeService}
 
-def setup_webdriver(browser_name='chrome', headless=False, private=False, driver_path=None):
+
+def setup_webdriver(browser_name='chrome', headless=False, private=False, driver_path=None, profile='stable'):
     """
     Set up and return a WebDriver instance for the specified browser.
 
@@ -20,45 +21,23 @@ def setup_webdriver(browser_name='chrome', headless=False, private=False, driver
     :param headless: (bool): Whether to run the browser in headless mode. Default is False.
     :param private: (bool): Whether to run the browser in private/incognito mode. Default is False.
     :param driver_path: (str): Optional path to the WebDriver executable. If None, Selenium will manage it automatically.
+    :param profile: (str): Browser profile from config.BROWSER_PROFILES. Default is 'stable'.
     :return: WebDriver: An instance of the specified WebDriver.
     """
     browser_name = browser_name.lower()
-
-    if browser_name == 'chrome':
-        options = ChromeOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.add_argument("--incognito")
-        service = ChromeService(executable_path=driver_path) if driver_path else ChromeService()
-        driver_class = webdriver.Chrome
-    elif browser_name == 'firefox':
-        options = FirefoxOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.set_preference("browser.privatebrowsing.autostart", True)
-        service = FirefoxService(executable_path=driver_path) if driver_path else FirefoxService()
-        driver_class = webdriver.Firefox
-    elif browser_name == 'edge':
-        options = EdgeOptions()
-        if headless:
-            options.add_argument("--headless")
-        if private:
-            options.add_argument("--inprivate")
-        service = EdgeService(executable_path=driver_path) if driver_path else EdgeService()
-        driver_class = webdriver.Edge
-    else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
-
-    # Common options for stability and performance
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-dev-shm-usage")
+    options, driver_class = BrowserOptions.build(browser_name, headless, private, profile)
 
     try:
-        driver = driver_class(service=service, options=options)
+        if SHARED_DRIVER_SERVICE:
+            # Reuse the running driver binary instead of spawning (and resolving) a new one
+            driver = service_registry.create_driver(browser_name, driver_class, options, driver_path)
+        else:
+            service_class = _SERVICES[browser_name]
+            service = service_class(executable_path=driver_path) if driver_path else service_class()
+            driver = driver_class(service=service, options=options)
+        if COMMAND_INSTRUMENTATION:
+            instrument_driver(driver)
+        BrowserOptions.prepare(driver, headless, profile, maximize=False)
         logger.info(f"{browser_name.capitalize()} WebDriver successfully initialized")
         if driver_path:
             logger.info(f"Using WebDriver at: {driver_path}")